@@ -0,0 +1 @@
+"""Performance benchmarks for IRR Explorer CLI."""
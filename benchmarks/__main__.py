@@ -0,0 +1,74 @@
+"""Run the benchmark suite: python -m benchmarks [--sizes ...] [--save FILE] [--compare FILE]."""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from benchmarks import bench_e2e, bench_micro
+from benchmarks.timing import BenchResult, print_results
+
+DEFAULT_SIZES = "1,100,10000,100000"
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    parser.add_argument(
+        "--sizes", default=DEFAULT_SIZES, help=f"comma separated prefix counts (default: {DEFAULT_SIZES})"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case, the best time is kept (default: 3)")
+    parser.add_argument("--suite", choices=("all", "e2e", "micro"), default="all", help="benchmarks to run")
+    parser.add_argument(
+        "--max-rich-size",
+        type=int,
+        default=bench_e2e.MAX_RICH_SIZE,
+        help=f"largest size to run the rich output format for (default: {bench_e2e.MAX_RICH_SIZE})",
+    )
+    parser.add_argument("--save", type=Path, help="write results as JSON to a file")
+    parser.add_argument("--compare", type=Path, help="compare against results saved by an earlier --save")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="relative slowdown reported as a regression (default: 0.2)"
+    )
+    return parser.parse_args(argv)
+
+
+def find_regressions(results: List[BenchResult], baseline: List[BenchResult], threshold: float) -> List[str]:
+    """Return a description of every case slower than its baseline by more than threshold."""
+    previous = {(result.name, result.size): result.seconds for result in baseline}
+    regressions = []
+    for result in results:
+        before = previous.get((result.name, result.size))
+        if before and result.seconds > before * (1 + threshold):
+            regressions.append(
+                f"{result.name} [{result.size}]: {before:.4f}s -> {result.seconds:.4f}s "
+                f"(+{(result.seconds / before - 1) * 100:.0f}%)"
+            )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the selected benchmarks, returning 1 if a regression was found."""
+    args = parse_args(argv)
+    sizes = [int(size) for size in args.sizes.split(",")]
+    results: List[BenchResult] = []
+    if args.suite in ("all", "micro"):
+        results += bench_micro.run(sizes, args.repeat)
+    if args.suite in ("all", "e2e"):
+        results += bench_e2e.run(sizes, args.repeat, args.max_rich_size)
+    print_results(results)
+
+    if args.save:
+        args.save.write_text(json.dumps([result.model_dump() for result in results], indent=2), encoding="utf-8")
+    if args.compare:
+        baseline = [BenchResult(**item) for item in json.loads(args.compare.read_text(encoding="utf-8"))]
+        regressions = find_regressions(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,29 @@
+"""Compare per-object and batched decoding of prefix information."""
+
+import json
+import sys
+from typing import List
+
+from benchmarks.payloads import prefix_payload
+from benchmarks.timing import best_of
+from irrexplorer_cli.helpers import format_prefix_result
+from irrexplorer_cli.models import PrefixInfo, decode_prefix_infos
+
+
+def per_object_decode(raw: bytes) -> List[PrefixInfo]:
+    """Decode with json.loads and one model construction per prefix."""
+    return [PrefixInfo(**item) for item in json.loads(raw)]
+
+
+def main(count: int = 20000) -> None:
+    """Print decode and format timings for a synthetic response."""
+    raw = prefix_payload(count)
+    infos = decode_prefix_infos(raw)
+    print(f"{count} prefixes, {len(raw) / 1e6:.1f} MB")
+    print(f"per-object decode: {best_of(lambda: per_object_decode(raw)):.3f}s")
+    print(f"batched decode:    {best_of(lambda: decode_prefix_infos(raw)):.3f}s")
+    print(f"csv format:        {best_of(lambda: [format_prefix_result(info, 'DIRECT') for info in infos]):.3f}s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
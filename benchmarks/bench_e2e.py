@@ -0,0 +1,36 @@
+"""End-to-end prefix and ASN query benchmarks against a local stand-in server."""
+
+import contextlib
+import functools
+import os
+from typing import Iterable, List
+
+from benchmarks.server import api_routes, serve
+from benchmarks.timing import BenchResult, best_of_async
+from irrexplorer_cli.config import ClientConfig
+from irrexplorer_cli.queries import async_asn_query, async_prefix_query
+
+OUTPUT_FORMATS = {"rich": None, "compact": "compact", "json": "json", "csv": "csv"}
+# laying out Rich columns takes about 15ms per panel, larger sizes only run the text formats by default
+MAX_RICH_SIZE = 1000
+
+
+def run(sizes: Iterable[int], repeat: int = 3, max_rich_size: int = MAX_RICH_SIZE) -> List[BenchResult]:
+    """Time prefix and ASN queries in every output format, discarding their output."""
+    config = ClientConfig(cache=False)
+    results = []
+    for size in sizes:
+        with serve(api_routes(size)) as server, open(os.devnull, "w", encoding="utf-8") as devnull:
+            for name, output_format in OUTPUT_FORMATS.items():
+                if output_format is None and size > max_rich_size:
+                    continue
+                with contextlib.redirect_stdout(devnull):
+                    prefix_query = functools.partial(
+                        async_prefix_query, "10.0.0.0/24", output_format, server.base_url, config
+                    )
+                    asn_query = functools.partial(async_asn_query, "AS64496", output_format, server.base_url, config)
+                    prefix_seconds = best_of_async(prefix_query, repeat)
+                    asn_seconds = best_of_async(asn_query, repeat)
+                results.append(BenchResult(name=f"e2e prefix {name}", size=size, seconds=prefix_seconds))
+                results.append(BenchResult(name=f"e2e asn {name}", size=size, seconds=asn_seconds))
+    return results
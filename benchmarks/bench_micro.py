@@ -0,0 +1,31 @@
+"""Microbenchmarks for model decoding, CSV formatting and Rich panel construction."""
+
+import asyncio
+from typing import Callable, Dict, Iterable, List
+
+from benchmarks.payloads import prefix_payload
+from benchmarks.timing import BenchResult, best_of
+from irrexplorer_cli.helpers import format_prefix_result
+from irrexplorer_cli.irrexplorer import IrrDisplay
+from irrexplorer_cli.models import decode_prefix_infos
+
+
+def cases(size: int) -> Dict[str, Callable[[], object]]:
+    """Return the microbenchmark cases for a payload of size prefixes."""
+    display = IrrDisplay()
+    raw = prefix_payload(size)
+    infos = decode_prefix_infos(raw)
+    return {
+        "decode_prefix_infos": lambda: decode_prefix_infos(raw),
+        "format_prefix_result": lambda: [format_prefix_result(info, "DIRECT") for info in infos],
+        "sort_and_group_panels": lambda: asyncio.run(display.sort_and_group_panels(infos)),
+    }
+
+
+def run(sizes: Iterable[int], repeat: int = 3) -> List[BenchResult]:
+    """Time decoding, CSV formatting and panel sorting for each payload size."""
+    results = []
+    for size in sizes:
+        for name, func in cases(size).items():
+            results.append(BenchResult(name=name, size=size, seconds=best_of(func, repeat)))
+    return results
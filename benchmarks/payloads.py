@@ -0,0 +1,72 @@
+"""Synthetic IRRexplorer API payloads for benchmarks."""
+
+import ipaddress
+import json
+import random
+from typing import Any, Dict, List
+
+RIRS = ["RIPE NCC", "ARIN", "APNIC", "LACNIC", "AFRINIC"]
+IRR_DBS = ["RIPE", "RADB", "ARIN", "NTTCOM", "LEVEL3"]
+CATEGORIES = ["success", "warning", "error", "danger", "info"]
+RPKI_STATUSES = ["VALID", "INVALID", "NOT_FOUND"]
+
+
+def make_route(prefix: str, asn: int, rng: random.Random) -> Dict[str, Any]:
+    """Create a route object with a realistically sized RPSL text."""
+    rpsl_text = (
+        f"route:          {prefix}\n"
+        f"descr:          Synthetic route object for AS{asn}\n"
+        f"origin:         AS{asn}\n"
+        f"mnt-by:         MAINT-AS{asn}\n"
+        "created:        2020-01-01T00:00:00Z\n"
+        "last-modified:  2024-01-01T00:00:00Z\n"
+        "source:         RIPE\n"
+    )
+    return {
+        "rpkiStatus": rng.choice(RPKI_STATUSES),
+        "rpkiMaxLength": int(prefix.split("/")[1]),
+        "asn": asn,
+        "rpslText": rpsl_text,
+        "rpslPk": f"{prefix}AS{asn}",
+    }
+
+
+def make_prefix_info(index: int, rng: random.Random) -> Dict[str, Any]:
+    """Create a single prefix information object matching models.PrefixInfo."""
+    prefix = str(ipaddress.IPv4Network((0x0A000000 + index * 256, 24)))
+    asn = 64496 + index % 1000
+    irr_routes = {db: [make_route(prefix, asn, rng)] for db in rng.sample(IRR_DBS, rng.randint(1, 3))}
+    return {
+        "prefix": prefix,
+        "rir": rng.choice(RIRS),
+        "bgpOrigins": [asn],
+        "rpkiRoutes": [make_route(prefix, asn, rng)] if rng.random() < 0.7 else [],
+        "irrRoutes": irr_routes,
+        "categoryOverall": rng.choice(CATEGORIES),
+        "messages": [{"text": "Synthetic message for benchmark", "category": "info"}],
+        "prefixSortKey": prefix,
+        "goodnessOverall": rng.randint(0, 3),
+    }
+
+
+def make_prefix_infos(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Create a list of prefix information objects."""
+    rng = random.Random(seed)
+    return [make_prefix_info(index, rng) for index in range(count)]
+
+
+def prefix_payload(count: int) -> bytes:
+    """Create a /api/prefixes/prefix/ response body."""
+    return json.dumps(make_prefix_infos(count)).encode()
+
+
+def asn_payload(count: int) -> bytes:
+    """Create a /api/prefixes/asn/ response body with direct and overlapping prefixes."""
+    infos = make_prefix_infos(count)
+    split = count * 3 // 4
+    return json.dumps({"directOrigin": infos[:split], "overlaps": infos[split:]}).encode()
+
+
+def sets_payload(count: int) -> bytes:
+    """Create a /api/sets/member-of/ response body."""
+    return json.dumps({"setsPerIrr": {db: [f"AS-SET{index}" for index in range(count)] for db in IRR_DBS}}).encode()
@@ -0,0 +1,72 @@
+"""Local in-process stand-in for the IRRexplorer API."""
+
+import contextlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, Optional
+
+from benchmarks.payloads import asn_payload, prefix_payload, sets_payload
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Answer API requests with the payload registered for the longest matching path prefix."""
+
+    protocol_version = "HTTP/1.1"
+    server: "StandInServer"
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        """Serve a registered payload, or 404 for unknown paths."""
+        body = self.server.lookup(self.path)
+        self.send_response(200 if body is not None else 404)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body or b"")))
+        self.end_headers()
+        self.wfile.write(body or b"")
+
+    def log_message(self, format: str, *args: object) -> None:
+        """Keep request logging out of benchmark output."""
+
+
+class StandInServer(ThreadingHTTPServer):
+    """Threaded HTTP server on a free localhost port serving fixed payloads."""
+
+    daemon_threads = True
+
+    def __init__(self, routes: Dict[str, bytes]) -> None:
+        """Initialize server with payloads keyed by API path prefix."""
+        super().__init__(("127.0.0.1", 0), StandInHandler)
+        self.routes = routes
+
+    @property
+    def base_url(self) -> str:
+        """Return the base URL to pass to the CLI query functions."""
+        host, port = self.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    def lookup(self, path: str) -> Optional[bytes]:
+        """Return the payload registered for the longest path prefix of a request path."""
+        matches = [route for route in self.routes if path.startswith(route)]
+        return self.routes[max(matches, key=len)] if matches else None
+
+
+def api_routes(count: int, sets_count: int = 50) -> Dict[str, bytes]:
+    """Return stand-in routes answering every prefix and ASN query with count prefixes."""
+    return {
+        "/api/prefixes/prefix/": prefix_payload(count),
+        "/api/prefixes/asn/": asn_payload(count),
+        "/api/sets/member-of/": sets_payload(sets_count),
+    }
+
+
+@contextlib.contextmanager
+def serve(routes: Dict[str, bytes]) -> Iterator[StandInServer]:
+    """Run a stand-in server in a background thread for the duration of the block."""
+    server = StandInServer(routes)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
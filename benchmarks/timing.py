@@ -0,0 +1,37 @@
+"""Timing helpers and result records shared by the benchmarks."""
+
+import asyncio
+import time
+from typing import Any, Callable, Coroutine, List
+
+from pydantic import BaseModel
+
+
+class BenchResult(BaseModel):
+    """Best wall time of one benchmark case."""
+
+    name: str
+    size: int
+    seconds: float
+
+
+def best_of(func: Callable[[], object], repeat: int = 3) -> float:
+    """Return the best wall time of several runs."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def best_of_async(func: Callable[[], Coroutine[Any, Any, object]], repeat: int = 3) -> float:
+    """Return the best wall time of several runs of a coroutine, each in a fresh event loop."""
+    return best_of(lambda: asyncio.run(func()), repeat)
+
+
+def print_results(results: List[BenchResult]) -> None:
+    """Print results as an aligned plain-text table."""
+    width = max((len(result.name) for result in results), default=0)
+    for result in results:
+        print(f"{result.name:<{width}}  {result.size:>7}  {result.seconds:9.4f}s")
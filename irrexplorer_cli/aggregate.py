@@ -0,0 +1,80 @@
+"""Aggregation of prefixes into the fewest prefixes covering exactly the same addresses."""
+
+import bisect
+import logging
+import socket
+from typing import Dict, Iterable, List, Tuple
+
+from pydantic import BaseModel
+
+from irrexplorer_cli.prefix_index import parse_network
+
+logger = logging.getLogger(__name__)
+
+WIDTHS = {4: 32, 6: 128}
+
+
+class Aggregate(BaseModel):
+    """An aggregate prefix and how many of the original prefixes it covers."""
+
+    prefix: str
+    count: int
+
+
+def merge_ranges(ranges: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Merge sorted inclusive address ranges that overlap or touch."""
+    merged: List[Tuple[int, int]] = []
+    for start, end in ranges:
+        if merged and start <= merged[-1][1] + 1:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def range_blocks(start: int, end: int, width: int) -> Iterable[Tuple[int, int]]:
+    """Split an inclusive address range into the fewest aligned blocks, as (address, prefix length)."""
+    while start <= end:
+        # the largest block aligned at start that still fits in the range
+        size = (start & -start).bit_length() - 1 if start else width
+        size = min(size, (end - start + 1).bit_length() - 1)
+        yield start, width - size
+        start += 1 << size
+
+
+def format_network(version: int, address: int, length: int) -> str:
+    """Format an integer network address and length as a prefix."""
+    if version == 4:
+        return f"{socket.inet_ntop(socket.AF_INET, address.to_bytes(4, 'big'))}/{length}"
+    return f"{socket.inet_ntop(socket.AF_INET6, address.to_bytes(16, 'big'))}/{length}"
+
+
+def aggregate_prefixes(prefixes: Iterable[str]) -> List[Aggregate]:
+    """Return the fewest prefixes covering the addresses of the given prefixes, IPv4 first.
+
+    Prefixes become integer address ranges that are merged in one sweep after sorting, then split back
+    into aligned blocks. Every original prefix lies in exactly one block, which counts it.
+    """
+    ranges: Dict[int, List[Tuple[int, int]]] = {4: [], 6: []}
+    for prefix in prefixes:
+        try:
+            version, address, length = parse_network(prefix)
+        except ValueError:
+            logger.debug("Not aggregating invalid prefix: %s", prefix)
+            continue
+        ranges[version].append((address, address + (1 << (WIDTHS[version] - length)) - 1))
+
+    aggregates: List[Aggregate] = []
+    for version, width in WIDTHS.items():
+        originals = sorted(ranges[version])
+        blocks = [block for start, end in merge_ranges(originals) for block in range_blocks(start, end, width)]
+        starts = [address for address, _ in blocks]
+        counts = [0] * len(blocks)
+        for start, _ in originals:
+            counts[bisect.bisect_right(starts, start) - 1] += 1
+        aggregates.extend(
+            Aggregate.model_construct(prefix=format_network(version, address, length), count=count)
+            for (address, length), count in zip(blocks, counts, strict=True)
+        )
+    return aggregates
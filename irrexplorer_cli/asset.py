@@ -0,0 +1,178 @@
+"""Recursive expansion of AS sets into their member AS numbers."""
+
+import asyncio
+import collections
+import logging
+import re
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+import httpx
+from pydantic import BaseModel
+
+from irrexplorer_cli.deadline import mark_partial
+from irrexplorer_cli.irrexplorer import IrrExplorer
+from irrexplorer_cli.models import SetExpansion
+
+logger = logging.getLogger(__name__)
+
+ASN_MEMBER = re.compile(r"AS(\d+)", re.IGNORECASE)
+
+
+class AsSetExpansion(BaseModel):
+    """Member AS numbers and nested sets of an AS set."""
+
+    name: str
+    asns: List[int]
+    sets: Dict[str, int]
+    missing: List[str]
+    failed: List[str]
+    cycles: List[Tuple[str, str]]
+    requests: int
+
+
+def member_asn(member: str) -> Optional[int]:
+    """Return the AS number of a set member, or None when the member is a set."""
+    match = ASN_MEMBER.fullmatch(member)
+    return int(match.group(1)) if match else None
+
+
+class SetExpander:
+    """Concurrent breadth-first expansion of AS sets, memoizing the members of every set it has seen.
+
+    One API response holds a set and the sets nested in it down to the API's depth limit. Every set in it
+    goes into the memo table, so only nested sets the memo lacks are requested, by a pool of workers.
+    A set is walked once, however many sets include it, which also stops cycles.
+    """
+
+    def __init__(self, explorer: IrrExplorer, concurrency: int = 10) -> None:
+        """Initialize expander sending up to concurrency requests at a time."""
+        self.explorer = explorer
+        self.concurrency = concurrency
+        # upper-cased set name to its members across IRR databases, in order and without duplicates
+        self.members: Dict[str, Dict[str, None]] = {}
+        self.missing: Set[str] = set()
+        self.failed: Set[str] = set()
+        self.requests = 0
+
+    def record(self, expansions: List[SetExpansion]) -> None:
+        """Add the sets of an API response to the memo table."""
+        for expansion in expansions:
+            members = self.members.setdefault(expansion.name.upper(), {})
+            members.update(dict.fromkeys(member.upper() for member in expansion.members))
+
+    async def resolve(self, name: str) -> None:
+        """Fetch a set that is not in the memo table yet."""
+        self.requests += 1
+        try:
+            self.record(await self.explorer.fetch_set_expansion(name))
+        except httpx.ConnectError:
+            raise
+        except httpx.HTTPStatusError as exc:
+            if exc.response.status_code != 404:
+                self.fail(name, exc)
+        except (httpx.HTTPError, ValueError) as exc:
+            self.fail(name, exc)
+        if name not in self.members and name not in self.failed:
+            logger.warning("AS set %s not found", name)
+            self.missing.add(name)
+        self.members.setdefault(name, {})
+
+    def fail(self, name: str, exc: Exception) -> None:
+        """Record a set that could not be fetched."""
+        logger.error("Failed to expand %s: %s", name, exc)
+        self.failed.add(name)
+        mark_partial(f"failed to expand {name}")
+
+    async def walk(self, root: str) -> None:
+        """Resolve a set and every set nested in it."""
+        queue: "asyncio.Queue[str]" = asyncio.Queue()
+        seen = {root}
+
+        async def worker() -> None:
+            while True:
+                name = await queue.get()
+                try:
+                    if name not in self.members:
+                        await self.resolve(name)
+                    for member in self.members[name]:
+                        if member not in seen and member_asn(member) is None:
+                            seen.add(member)
+                            queue.put_nowait(member)
+                finally:
+                    queue.task_done()
+
+        queue.put_nowait(root)
+        workers = [asyncio.ensure_future(worker()) for _ in range(self.concurrency)]
+        joined = asyncio.ensure_future(queue.join())
+        try:
+            # a worker only finishes by raising, which would leave the queue unfinished
+            done, _ = await asyncio.wait([joined, *workers], return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                task.result()
+        finally:
+            for task in [joined, *workers]:
+                task.cancel()
+
+    def summarize(self, root: str, max_depth: Optional[int] = None) -> AsSetExpansion:
+        """Collect the AS numbers and nested sets of a resolved set, breadth first.
+
+        With max_depth, only the members of sets up to max_depth levels below the set are collected.
+        """
+        asns: Set[int] = set()
+        depths = {root: 0}
+        queue: Deque[str] = collections.deque([root])
+        while queue:
+            name = queue.popleft()
+            if max_depth is not None and depths[name] > max_depth:
+                continue
+            for member in self.members.get(name, {}):
+                asn = member_asn(member)
+                if asn is not None:
+                    asns.add(asn)
+                elif member not in depths:
+                    depths[member] = depths[name] + 1
+                    queue.append(member)
+        del depths[root]
+        return AsSetExpansion(
+            name=root,
+            asns=sorted(asns),
+            sets=depths,
+            missing=sorted(self.missing & depths.keys()),
+            failed=sorted(self.failed & (depths.keys() | {root})),
+            cycles=self.cycles(root) if max_depth is None else [],
+            requests=self.requests,
+        )
+
+    def cycles(self, root: str) -> List[Tuple[str, str]]:
+        """Return the references from a set back to a set that includes it, found by depth-first search."""
+        cycles: List[Tuple[str, str]] = []
+        on_path = {root}
+        done: Set[str] = set()
+        stack = [(root, iter(self.members.get(root, {})))]
+        while stack:
+            name, members = stack[-1]
+            member = next(members, None)
+            if member is None:
+                stack.pop()
+                on_path.discard(name)
+                done.add(name)
+            elif member in on_path:
+                cycles.append((name, member))
+            elif member not in done and member_asn(member) is None:
+                on_path.add(member)
+                stack.append((member, iter(self.members.get(member, {}))))
+        return cycles
+
+    async def expand(self, as_set: str) -> AsSetExpansion:
+        """Expand an AS set recursively into its member AS numbers and nested sets."""
+        root = as_set.upper()
+        await self.walk(root)
+        logger.debug("Expanded %s with %d requests", root, self.requests)
+        return self.summarize(root)
+
+    async def direct_members(self, as_set: str) -> AsSetExpansion:
+        """Return the AS numbers and sets directly in an AS set."""
+        root = as_set.upper()
+        if root not in self.members:
+            await self.resolve(root)
+        return self.summarize(root, max_depth=0)
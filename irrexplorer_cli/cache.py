@@ -0,0 +1,169 @@
+"""Persistent on-disk cache for IRR Explorer API responses."""
+
+import logging
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+# IRRexplorer refreshes its data every few minutes, AS set memberships change less often
+ENDPOINT_TTLS: Dict[str, float] = {
+    "/api/prefixes/prefix/": 300.0,
+    "/api/prefixes/asn/": 300.0,
+    "/api/sets/member-of/": 900.0,
+}
+DEFAULT_TTL = 300.0
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# eviction frees space down to this share of the size cap, so it runs once per many inserts
+EVICT_TO = 0.9
+
+SCHEMA_VERSION = 2
+# the size column precedes the body so reading it does not walk the body's overflow pages, and triggers
+# keep the total size of all bodies in the one-row usage table, so the cache size is read without a scan
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, size INTEGER NOT NULL, "
+    "stored_at REAL NOT NULL, accessed_at REAL NOT NULL, body BLOB NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS responses_lru ON responses (accessed_at, size)",
+    "CREATE TABLE IF NOT EXISTS usage (id INTEGER PRIMARY KEY CHECK (id = 0), bytes INTEGER NOT NULL)",
+    "INSERT OR IGNORE INTO usage VALUES (0, 0)",
+    "CREATE TRIGGER IF NOT EXISTS responses_insert AFTER INSERT ON responses "
+    "BEGIN UPDATE usage SET bytes = bytes + NEW.size; END",
+    "CREATE TRIGGER IF NOT EXISTS responses_update AFTER UPDATE OF size ON responses "
+    "BEGIN UPDATE usage SET bytes = bytes + NEW.size - OLD.size; END",
+    "CREATE TRIGGER IF NOT EXISTS responses_delete AFTER DELETE ON responses "
+    "BEGIN UPDATE usage SET bytes = bytes - OLD.size; END",
+)
+
+
+def default_cache_dir() -> Path:
+    """Return the cache directory, honouring XDG_CACHE_HOME."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(Path.home(), ".cache")
+    return Path(base) / "irrexplorer-cli"
+
+
+class ResponseCache:
+    """SQLite backed response cache with per-endpoint TTL and LRU eviction."""
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        ttl: Optional[float] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        """Initialize cache, creating the database on first use."""
+        self.path = path or default_cache_dir() / "responses.sqlite3"
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._db: Optional[sqlite3.Connection] = None
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        """Return the database connection, opening it on first use."""
+        if self._db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(self.path, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            if db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                # a cache of an older layout is dropped rather than migrated
+                db.execute("DROP TABLE IF EXISTS responses")
+                db.execute("DROP TABLE IF EXISTS usage")
+                db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            for statement in SCHEMA:
+                db.execute(statement)
+            self._db = db
+        return self._db
+
+    def ttl_for(self, key: str) -> float:
+        """Return the TTL for a cache key based on its endpoint path."""
+        if self.ttl is not None:
+            return self.ttl
+        path = urlsplit(key).path
+        for endpoint, ttl in ENDPOINT_TTLS.items():
+            if path.startswith(endpoint):
+                return ttl
+        return DEFAULT_TTL
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return a cached response body, or None when missing, expired or unreadable."""
+        try:
+            row = self.db.execute("SELECT body, stored_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                logger.debug("Cache miss: %s", key)
+                return None
+
+            now = time.time()
+            body, stored_at = row
+            if now - stored_at > self.ttl_for(key):
+                logger.debug("Cache entry expired: %s", key)
+                self.db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+
+            logger.debug("Cache hit: %s", key)
+            self.db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            return bytes(body)
+        except (sqlite3.Error, OSError) as e:
+            logger.warning("Response cache unavailable: %s", e)
+            return None
+
+    def set(self, key: str, body: bytes) -> None:
+        """Store a response body and evict least recently used entries above the size cap."""
+        if len(body) > self.max_bytes:
+            logger.debug("Response too large to cache: %s (%d bytes)", key, len(body))
+            return
+        try:
+            now = time.time()
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                self.db.execute(
+                    "INSERT INTO responses (key, size, stored_at, accessed_at, body) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT (key) DO UPDATE SET size = excluded.size, stored_at = excluded.stored_at, "
+                    "accessed_at = excluded.accessed_at, body = excluded.body",
+                    (key, len(body), now, now, body),
+                )
+                self.evict()
+            except sqlite3.Error:
+                self.db.execute("ROLLBACK")
+                raise
+            self.db.execute("COMMIT")
+        except (sqlite3.Error, OSError) as e:
+            logger.warning("Response cache unavailable: %s", e)
+
+    def size(self) -> int:
+        """Return the total size of the cached bodies."""
+        return int(self.db.execute("SELECT bytes FROM usage").fetchone()[0])
+
+    def evict(self) -> None:
+        """Evict least recently used entries in one batch once the cache exceeds its size cap.
+
+        Entries are evicted until the cache is down to EVICT_TO of the cap, reading sizes from the LRU index.
+        """
+        total = self.size()
+        if total <= self.max_bytes:
+            return
+
+        excess = total - int(self.max_bytes * EVICT_TO)
+        count = 0
+        for (size,) in self.db.execute("SELECT size FROM responses ORDER BY accessed_at"):
+            if excess <= 0:
+                break
+            excess -= size
+            count += 1
+        self.db.execute(
+            "DELETE FROM responses WHERE rowid IN (SELECT rowid FROM responses ORDER BY accessed_at LIMIT ?)", (count,)
+        )
+        logger.debug("Evicted %d cache entries", count)
+
+    def clear(self) -> None:
+        """Remove every cached response."""
+        self.db.execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
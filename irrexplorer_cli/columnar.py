@@ -0,0 +1,168 @@
+"""Columnar Parquet and Arrow IPC output of prefix information, written in row groups as results arrive."""
+
+import importlib.util
+import logging
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional, Sequence
+
+from irrexplorer_cli.models import PrefixInfo
+
+logger = logging.getLogger(__name__)
+
+# rows buffered before they are written as one Parquet row group or Arrow record batch
+ROW_GROUP_SIZE = 10_000
+
+ROUTE_FIELDS = ("rpkiStatus", "rpkiMaxLength", "asn", "rpslText", "rpslPk")
+
+
+def pyarrow_available() -> bool:
+    """Check whether the optional PyArrow dependency is installed."""
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def prefix_schema() -> Any:
+    """Return the Arrow schema of a prefix row, with routes and messages as lists of structs."""
+    import pyarrow as pa  # pylint: disable=import-outside-toplevel
+
+    route_fields = [
+        ("rpkiStatus", pa.string()),
+        ("rpkiMaxLength", pa.int32()),
+        ("asn", pa.int64()),
+        ("rpslText", pa.string()),
+        ("rpslPk", pa.string()),
+    ]
+    return pa.schema(
+        [
+            ("type", pa.string()),
+            ("query", pa.string()),
+            ("prefix", pa.string()),
+            ("rir", pa.string()),
+            ("categoryOverall", pa.string()),
+            ("goodnessOverall", pa.int32()),
+            ("prefixSortKey", pa.string()),
+            ("bgpOrigins", pa.list_(pa.int64())),
+            ("rpkiRoutes", pa.list_(pa.struct(route_fields))),
+            # the IRR routes of all databases in one list, tagged with their database
+            ("irrRoutes", pa.list_(pa.struct([("database", pa.string()), *route_fields]))),
+            ("messages", pa.list_(pa.struct([("text", pa.string()), ("category", pa.string())]))),
+        ]
+    )
+
+
+class ListColumn:
+    """Column of lists, buffered as list offsets and flat values.
+
+    With fields, the lists hold structs, buffered as one flat list of values per field.
+    """
+
+    def __init__(self, fields: Optional[Sequence[str]] = None) -> None:
+        """Initialize an empty column of values, or of structs with the given fields."""
+        self.values: List[Any] = []
+        self.fields: Dict[str, List[Any]] = {field: [] for field in fields or ()}
+        self.offsets = [0]
+
+    def extend(self, items: Iterable[Any], **constants: Any) -> None:
+        """Add items to the list of the current row; struct fields are item attributes or given constants."""
+        if not self.fields:
+            self.values.extend(items)
+            return
+        for item in items:
+            for field, values in self.fields.items():
+                values.append(constants[field] if field in constants else getattr(item, field))
+            self.values.append(None)
+
+    def end_row(self) -> None:
+        """End the list of the current row."""
+        self.offsets.append(len(self.values))
+
+    def to_arrow(self, list_type: Any) -> Any:
+        """Build the Arrow list array of the buffered rows, then clear the buffer."""
+        import pyarrow as pa  # pylint: disable=import-outside-toplevel
+
+        if self.fields:
+            fields = list(list_type.value_type)
+            values = pa.StructArray.from_arrays(
+                [pa.array(self.fields[field.name], field.type) for field in fields], fields=fields
+            )
+        else:
+            values = pa.array(self.values, list_type.value_type)
+        array = pa.ListArray.from_arrays(pa.array(self.offsets, pa.int32()), values)
+        self.values = []
+        self.fields = {field: [] for field in self.fields}
+        self.offsets = [0]
+        return array
+
+
+class ColumnarWriter:
+    """Writer of prefix rows to a Parquet or Arrow IPC file, one row group per ROW_GROUP_SIZE rows.
+
+    Rows are appended field by field to column buffers, which become typed Arrow arrays without
+    an intermediate dict per row. Only the current row group is held in memory.
+    """
+
+    def __init__(self, sink: BinaryIO, output_format: str, row_group_size: int = ROW_GROUP_SIZE) -> None:
+        """Initialize writer of parquet or arrow output to a binary file object."""
+        import pyarrow as pa  # pylint: disable=import-outside-toplevel
+
+        self.schema = prefix_schema()
+        self.row_group_size = row_group_size
+        self.columns: Dict[str, List[Any]] = {}
+        self.lists = {
+            "bgpOrigins": ListColumn(),
+            "rpkiRoutes": ListColumn(ROUTE_FIELDS),
+            "irrRoutes": ListColumn(("database", *ROUTE_FIELDS)),
+            "messages": ListColumn(("text", "category")),
+        }
+        self.count = 0
+        if output_format == "parquet":
+            import pyarrow.parquet as pq  # pylint: disable=import-outside-toplevel
+
+            self.writer = pq.ParquetWriter(sink, self.schema, compression="zstd")
+        else:
+            self.writer = pa.ipc.new_file(sink, self.schema)
+
+    def add(self, row_type: str, query: str, info: PrefixInfo) -> None:
+        """Add a prefix row, writing a row group once enough rows are buffered."""
+        for name, value in (
+            ("type", row_type),
+            ("query", query),
+            ("prefix", info.prefix),
+            ("rir", info.rir),
+            ("categoryOverall", info.categoryOverall),
+            ("goodnessOverall", info.goodnessOverall),
+            ("prefixSortKey", info.prefixSortKey),
+        ):
+            self.columns.setdefault(name, []).append(value)
+        self.lists["bgpOrigins"].extend(info.bgpOrigins)
+        self.lists["rpkiRoutes"].extend(info.rpkiRoutes)
+        for database, routes in info.irrRoutes.items():
+            self.lists["irrRoutes"].extend(routes, database=database)
+        self.lists["messages"].extend(info.messages)
+        for column in self.lists.values():
+            column.end_row()
+        if len(self.columns["prefix"]) >= self.row_group_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered rows as a row group."""
+        import pyarrow as pa  # pylint: disable=import-outside-toplevel
+
+        if not self.columns:
+            return
+        rows = len(self.columns["prefix"])
+        arrays = [
+            (
+                self.lists[field.name].to_arrow(field.type)
+                if field.name in self.lists
+                else pa.array(self.columns[field.name], field.type)
+            )
+            for field in self.schema
+        ]
+        self.writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=self.schema))
+        self.columns = {}
+        self.count += rows
+        logger.debug("Wrote row group of %d rows, %d in total", rows, self.count)
+
+    def close(self) -> None:
+        """Write the remaining rows and the file footer."""
+        self.flush()
+        self.writer.close()
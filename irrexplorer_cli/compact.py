@@ -0,0 +1,108 @@
+"""Compact one-row-per-prefix table view, printed progressively."""
+
+import logging
+import time
+from typing import List, Optional, Tuple
+
+from rich.console import Console
+from rich.text import Text
+
+from irrexplorer_cli.models import PrefixInfo
+from irrexplorer_cli.profiling import profile_phase
+
+logger = logging.getLogger(__name__)
+
+STATUS_STYLES = {"success": "green", "warning": "yellow", "error": "red", "danger": "red", "info": "blue"}
+
+# fixed widths keep rows printed in separate batches aligned, IRR routes take the remaining width
+COLUMNS = (
+    ("Type", 7),
+    ("Prefix", 20),
+    ("RIR", 8),
+    ("Status", 7),
+    ("RPKI", 9),
+    ("Origins", 16),
+)
+PREFIX_COLUMN = 1
+MIN_IRR_WIDTH = 12
+FLUSH_ROWS = 200
+FLUSH_SECONDS = 0.1
+
+
+def fit(value: str, width: int) -> str:
+    """Pad a cell to its column width, truncating it with an ellipsis when too long."""
+    if len(value) > width:
+        return value[: width - 1] + "…"
+    return value.ljust(width)
+
+
+class CompactTable:
+    """Single table with one row per prefix, printed in batches as rows are added.
+
+    Rows are laid out directly as styled text lines, a Rich Table per batch costs ten times as much per row.
+    """
+
+    def __init__(self, console: Optional[Console] = None) -> None:
+        """Initialize an empty table; the header is printed with the first rows."""
+        self.console = console or Console()
+        self.irr_width = max(self.console.width - sum(width + 1 for _, width in COLUMNS), MIN_IRR_WIDTH)
+        self.width = sum(width + 1 for _, width in COLUMNS) + self.irr_width
+        self.lines: List[Text] = []
+        self.count = 0
+        self.flushed_at = time.monotonic()
+
+    def line(self, cells: List[Tuple[str, str]]) -> Text:
+        """Lay out (value, style) cells as one row, the last one being the IRR routes column."""
+        widths = [width for _, width in COLUMNS] + [self.irr_width]
+        text = Text(no_wrap=True, overflow="ellipsis")
+        for index, ((value, style), width) in enumerate(zip(cells, widths, strict=True)):
+            # prefixes are never truncated, a long IPv6 prefix shifts the rest of its row instead
+            text.append(value.ljust(width) if index == PREFIX_COLUMN else fit(value, width), style=style)
+            text.append(" ")
+        text.rstrip()
+        return text
+
+    def header(self) -> List[Text]:
+        """Return the header line and its rule."""
+        header = self.line([(name, "bold cyan") for name, _ in COLUMNS] + [("IRR Routes", "bold cyan")])
+        return [header, Text("─" * min(self.console.width, self.width), style="dim")]
+
+    def add(self, row_type: str, info: PrefixInfo) -> None:
+        """Queue a row for a prefix, printing the queued rows once enough have accumulated."""
+        rpki_status = info.rpkiRoutes[0].rpkiStatus if info.rpkiRoutes else "NOT_FOUND"
+        origins = ", ".join(f"AS{asn}" for asn in info.bgpOrigins) or "None"
+        irr_routes = " ".join(f"{db}:AS{route.asn}" for db, routes in info.irrRoutes.items() for route in routes)
+        self.lines.append(
+            self.line(
+                [
+                    (row_type, ""),
+                    (info.prefix, "bold"),
+                    (info.rir, ""),
+                    (info.categoryOverall, STATUS_STYLES.get(info.categoryOverall, "white")),
+                    (rpki_status, ""),
+                    (origins, ""),
+                    (irr_routes or "None", ""),
+                ]
+            )
+        )
+        if len(self.lines) >= FLUSH_ROWS or time.monotonic() - self.flushed_at >= FLUSH_SECONDS:
+            self.flush()
+
+    def flush(self) -> None:
+        """Print the queued rows."""
+        if not self.lines:
+            return
+        lines = self.header() + self.lines if not self.count else self.lines
+        with profile_phase("render"):
+            # rows are already laid out to the console width, soft wrapping skips Rich's line wrapping pass
+            self.console.print(*lines, sep="\n", soft_wrap=True)
+        self.count += len(self.lines)
+        self.lines = []
+        self.flushed_at = time.monotonic()
+
+    def close(self) -> None:
+        """Print the remaining rows, or a notice when there were none."""
+        self.flush()
+        if not self.count:
+            self.console.print("[yellow]No prefix information found[/yellow]")
+        logger.debug("Printed %d compact rows", self.count)
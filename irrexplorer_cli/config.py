@@ -0,0 +1,27 @@
+"""Runtime configuration for IRR Explorer API clients."""
+
+from pathlib import Path
+from typing import Optional
+
+from pydantic import BaseModel
+
+DEFAULT_BASE_URL = "https://irrexplorer.nlnog.net"
+
+
+class ClientConfig(BaseModel):
+    """HTTP client settings shared by every query in a CLI invocation."""
+
+    timeout: float = 300.0
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    http2: bool = False
+    cache: bool = False
+    cache_ttl: Optional[float] = None
+    prefix_index: bool = True
+    adaptive_concurrency: bool = True
+    hedge: bool = False
+    hedge_percentile: float = 95.0
+    snapshot: Optional[Path] = None
+    deadline: Optional[float] = None
+    daemon: bool = True
@@ -0,0 +1,201 @@
+"""Resident daemon sharing one warm HTTP session and response cache over a Unix socket.
+
+Each API request is one connection: the client sends a JSON line with the base URL and path, the daemon
+answers with a JSON header line giving the HTTP status and body length (or an error), then the body.
+Errors name their kind (timeout, connect), so clients raise the same httpx errors as a direct request would.
+Requests carry the client's cache settings (no_cache, ttl), which the daemon honours for that request.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+from irrexplorer_cli.cache import default_cache_dir
+from irrexplorer_cli.config import DEFAULT_BASE_URL, ClientConfig
+from irrexplorer_cli.irrexplorer import IrrExplorer
+from irrexplorer_cli.session import SessionManager
+
+logger = logging.getLogger(__name__)
+
+SOCKET_NAME = "irrexplorer-cli.sock"
+# environment variable naming the daemon socket, for daemons started with --socket
+SOCKET_ENV = "IRREXPLORER_SOCKET"
+# settings of the daemon's own session; clients setting any of them send their requests directly
+TRANSPORT_SETTINGS = (
+    "timeout",
+    "max_connections",
+    "max_keepalive_connections",
+    "keepalive_expiry",
+    "http2",
+    "adaptive_concurrency",
+    "hedge",
+    "hedge_percentile",
+)
+
+
+def default_socket_path() -> Path:
+    """Return the daemon socket path: IRREXPLORER_SOCKET, else in XDG_RUNTIME_DIR or the cache directory."""
+    if os.environ.get(SOCKET_ENV):
+        return Path(os.environ[SOCKET_ENV])
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return Path(runtime_dir) / SOCKET_NAME
+    return default_cache_dir() / SOCKET_NAME
+
+
+def daemon_listening(path: Path) -> bool:
+    """Check whether a daemon accepts connections on a socket path."""
+    if not path.exists():
+        return False
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(str(path))
+        except OSError:
+            return False
+    return True
+
+
+def uses_daemon_transport(config: ClientConfig) -> bool:
+    """Check whether client settings leave the transport to the daemon, so its requests can be forwarded."""
+    defaults = ClientConfig()
+    return all(getattr(config, name) == getattr(defaults, name) for name in TRANSPORT_SETTINGS)
+
+
+class Daemon:
+    """Server answering API requests of CLI invocations from one shared session and response cache."""
+
+    def __init__(self, config: Optional[ClientConfig] = None) -> None:
+        """Initialize daemon with the client settings of its session; a deadline would end it, so none applies."""
+        self.config = (config or ClientConfig()).model_copy(update={"deadline": None, "daemon": False})
+        self.session = SessionManager(self.config)
+        self.explorers: Dict[Tuple[str, bool, Optional[float]], IrrExplorer] = {}
+
+    def explorer(self, base_url: str, no_cache: bool = False, ttl: Optional[float] = None) -> IrrExplorer:
+        """Return the client for a base URL and the cache settings of a request, sharing the daemon's session."""
+        cache = self.config.cache and not no_cache
+        cache_ttl = self.config.cache_ttl if ttl is None else ttl
+        key = (base_url, cache, cache_ttl)
+        if key not in self.explorers:
+            config = self.config.model_copy(update={"cache": cache, "cache_ttl": cache_ttl})
+            self.explorers[key] = IrrExplorer(base_url, config, session=self.session)
+        return self.explorers[key]
+
+    async def answer(self, request: Dict[str, Any]) -> Tuple[Dict[str, Any], bytes]:
+        """Fetch a requested API path, returning the response header and body."""
+        explorer = self.explorer(
+            request.get("base_url") or DEFAULT_BASE_URL, bool(request.get("no_cache")), request.get("ttl")
+        )
+        try:
+            response = await explorer.get(request["path"])
+        except httpx.HTTPStatusError as exc:
+            return {"status": exc.response.status_code, "length": len(exc.response.content)}, exc.response.content
+        except httpx.TimeoutException as exc:
+            return {"error": "timeout", "message": str(exc)}, b""
+        except httpx.ConnectError as exc:
+            return {"error": "connect", "message": str(exc)}, b""
+        except httpx.HTTPError as exc:
+            return {"error": type(exc).__name__, "message": str(exc)}, b""
+        return {"status": response.status_code, "length": len(response.content)}, response.content
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answer the requests of one connection."""
+        try:
+            while line := await reader.readline():
+                try:
+                    request = json.loads(line)
+                    logger.debug("Daemon request: %s", request["path"])
+                    header, body = await self.answer(request)
+                except (ValueError, KeyError, TypeError) as exc:
+                    header, body = {"error": "request", "message": f"Invalid daemon request: {exc}"}, b""
+                writer.write(json.dumps(header).encode() + b"\n" + body)
+                await writer.drain()
+        except ConnectionError:
+            logger.debug("Daemon client disconnected")
+        finally:
+            writer.close()
+
+    async def serve(self, path: Path) -> None:
+        """Listen on a socket path until cancelled, then remove the socket and close the session."""
+        if daemon_listening(path):
+            raise RuntimeError(f"A daemon is already listening on {path}")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.unlink(missing_ok=True)
+        server = await asyncio.start_unix_server(self.handle, path=str(path))
+        os.chmod(path, 0o600)
+        logger.info("Daemon listening on %s", path)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            path.unlink(missing_ok=True)
+            await self.close()
+
+    async def close(self) -> None:
+        """Close the response caches and the shared session."""
+        for explorer in self.explorers.values():
+            await explorer.close()
+        await self.session.close()
+
+
+class DaemonExplorer(IrrExplorer):
+    """API client forwarding every request to a running daemon.
+
+    Caching, concurrency limits and hedging happen in the daemon, where they are shared by every invocation.
+    The client's cache settings are sent along with each request. If the daemon goes away, requests are sent
+    directly.
+    """
+
+    streaming = False
+
+    def __init__(self, path: Path, base_url: str = DEFAULT_BASE_URL, config: Optional[ClientConfig] = None) -> None:
+        """Initialize client forwarding to the daemon on a socket path."""
+        config = config or ClientConfig()
+        self.no_cache = not config.cache
+        self.ttl = config.cache_ttl
+        config = config.model_copy(update={"cache": False, "adaptive_concurrency": False, "hedge": False})
+        super().__init__(base_url=base_url, config=config)
+        self.socket_path = path
+        self.forwarding = True
+
+    async def send(self, url: str) -> httpx.Response:
+        """Forward one request to the daemon, or send it directly when the daemon is unreachable."""
+        if not self.forwarding:
+            return await super().send(url)
+        async with self.session.deadline.request(url):
+            try:
+                reader, writer = await asyncio.open_unix_connection(str(self.socket_path))
+            except OSError as exc:
+                logger.warning("Daemon not reachable on %s, sending requests directly: %s", self.socket_path, exc)
+                self.forwarding = False
+                return await super().send(url)
+            try:
+                request = {
+                    "base_url": self.base_url,
+                    "path": url.removeprefix(self.base_url),
+                    "no_cache": self.no_cache,
+                    "ttl": self.ttl,
+                }
+                writer.write(json.dumps(request).encode() + b"\n")
+                await writer.drain()
+                header = json.loads(await reader.readline() or b"{}")
+                body = await reader.readexactly(header.get("length", 0))
+            except (OSError, ValueError, asyncio.IncompleteReadError) as exc:
+                raise httpx.TransportError(f"Daemon connection failed: {exc}") from exc
+            finally:
+                writer.close()
+
+        if "status" not in header:
+            if header.get("error") == "timeout":
+                raise httpx.TimeoutException(header.get("message", "Daemon request timed out"))
+            if header.get("error") == "connect":
+                raise httpx.ConnectError(header.get("message", "Daemon could not connect"))
+            raise httpx.TransportError(header.get("message", "Daemon request failed"))
+        response = httpx.Response(header["status"], content=body, request=httpx.Request("GET", url))
+        response.raise_for_status()
+        return response
@@ -0,0 +1,85 @@
+"""Invocation deadline for API requests, and tracking of results cut short by it."""
+
+import asyncio
+import contextlib
+import logging
+import time
+from typing import AsyncContextManager, AsyncIterator, List, Optional, TypeVar
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# exit status when some requested results are missing from the output
+PARTIAL_EXIT_CODE = 3
+
+
+class Deadline:
+    """Point in time by which every request of an invocation must have finished."""
+
+    def __init__(self, seconds: Optional[float] = None) -> None:
+        """Initialize deadline seconds from now, or no deadline."""
+        self.expires_at = None if seconds is None else time.monotonic() + seconds
+
+    def remaining(self) -> Optional[float]:
+        """Return the seconds left before the deadline, or None without a deadline."""
+        if self.expires_at is None:
+            return None
+        return self.expires_at - time.monotonic()
+
+    @contextlib.asynccontextmanager
+    async def request(self, url: str) -> AsyncIterator[None]:
+        """Bound a request by the deadline, failing it with an httpx timeout so callers handle it as one."""
+        remaining = self.remaining()
+        if remaining is None:
+            yield
+            return
+        if remaining <= 0:
+            raise httpx.TimeoutException(f"Deadline passed before requesting {url}")
+        try:
+            async with asyncio.timeout(remaining):
+                yield
+        except TimeoutError as exc:
+            raise httpx.TimeoutException(f"Deadline passed while requesting {url}") from exc
+
+    @contextlib.asynccontextmanager
+    async def opened(self, context: AsyncContextManager[T], url: str) -> AsyncIterator[T]:
+        """Enter a context, such as opening a streamed response, within the deadline.
+
+        Only entering is bounded, the block may yield to other code, which a timeout must not cancel.
+        """
+        async with contextlib.AsyncExitStack() as stack:
+            async with self.request(url):
+                value = await stack.enter_async_context(context)
+            yield value
+
+    async def chunks(self, chunks: AsyncIterator[bytes], url: str) -> AsyncIterator[bytes]:
+        """Pass through streamed response chunks, failing with an httpx timeout once the deadline passes."""
+        while True:
+            async with self.request(url):
+                try:
+                    chunk = await anext(chunks)
+                except StopAsyncIteration:
+                    return
+            yield chunk
+
+
+_PARTIAL: List[str] = []
+
+
+def mark_partial(reason: str) -> None:
+    """Record that a result is missing from the output, and why."""
+    logger.debug("Partial results: %s", reason)
+    _PARTIAL.append(reason)
+
+
+def partial_reasons() -> List[str]:
+    """Return why results are missing from the output, empty when none are."""
+    return list(_PARTIAL)
+
+
+def reset_partial() -> None:
+    """Forget missing results, before running a new query."""
+    _PARTIAL.clear()
@@ -1,11 +1,12 @@
 """Helper functions for the CLI."""
 
 import ipaddress
+import json
 import logging
 import re
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
-from irrexplorer_cli.models import PrefixInfo, PrefixResult
+from irrexplorer_cli.models import PrefixInfo, validate_prefix_infos
 
 logger = logging.getLogger(__name__)
 
@@ -34,82 +35,94 @@ def validate_asn_format(asn_input: str) -> bool:
     return 0 <= asn_number <= 4294967295
 
 
+def validate_as_set_format(as_set: str) -> bool:
+    """Validate AS set format, including hierarchical names such as AS2111:AS-CUSTOMERS."""
+    if not re.fullmatch(r"[A-Za-z0-9_.:-]+", as_set):
+        return False
+    return any(part.upper().startswith("AS-") for part in as_set.split(":"))
+
+
+def normalize_asn_format(asn_input: str) -> str:
+    """Normalize ASN input to the AS-prefixed form used by the API."""
+    if not asn_input.upper().startswith("AS"):
+        return f"AS{asn_input}"
+    return f"AS{asn_input[2:]}"
+
+
 def format_prefix_result(result: PrefixInfo, prefix_type: str) -> str:
     """Format a single prefix result for CSV output."""
-    prefix_result = PrefixResult(
-        prefix=result.prefix,
-        categoryOverall=result.categoryOverall,
-        rir=result.rir,
-        rpkiRoutes=result.rpkiRoutes,
-        bgpOrigins=result.bgpOrigins,
-        irrRoutes=result.irrRoutes,
-        messages=result.messages,
-    )
-
     rpki_status = "NOT_FOUND"
-    if prefix_result.rpkiRoutes:
-        rpki_status = prefix_result.rpkiRoutes[0].rpkiStatus
+    if result.rpkiRoutes:
+        rpki_status = result.rpkiRoutes[0].rpkiStatus
 
-    bgp_origins = "|".join(str(asn) for asn in prefix_result.bgpOrigins)
+    bgp_origins = "|".join(str(asn) for asn in result.bgpOrigins)
 
     irr_routes = []
-    for db, routes in prefix_result.irrRoutes.items():
+    for db, routes in result.irrRoutes.items():
         for route in routes:
             irr_routes.append(f"{db}:AS{route.asn}:{route.rpkiStatus}")
     irr_routes_str = "|".join(irr_routes)
 
-    messages = "|".join(msg.text for msg in prefix_result.messages)
+    messages = "|".join(msg.text for msg in result.messages)
+
+    return (
+        f"{prefix_type},{result.prefix},{result.categoryOverall},"
+        f"{result.rir},{rpki_status},{bgp_origins},{irr_routes_str},{messages}"
+    )
+
+
+def format_asn_prefix_row(row_type: str, as_number: str, pfx: PrefixInfo) -> str:
+    """Format a single ASN prefix row for CSV output."""
+    rpki_status = "NOT_FOUND"
+    if pfx.rpkiRoutes:
+        rpki_status = pfx.rpkiRoutes[0].rpkiStatus
+
+    bgp_origins = "|".join(str(origin) for origin in pfx.bgpOrigins)
+    irr_routes = []
+    for db, routes in pfx.irrRoutes.items():
+        for route in routes:
+            irr_routes.append(f"{db}:AS{route.asn}:{route.rpkiStatus}")
+    irr_routes_str = "|".join(irr_routes)
+    messages = "|".join(msg.text for msg in pfx.messages)
 
     return (
-        f"{prefix_type},{prefix_result.prefix},{prefix_result.categoryOverall},"
-        f"{prefix_result.rir},{rpki_status},{bgp_origins},{irr_routes_str},{messages}"
+        f"{row_type},{as_number},{pfx.prefix},{pfx.categoryOverall},{pfx.rir},"
+        f"{rpki_status},{bgp_origins},{irr_routes_str},{messages}"
     )
 
 
+def format_prefix_ndjson(result: PrefixInfo, prefix_type: str, query: Optional[str] = None) -> str:
+    """Format a single prefix result as an NDJSON record."""
+    record: Dict[str, Any] = {"type": prefix_type}
+    if query is not None:
+        record["query"] = query
+    record.update(result.model_dump())
+    return json.dumps(record, separators=(",", ":"))
+
+
+def format_asn_prefix_ndjson(row_type: str, as_number: str, pfx: PrefixInfo) -> str:
+    """Format a single ASN prefix as an NDJSON record."""
+    return json.dumps({"type": row_type, "asn": as_number, **pfx.model_dump()}, separators=(",", ":"))
+
+
+def format_as_sets_ndjson(as_number: str, sets_data: Dict[str, Dict[str, List[str]]]) -> Iterator[str]:
+    """Format AS sets as NDJSON records."""
+    if sets_data and sets_data.get("setsPerIrr"):
+        for irr, sets in sets_data["setsPerIrr"].items():
+            for as_set in sets:
+                yield json.dumps({"type": "SET", "asn": as_number, "set": as_set, "irr": irr}, separators=(",", ":"))
+
+
 def format_direct_origins(as_number: str, results: Dict[str, List[Dict[str, Any]]]) -> None:
     """Format and print direct origin prefixes."""
-    for pfx_dict in results.get("directOrigin", []):
-        pfx = PrefixInfo(**pfx_dict)
-        rpki_status = "NOT_FOUND"
-        if pfx.rpkiRoutes:
-            rpki_status = pfx.rpkiRoutes[0].rpkiStatus
-
-        bgp_origins = "|".join(str(as_number) for as_number in pfx.bgpOrigins)
-        irr_routes = []
-        for db, routes in pfx.irrRoutes.items():
-            for route in routes:
-                irr_routes.append(f"{db}:AS{route.asn}:{route.rpkiStatus}")
-        irr_routes_str = "|".join(irr_routes)
-        messages = "|".join(msg.text for msg in pfx.messages)
-
-        print(
-            f"\nDIRECT,{as_number},{pfx.prefix},{pfx.categoryOverall},{pfx.rir},"
-            f"{rpki_status},{bgp_origins},{irr_routes_str},{messages}",
-            end="",
-        )
+    for pfx in validate_prefix_infos(results.get("directOrigin", [])):
+        print(f"\n{format_asn_prefix_row('DIRECT', as_number, pfx)}", end="")
 
 
 def format_overlapping_prefixes(as_number: str, results: Dict[str, List[Dict[str, Any]]]) -> None:
     """Format and print overlapping prefixes."""
-    for pfx_dict in results.get("overlaps", []):
-        pfx = PrefixInfo(**pfx_dict)
-        rpki_status = "NOT_FOUND"
-        if pfx.rpkiRoutes:
-            rpki_status = pfx.rpkiRoutes[0].rpkiStatus
-
-        bgp_origins = "|".join(str(as_number) for as_number in pfx.bgpOrigins)
-        irr_routes = []
-        for db, routes in pfx.irrRoutes.items():
-            for route in routes:
-                irr_routes.append(f"{db}:AS{route.asn}:{route.rpkiStatus}")
-        irr_routes_str = "|".join(irr_routes)
-        messages = "|".join(msg.text for msg in pfx.messages)
-
-        print(
-            f"\nOVERLAP,{as_number},{pfx.prefix},{pfx.categoryOverall},{pfx.rir},"
-            f"{rpki_status},{bgp_origins},{irr_routes_str},{messages}",
-            end="",
-        )
+    for pfx in validate_prefix_infos(results.get("overlaps", [])):
+        print(f"\n{format_asn_prefix_row('OVERLAP', as_number, pfx)}", end="")
 
 
 def format_as_sets(as_number: str, sets_data: Dict[str, Dict[str, List[str]]]) -> None:
@@ -123,16 +136,32 @@ def format_as_sets(as_number: str, sets_data: Dict[str, Dict[str, List[str]]]) -
 async def find_least_specific_prefix(direct_overlaps: List[PrefixInfo]) -> str | None:
     """Find the least specific prefix from the overlaps."""
     logger.debug("Finding least specific prefix from %d overlaps", len(direct_overlaps))
-    least_specific = None
-    for info in direct_overlaps:
-        if "/" in info.prefix:
-            _, mask = info.prefix.split("/")
-            if least_specific is None or int(mask) < int(least_specific.split("/")[1]):
-                least_specific = info.prefix
-                logger.debug("New least specific prefix found: %s", least_specific)
+    prefixes = [info.prefix for info in direct_overlaps if "/" in info.prefix]
+    # min() keeps the first of equally specific prefixes, parsing each mask once
+    least_specific = min(prefixes, key=lambda prefix: int(prefix.rsplit("/", 1)[1]), default=None)
+    logger.debug("Least specific prefix: %s", least_specific)
     return least_specific
 
 
+def is_same_prefix(first: str, second: str) -> bool:
+    """Check whether two prefixes (or an address and a host prefix) denote the same network."""
+    try:
+        return ipaddress.ip_network(first, strict=False) == ipaddress.ip_network(second, strict=False)
+    except ValueError:
+        return False
+
+
+def read_batch_queries(lines: Iterable[str]) -> List[str]:
+    """Read batch queries, one per line, skipping blank lines and comments."""
+    queries = []
+    for line in lines:
+        query = line.split("#", 1)[0].strip()
+        if query:
+            queries.append(query)
+    logger.debug("Read %d batch queries", len(queries))
+    return queries
+
+
 def validate_url_format(url: str) -> bool:
     """Validate URL format."""
     url_pattern = r"^https?://[a-zA-Z0-9.-]+(?:\.[a-zA-Z]{2,})+(?:/[^\s]*)?$"
@@ -1,7 +1,10 @@
 """Core functionality for IRR Explorer CLI."""
 
+import asyncio
+import functools
 import logging
-from typing import Any, Dict, List, Optional, cast
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Tuple, TypeVar, cast
 
 import backoff
 import httpx
@@ -11,65 +14,272 @@ from rich.panel import Panel
 from rich.table import Table
 from rich.text import Text
 
-from irrexplorer_cli.helpers import find_least_specific_prefix
+from irrexplorer_cli.cache import ResponseCache
+from irrexplorer_cli.compact import STATUS_STYLES
+from irrexplorer_cli.config import DEFAULT_BASE_URL, ClientConfig
+from irrexplorer_cli.deadline import mark_partial
+from irrexplorer_cli.helpers import find_least_specific_prefix, is_same_prefix
+from irrexplorer_cli.profiling import profile_chunks, profile_phase, trace_extensions
+from irrexplorer_cli.retry import budget_exhausted, first_success, not_retryable, retry_budget, spend_retry
+from irrexplorer_cli.session import SessionManager
+from irrexplorer_cli.streaming import aiter_chunks, iter_json_items
 
-from .models import PrefixInfo
+from .models import PrefixInfo, SetExpansion, decode_prefix_infos, validate_prefix_infos
 
 logger = logging.getLogger(__name__)
 
+ASN_PREFIX_KEYS = ("directOrigin", "overlaps")
+
+RETRY_TRIES = 3
+RETRY_MAX_TIME = 300.0
+
+Method = TypeVar("Method", bound=Callable[..., Awaitable[Any]])
+
+
+def retry_within_deadline(giveup: Callable[[Exception], bool]) -> Callable[[Method], Method]:
+    """Return a decorator retrying a client method on HTTP errors with exponential backoff.
+
+    Retries stop at the client's deadline: no backoff wait outlasts the time left, and none starts once it passed.
+    """
+
+    def decorator(method: Method) -> Method:
+        @functools.wraps(method)
+        async def retrying(self: "IrrExplorer", *args: Any, **kwargs: Any) -> Any:
+            remaining = self.session.deadline.remaining()
+            max_time = RETRY_MAX_TIME if remaining is None else min(max(remaining, 0.0), RETRY_MAX_TIME)
+            retry = backoff.on_exception(
+                backoff.expo,
+                httpx.HTTPError,
+                max_tries=RETRY_TRIES,
+                max_time=max_time,
+                giveup=giveup,
+                on_backoff=spend_retry,
+            )
+            return await retry(method)(self, *args, **kwargs)
+
+        return cast(Method, retrying)
+
+    return decorator
+
+
+# retries of every client share the process-wide retry budget
+retry_api_errors = retry_within_deadline(budget_exhausted)
+
+# AS set expansion gives up on client errors such as a 404 instead of retrying them for the full backoff
+retry_transient_errors = retry_within_deadline(not_retryable)
+
 
 class IrrExplorer:
     """IRR Explorer API client for prefix information retrieval."""
 
-    def __init__(self, base_url: str = "https://irrexplorer.nlnog.net") -> None:
-        """Initialize IRR Explorer client with base URL."""
+    # whether stream_asn_info reads responses as they arrive, instead of fetching them whole through get
+    streaming = True
+
+    def __init__(
+        self,
+        base_url: str = DEFAULT_BASE_URL,
+        config: Optional[ClientConfig] = None,
+        session: Optional[SessionManager] = None,
+    ) -> None:
+        """Initialize IRR Explorer client with base URL, a pooled HTTP session and optional cache."""
         self.base_url = base_url
-        self.timeout = httpx.Timeout(300.0)
-        self.client = httpx.AsyncClient(timeout=self.timeout)
-        self.console = Console()
+        self.owns_session = session is None
+        self.session = session or SessionManager(config)
+        config = config or self.session.config
+        self.timeout = self.session.timeout
+        self.cache = ResponseCache(ttl=config.cache_ttl) if config.cache else None
+        # timeout notices go to stderr, so they never end up inside json, csv or binary output
+        self.console = Console(stderr=True)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Return the pooled HTTP client, created on first use since its TLS setup takes a while."""
+        return self.session.client(self.base_url)
+
+    async def get(self, path: str) -> httpx.Response:
+        """Fetch an API path, answering from the response cache when possible.
+
+        Concurrent requests for the same URL share a single in-flight request.
+        """
+        url = f"{self.base_url}{path}"
+        body = self.local_body(url)
+        if body is not None:
+            return httpx.Response(200, content=body, request=httpx.Request("GET", url))
+
+        return cast(httpx.Response, await self.session.single_flight.do(url, lambda: self.request(url)))
+
+    def local_body(self, url: str) -> Optional[bytes]:
+        """Return a response body available without a request, from the response cache."""
+        if self.cache is None:
+            return None
+        with profile_phase("cache", url):
+            return self.cache.get(url)
+
+    async def request(self, url: str) -> httpx.Response:
+        """Send a request to the API and store the response in the cache."""
+        logger.debug("Making API request to: %s", url)
+        retry_budget().record_request()
+        with profile_phase("http", url) as record:
+            response = await self.hedged_send(url)
+            if record is not None:
+                record.bytes = len(response.content)
+        if self.cache is not None:
+            self.cache.set(url, response.content)
+        return response
+
+    async def send(self, url: str) -> httpx.Response:
+        """Send one attempt of a request, recording its latency."""
+        started = time.perf_counter()
+        async with self.session.deadline.request(url), self.session.slot():
+            response = await self.client.get(url, **trace_extensions(url))
+            response.raise_for_status()
+        self.session.latencies.add(time.perf_counter() - started)
+        return response
+
+    async def hedged_send(self, url: str) -> httpx.Response:
+        """Send a request, and a duplicate if it is slower than most when hedging is on, taking the first answer.
+
+        Duplicates count against the retry budget, so hedging adds at most a bounded share of requests.
+        """
+        delay = self.session.hedge_delay()
+        if delay is None:
+            return await self.send(url)
+
+        attempts: Set["asyncio.Future[httpx.Response]"] = {asyncio.ensure_future(self.send(url))}
+        try:
+            done, _ = await asyncio.wait(attempts, timeout=delay)
+            if not done and retry_budget().try_spend():
+                logger.debug("No response from %s after %.2fs, sending a hedged request", url, delay)
+                attempts.add(asyncio.ensure_future(self.send(url)))
+            return await first_success(attempts)
+        finally:
+            for attempt in attempts:
+                attempt.cancel()
 
-    @backoff.on_exception(backoff.expo, (httpx.HTTPError, httpx.RequestError), max_tries=3, max_time=300)
+    @retry_api_errors
     async def fetch_prefix_info(self, prefix: str) -> List[PrefixInfo]:
         """Fetch prefix information from IRR Explorer API."""
         logger.debug("Fetching prefix info for: %s", prefix)
+        index = self.session.prefix_index
+        if index is not None:
+            with profile_phase("index", prefix):
+                local = index.lookup(prefix)
+            if local is not None:
+                return local
+
         try:
-            url = f"{self.base_url}/api/prefixes/prefix/{prefix}"
-            logger.debug("Making API request to: %s", url)
-            response = await self.client.get(url)
-            response.raise_for_status()
-            data = response.json()
-            logger.debug("Received response data: %s", data)
-            return [PrefixInfo(**item) for item in data]
+            response = await self.get(f"/api/prefixes/prefix/{prefix}")
+            logger.debug("Received %d bytes of response data", len(response.content))
+            infos = decode_prefix_infos(response.content)
+            if index is not None:
+                index.add_all(infos)
+                index.mark_complete(prefix)
+            return infos
         except httpx.TimeoutException:
             logger.error("Request timeout for prefix: %s", prefix)
+            mark_partial(f"timed out fetching prefix {prefix}")
             return []
 
-    @backoff.on_exception(backoff.expo, (httpx.HTTPError, httpx.RequestError), max_tries=3, max_time=300)
+    @retry_api_errors
     async def fetch_asn_info(self, asn: str) -> Dict[str, Any]:
         """Fetch prefix information for an AS number."""
         try:
-            url = f"{self.base_url}/api/prefixes/asn/{asn}"
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(url)
-                response.raise_for_status()
+            response = await self.get(f"/api/prefixes/asn/{asn}")
+            with profile_phase("decode", str(response.url)):
                 data = cast(Dict[str, Any], response.json())
-                if not data:
-                    return {"directOrigin": [], "overlaps": []}
-                return data
+            if not data:
+                return {"directOrigin": [], "overlaps": []}
+            return data
         except httpx.TimeoutException:
             self.console.print(
                 f"[yellow]Request timed out while fetching info for {asn}. The server might be busy.[/yellow]"
             )
+            mark_partial(f"timed out fetching prefixes of {asn}")
             return {"directOrigin": [], "overlaps": []}
 
-    @backoff.on_exception(backoff.expo, (httpx.HTTPError, httpx.RequestError), max_tries=3, max_time=300)
+    async def stream_asn_info(self, asn: str) -> AsyncIterator[Tuple[str, PrefixInfo]]:
+        """Stream prefix information for an AS number as each prefix is decoded.
+
+        Yields ("directOrigin" | "overlaps", PrefixInfo) pairs without holding the whole response in memory.
+        If the streamed request fails before any prefix is decoded, the response is fetched whole through
+        fetch_asn_info instead, with its retries, single-flight and response cache.
+        """
+        path = f"/api/prefixes/asn/{asn}"
+        url = f"{self.base_url}{path}"
+        try:
+            body = self.local_body(url)
+            if body is None and not self.streaming:
+                body = (await self.get(path)).content
+            if body is not None:
+                async for key, item in iter_json_items(aiter_chunks(body), ASN_PREFIX_KEYS):
+                    with profile_phase("validate"):
+                        info = PrefixInfo.model_validate(item)
+                    yield key, info
+                return
+
+            decoded = False
+            try:
+                async for key, info in self.stream_prefix_items(url):
+                    decoded = True
+                    yield key, info
+            except httpx.HTTPError as exc:
+                if decoded or isinstance(exc, httpx.TimeoutException):
+                    raise
+                logger.debug("Streaming %s failed, fetching it whole: %s", url, exc)
+                results = await self.fetch_asn_info(asn)
+                for key in ASN_PREFIX_KEYS:
+                    for info in validate_prefix_infos(results.get(key, [])):
+                        yield key, info
+        except httpx.TimeoutException:
+            self.console.print(
+                f"[yellow]Request timed out while fetching info for {asn}. The server might be busy.[/yellow]"
+            )
+            mark_partial(f"timed out streaming prefixes of {asn}")
+
+    async def stream_prefix_items(self, url: str) -> AsyncIterator[Tuple[str, PrefixInfo]]:
+        """Send a streamed request for an ASN response, decoding prefixes as they arrive and caching the body.
+
+        The body is only kept for the cache while it fits in the cache size cap, so memory stays flat for
+        responses too large to cache.
+        """
+        logger.debug("Streaming API request to: %s", url)
+        retry_budget().record_request()
+        started = time.perf_counter()
+        parts: Optional[List[bytes]] = [] if self.cache is not None else None
+        size = 0
+
+        async def received(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+            nonlocal parts, size
+            async for chunk in chunks:
+                if parts is not None and self.cache is not None:
+                    size += len(chunk)
+                    if size > self.cache.max_bytes:
+                        logger.debug("Response too large to cache: %s (over %d bytes)", url, self.cache.max_bytes)
+                        parts = None
+                    else:
+                        parts.append(chunk)
+                yield chunk
+
+        stream = self.client.stream("GET", url, **trace_extensions(url))
+        async with self.session.slot(), self.session.deadline.opened(stream, url) as response:
+            response.raise_for_status()
+            chunks = profile_chunks(self.session.deadline.chunks(response.aiter_bytes(), url), url, started)
+            async for key, item in iter_json_items(received(chunks), ASN_PREFIX_KEYS):
+                with profile_phase("validate"):
+                    info = PrefixInfo.model_validate(item)
+                if self.session.prefix_index is not None:
+                    self.session.prefix_index.add(info)
+                yield key, info
+        if parts is not None and self.cache is not None:
+            self.cache.set(url, b"".join(parts))
+
+    @retry_api_errors
     async def fetch_asn_sets(self, asn: str) -> Dict[str, Any]:
         """Fetch AS sets information for an AS number."""
         try:
-            url = f"{self.base_url}/api/sets/member-of/{asn}"
-            response = await self.client.get(url)
-            response.raise_for_status()
-            data = cast(Dict[str, Any], response.json())
+            response = await self.get(f"/api/sets/member-of/{asn}")
+            with profile_phase("decode", str(response.url)):
+                data = cast(Dict[str, Any], response.json())
             if not data:
                 return {"setsPerIrr": {}}
             return data
@@ -77,19 +287,36 @@ class IrrExplorer:
             self.console.print(
                 f"[yellow]Request timed out while fetching AS sets for {asn}. The server might be busy.[/yellow]"
             )
+            mark_partial(f"timed out fetching AS sets of {asn}")
             return {"setsPerIrr": {}}
 
+    @retry_transient_errors
+    async def fetch_set_expansion(self, as_set: str) -> List[SetExpansion]:
+        """Fetch the members of an AS set and of the sets nested in it, as deep as the API expands them."""
+        response = await self.get(f"/api/sets/expand/{as_set}")
+        with profile_phase("decode", str(response.url)):
+            return [SetExpansion.model_validate(item) for item in response.json() or []]
+
     async def close(self) -> None:
-        """Close the HTTP client connection."""
-        await self.client.aclose()
+        """Close the response cache and the HTTP session if this client owns it."""
+        if self.cache is not None:
+            self.cache.close()
+        if self.owns_session:
+            await self.session.close()
 
 
 class IrrDisplay:
     """Display handler for IRR Explorer prefix information."""
 
-    def __init__(self) -> None:
-        """Initialize display handler with Rich console."""
+    def __init__(self, explorer: Optional[IrrExplorer] = None) -> None:
+        """Initialize display handler with Rich console and optional shared API client."""
         self.console = Console()
+        self.explorer = explorer
+
+    def render(self, renderable: Panel) -> None:
+        """Print a panel, timing Rich layout and rendering."""
+        with profile_phase("render"):
+            self.console.print(renderable)
 
     async def create_prefix_panel(self, info: PrefixInfo) -> Panel:
         """Create Rich panel with prefix information."""
@@ -116,11 +343,14 @@ class IrrDisplay:
         """Sort and group prefix information panels by status category."""
         status_groups: Dict[str, List[Panel]] = {"success": [], "warning": [], "error": [], "danger": [], "info": []}
 
-        sorted_infos = sorted(prefix_infos, key=lambda x: (-int(x.prefix.split("/")[1]), x.categoryOverall))
+        with profile_phase("format"):
+            sorted_infos = sorted(prefix_infos, key=lambda x: (-int(x.prefix.split("/")[1]), x.categoryOverall))
 
-        for info in sorted_infos:
-            panel = await self.create_prefix_panel(info)
-            status_groups[info.categoryOverall].append(panel)
+            for info in sorted_infos:
+                panel = await self.create_prefix_panel(info)
+                status_groups[info.categoryOverall].append(panel)
+                # yield to the event loop so requests in flight keep progressing
+                await asyncio.sleep(0)
 
         return [
             panel for status in ["success", "warning", "error", "danger", "info"] for panel in status_groups[status]
@@ -167,22 +397,37 @@ class IrrDisplay:
 
     async def get_status_style(self, category: str) -> str:
         """Get Rich style color based on status category."""
-        return {"success": "green", "warning": "yellow", "error": "red", "danger": "red", "info": "blue"}.get(
-            category, "white"
-        )
+        return STATUS_STYLES.get(category, "white")
 
-    async def display_prefix_info(self, direct_overlaps: List[PrefixInfo]) -> None:
-        """Display prefix information in Rich panels."""
+    async def display_prefix_info(self, direct_overlaps: List[PrefixInfo], query: Optional[str] = None) -> None:
+        """Display prefix information in Rich panels.
+
+        All overlaps of the least specific match are fetched while the direct overlaps are rendered,
+        and not fetched at all when the least specific match is the queried prefix itself.
+        """
         logger.debug("Displaying prefix info for %d overlaps", len(direct_overlaps))
         if not direct_overlaps:
             logger.debug("No prefix information found")
             self.console.print("[yellow]No prefix information found[/yellow]")
             return
 
-        await self.display_direct_overlaps(direct_overlaps)
         least_specific = await find_least_specific_prefix(direct_overlaps)
-        if least_specific:
-            await self.display_all_overlaps(least_specific)
+        if not least_specific:
+            await self.display_direct_overlaps(direct_overlaps)
+            return
+
+        if query and is_same_prefix(query, least_specific):
+            logger.debug("Least specific match is the queried prefix, reusing its overlaps")
+            await self.display_direct_overlaps(direct_overlaps)
+            await self.print_all_overlaps(least_specific, direct_overlaps)
+            return
+
+        all_overlaps = asyncio.ensure_future(self.fetch_all_overlaps(least_specific))
+        try:
+            await self.display_direct_overlaps(direct_overlaps)
+            await self.display_all_overlaps(least_specific, all_overlaps)
+        finally:
+            all_overlaps.cancel()
 
     async def display_direct_overlaps(self, direct_overlaps: List[PrefixInfo]) -> None:
         """Display directly overlapping prefixes."""
@@ -192,35 +437,49 @@ class IrrDisplay:
 
         direct_panels = await self.sort_and_group_panels(direct_overlaps)
         direct_columns = Columns(direct_panels, equal=True, expand=True)
-        self.console.print(
+        # render in a worker thread so requests in flight keep progressing on the event loop
+        await asyncio.to_thread(
+            self.render,
             Panel(
                 direct_columns,
                 title=f"[bold]Directly overlapping prefixes of {direct_overlaps[0].prefix}[/bold]",
                 expand=False,
-            )
+            ),
         )
 
-    async def display_all_overlaps(self, least_specific: str) -> None:
-        """Display all overlaps for least specific prefix."""
+    async def fetch_all_overlaps(self, least_specific: str) -> List[PrefixInfo]:
+        """Fetch all overlaps for least specific prefix."""
+        explorer = self.explorer or IrrExplorer()
         try:
-            explorer = IrrExplorer()
-            all_overlaps = await explorer.fetch_prefix_info(least_specific)
-            all_panels = await self.sort_and_group_panels(all_overlaps)
-            all_columns = Columns(all_panels, equal=True, expand=True)
+            return await explorer.fetch_prefix_info(least_specific)
+        finally:
+            if explorer is not self.explorer:
+                await explorer.close()
 
-            self.console.print("\n")
-            self.console.print(
-                Panel(
-                    all_columns,
-                    title=f"[bold]All overlaps of least specific match {least_specific}[/bold]",
-                    expand=False,
-                )
-            )
-            await explorer.close()
+    async def display_all_overlaps(
+        self, least_specific: str, all_overlaps: Optional[Awaitable[List[PrefixInfo]]] = None
+    ) -> None:
+        """Display all overlaps for least specific prefix, awaiting an already started fetch if given."""
+        try:
+            if all_overlaps is None:
+                all_overlaps = self.fetch_all_overlaps(least_specific)
+            await self.print_all_overlaps(least_specific, await all_overlaps)
         except (httpx.HTTPError, ValueError, RuntimeError) as e:
             self.console.print(f"[red]Error fetching overlaps for {least_specific}: {str(e)}[/red]")
-        finally:
-            await explorer.close()
+
+    async def print_all_overlaps(self, least_specific: str, all_overlaps: List[PrefixInfo]) -> None:
+        """Print already fetched overlaps of the least specific prefix."""
+        all_panels = await self.sort_and_group_panels(all_overlaps)
+        all_columns = Columns(all_panels, equal=True, expand=True)
+
+        self.console.print("\n")
+        self.render(
+            Panel(
+                all_columns,
+                title=f"[bold]All overlaps of least specific match {least_specific}[/bold]",
+                expand=False,
+            )
+        )
 
     def get_rpki_status(self, prefix: Dict[str, Any]) -> str:
         """Extract RPKI status from prefix info."""
@@ -246,13 +505,13 @@ class IrrDisplay:
             return
 
         try:
-            direct_infos = [PrefixInfo(**prefix) for prefix in data["directOrigin"]]
+            direct_infos = validate_prefix_infos(data["directOrigin"])
         except (ValueError, TypeError):
             return
 
         direct_panels = await self.sort_and_group_panels(direct_infos)
         direct_columns = Columns(direct_panels, equal=True, expand=True)
-        self.console.print(
+        self.render(
             Panel(
                 direct_columns,
                 title=f"[bold]Prefixes directly originated by {asn}[/bold]",
@@ -266,7 +525,7 @@ class IrrDisplay:
             return
 
         try:
-            overlap_infos = [PrefixInfo(**prefix) for prefix in data["overlaps"]]
+            overlap_infos = validate_prefix_infos(data["overlaps"])
         except (ValueError, TypeError):
             return
 
@@ -274,7 +533,7 @@ class IrrDisplay:
         if overlap_panels:
             self.console.print("\n")
             overlap_columns = Columns(overlap_panels, equal=True, expand=True)
-            self.console.print(
+            self.render(
                 Panel(
                     overlap_columns,
                     title=f"[bold]Overlapping prefixes related to {asn}[/bold]",
@@ -295,7 +554,7 @@ class IrrDisplay:
                 sets_panels.append(panel)
 
             sets_columns = Columns(sets_panels, equal=True, expand=True)
-            self.console.print(
+            self.render(
                 Panel(
                     sets_columns,
                     title=f"[bold]AS Sets including {asn}[/bold]",
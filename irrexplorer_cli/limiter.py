@@ -0,0 +1,118 @@
+"""Adaptive client-side concurrency limit for API requests."""
+
+import asyncio
+import contextlib
+import email.utils
+import logging
+import time
+from typing import AsyncIterator, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+INITIAL_LIMIT = 4.0
+DECREASE_FACTOR = 0.5
+# short-term latency above this multiple of the long-term latency counts as congestion
+LATENCY_TOLERANCE = 2.0
+SHORT_SMOOTHING = 0.2
+LONG_SMOOTHING = 0.02
+MAX_RETRY_AFTER = 300.0
+
+
+def retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    """Return the delay requested by a Retry-After header, in seconds or as an HTTP date."""
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = email.utils.parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER)
+
+
+class AdaptiveLimiter:  # pylint: disable=too-many-instance-attributes
+    """AIMD limit on in-flight requests, shared by every client of a session.
+
+    The limit doubles per round trip until the first congestion signal (slow start), then grows by one per
+    round trip. HTTP 429, 5xx, timeouts, transport errors and a short-term latency average well above the
+    long-term one halve it, at most once per round trip. The long-term average follows the workload, so slow
+    but steady responses (such as large ASNs) do not keep shrinking the limit. Retry-After pauses new requests.
+    """
+
+    def __init__(self, max_limit: int, initial_limit: float = INITIAL_LIMIT) -> None:
+        """Initialize limiter allowing up to max_limit requests in flight."""
+        self.max_limit = float(max_limit)
+        self.limit = min(initial_limit, self.max_limit)
+        self.inflight = 0
+        self.slow_start = True
+        self.paused_until = 0.0
+        self.decreased_at = 0.0
+        self.short_latency: Optional[float] = None
+        self.long_latency: Optional[float] = None
+        self.condition = asyncio.Condition()
+
+    def on_success(self, latency: float) -> None:
+        """Grow the limit after a successful request, or shrink it when latency shows queueing."""
+        if self.short_latency is None or self.long_latency is None:
+            self.short_latency = self.long_latency = latency
+        self.short_latency += SHORT_SMOOTHING * (latency - self.short_latency)
+        self.long_latency += LONG_SMOOTHING * (latency - self.long_latency)
+        if self.short_latency > LATENCY_TOLERANCE * self.long_latency:
+            self.on_congestion(f"latency {self.short_latency:.2f}s", None)
+            return
+        self.limit = min(self.limit + (1.0 if self.slow_start else 1.0 / self.limit), self.max_limit)
+
+    def on_congestion(self, reason: str, retry_after: Optional[float]) -> None:
+        """Halve the limit, once per round trip, and pause new requests if the server asked for it."""
+        now = time.monotonic()
+        if retry_after:
+            self.paused_until = max(self.paused_until, now + retry_after)
+            logger.info("Server asked to retry after %.1fs, pausing new requests", retry_after)
+        if now - self.decreased_at < (self.short_latency or 0.0):
+            return
+        self.slow_start = False
+        self.decreased_at = now
+        self.limit = max(self.limit * DECREASE_FACTOR, 1.0)
+        logger.debug("Congestion (%s), concurrency limit lowered to %.1f", reason, self.limit)
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent."""
+        while (delay := self.paused_until - time.monotonic()) > 0:
+            await asyncio.sleep(delay)
+        async with self.condition:
+            await self.condition.wait_for(lambda: self.inflight < int(self.limit))
+            self.inflight += 1
+
+    async def release(self) -> None:
+        """Free a slot and wake the requests it lets through."""
+        async with self.condition:
+            self.inflight -= 1
+            self.condition.notify(max(int(self.limit) - self.inflight, 0))
+
+    @contextlib.asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold a slot for one request, learning from how it ends.
+
+        The request must call raise_for_status inside the block, so throttling and server errors reach the limiter.
+        """
+        await self.acquire()
+        started = time.monotonic()
+        try:
+            yield
+        except httpx.HTTPStatusError as exc:
+            status = exc.response.status_code
+            if status == 429 or status >= 500:
+                self.on_congestion(f"HTTP {status}", retry_after_seconds(exc.response))
+            raise
+        except httpx.TransportError as exc:
+            self.on_congestion(type(exc).__name__, None)
+            raise
+        else:
+            self.on_success(time.monotonic() - started)
+        finally:
+            await self.release()
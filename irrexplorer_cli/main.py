@@ -1,25 +1,39 @@
-"""Command-line interface for IRR Explorer queries."""
+"""Command-line interface for IRR Explorer queries.
+
+Only typer is imported at module load. The HTTP client, models, Rich and the query functions are
+imported inside the commands that use them, so --help, --version and shell completion start quickly.
+"""
+
+# pylint: disable=import-outside-toplevel
 
-import asyncio
 import logging
-from importlib.metadata import version
-from typing import Optional
+import sys
+from enum import Enum
+from pathlib import Path
+from typing import TYPE_CHECKING, Annotated, Any, Coroutine, Dict, List, Optional
 
 import typer
-from rich.console import Console
-
-from irrexplorer_cli.helpers import validate_asn_format, validate_prefix_format, validate_url_format
-from irrexplorer_cli.queries import async_asn_query, async_prefix_query
 
-__version__ = version("irrexplorer-cli")
+if TYPE_CHECKING:
+    from irrexplorer_cli.config import ClientConfig
 
 CTX_OPTION = typer.Option(None, hidden=True)
+
+
+class View(str, Enum):
+    """Layouts of the default Rich output."""
+
+    PANELS = "panels"
+    COMPACT = "compact"
+
+
 app = typer.Typer(
     help="CLI tool to query IRR Explorer data for prefix information",
     no_args_is_help=True,
     context_settings={"help_option_names": ["-h", "--help"]},
 )
-console = Console()
+snapshot_app = typer.Typer(help="Build snapshot files for offline queries", no_args_is_help=True)
+app.add_typer(snapshot_app, name="snapshot")
 logger = logging.getLogger(__name__)
 
 
@@ -33,76 +47,517 @@ def setup_logging(debug: bool) -> None:
     httpx_logger.setLevel(logging.DEBUG if debug else logging.WARNING)
 
 
+def finish_profile(profile_output: Optional[Path]) -> None:
+    """Stop profiling and print the summary, or write the JSON report."""
+    from rich.console import Console
+
+    from irrexplorer_cli.profiling import stop_profiling
+
+    profiler = stop_profiling()
+    if profiler is None:
+        return
+    if profile_output is not None:
+        profiler.write(profile_output)
+        logger.debug("Profile report written to %s", profile_output)
+    else:
+        profiler.print_summary(Console(stderr=True))
+
+
+def resolve_output_format(output_format: Optional[str], view: View) -> Optional[str]:
+    """Return the output format for the query functions; the view only applies to Rich output."""
+    if output_format is None and view == View.COMPACT:
+        return "compact"
+    return output_format
+
+
+def run_query(query: Coroutine[Any, Any, None]) -> None:
+    """Run a query, exiting with PARTIAL_EXIT_CODE after its output when some results are missing from it."""
+    import asyncio
+
+    from rich.console import Console
+
+    from irrexplorer_cli.deadline import PARTIAL_EXIT_CODE, partial_reasons, reset_partial
+
+    reset_partial()
+    asyncio.run(query)
+    reasons = partial_reasons()
+    if reasons:
+        Console(stderr=True).print(
+            f"[yellow]Partial results: {len(reasons)} requests did not complete ({reasons[0]}"
+            f"{', ...' if len(reasons) > 1 else ''})[/yellow]"
+        )
+        raise typer.Exit(PARTIAL_EXIT_CODE)
+
+
+def check_exclusive(**options: bool) -> None:
+    """Exit with an error when more than one of the given options is set."""
+    given = [f"--{name}" for name, value in options.items() if value]
+    if len(given) > 1:
+        typer.echo(f"Error: {' and '.join(given)} cannot be combined")
+        raise typer.Exit(1)
+
+
+def check_summary_options(watch: Optional[float], output_format: Optional[str]) -> None:
+    """Exit with an error when --summary is combined with options it cannot honour."""
+    if watch is not None:
+        typer.echo("Error: --summary cannot be combined with --watch")
+        raise typer.Exit(1)
+    if output_format not in (None, "json", "compact"):
+        typer.echo(f"Error: --summary does not support {output_format} output, use json or the default tables")
+        raise typer.Exit(1)
+
+
+def check_aggregate_options(watch: Optional[float], output_format: Optional[str]) -> None:
+    """Exit with an error when --aggregate is combined with options it cannot honour."""
+    if watch is not None:
+        typer.echo("Error: --aggregate cannot be combined with --watch")
+        raise typer.Exit(1)
+    if output_format in ("parquet", "arrow"):
+        typer.echo(f"Error: --aggregate does not support {output_format} output, use json, ndjson or csv")
+        raise typer.Exit(1)
+
+
+def check_columnar_output(watch: Optional[float], output_format: str) -> None:
+    """Exit with an error when Parquet or Arrow output cannot be written."""
+    from irrexplorer_cli.columnar import pyarrow_available
+
+    if watch is not None:
+        typer.echo(f"Error: --format {output_format} cannot be combined with --watch")
+        raise typer.Exit(1)
+    if not pyarrow_available():
+        typer.echo(f"Error: --format {output_format} requires pyarrow (pip install irrexplorer-cli[columnar])")
+        raise typer.Exit(1)
+    if sys.stdout.isatty():
+        typer.echo(f"Error: --format {output_format} writes a binary file, redirect the output to a file")
+        raise typer.Exit(1)
+
+
+def parse_output(output: str, watch: Optional[float], output_format: Optional[str]) -> Path:
+    """Return the database path of an --output sink, exiting with an error when it is not a writable sqlite:PATH."""
+    kind, _, path = output.partition(":")
+    if kind != "sqlite" or not path:
+        typer.echo(f"Error: Unsupported output: {output}, use sqlite:PATH")
+        raise typer.Exit(1)
+    if watch is not None or output_format is not None:
+        typer.echo("Error: --output cannot be combined with --watch or --format")
+        raise typer.Exit(1)
+    if not Path(path).parent.is_dir():
+        typer.echo(f"Error: Directory of {path} does not exist")
+        raise typer.Exit(1)
+    return Path(path)
+
+
+def run_watch(
+    queries: List[str],
+    interval: float,
+    output_format: Optional[str],
+    base_url: Optional[str],
+    config: Optional["ClientConfig"],
+) -> None:
+    """Watch a single query until interrupted."""
+    import asyncio
+
+    from irrexplorer_cli import queries as query_functions
+
+    if len(queries) > 1:
+        typer.echo(f"Error: --watch takes a single query, not {len(queries)}")
+        raise typer.Exit(1)
+    if output_format not in (None, "ndjson"):
+        typer.echo(f"Error: --watch does not support {output_format} output, use ndjson or the default text")
+        raise typer.Exit(1)
+    try:
+        asyncio.run(query_functions.async_watch_query(queries[0], interval, output_format, base_url, config))
+    except KeyboardInterrupt:
+        logger.debug("Watch of %s stopped", queries[0])
+
+
+def client_config(ctx: typer.Context) -> Optional["ClientConfig"]:
+    """Return the client settings of the global options, and apply the retry budget they set."""
+    options: Optional[Dict[str, Any]] = ctx.obj.get("client_options")
+    if options is None:
+        return None
+    from irrexplorer_cli.config import ClientConfig
+    from irrexplorer_cli.retry import configure_retry_budget
+
+    configure_retry_budget(ctx.obj["retry_budget"])
+    return ClientConfig(**options)
+
+
 def version_display(display_version: bool) -> None:
     """Display version information and exit."""
     if display_version:
-        print(f"[bold]IRR Explorer CLI[/bold] version: {__version__}")
+        from importlib.metadata import version
+
+        print(f"[bold]IRR Explorer CLI[/bold] version: {version('irrexplorer-cli')}")
         raise typer.Exit()
 
 
+def set_output_format(output_format: Optional[str]) -> Optional[str]:
+    """Reject the columnar formats for AS set output, which has no prefix rows."""
+    if output_format in ("parquet", "arrow"):
+        raise typer.BadParameter(
+            f"{output_format} output is only available for prefix and asn, use json, ndjson or csv"
+        )
+    return output_format
+
+
 @app.callback()
-def callback(
+def callback(  # pylint: disable=too-many-arguments,too-many-positional-arguments,too-many-locals
     ctx: typer.Context,
-    _: bool = typer.Option(None, "--version", "-v", callback=version_display, is_eager=True),
-    base_url: Optional[str] = typer.Option(None, "--url", "-u", help="Base URL for IRR Explorer API"),
-    debug: bool = typer.Option(False, "--debug", "-d", help="Enable debug logging"),
+    _: Annotated[Optional[bool], typer.Option("--version", "-v", callback=version_display, is_eager=True)] = None,
+    base_url: Annotated[Optional[str], typer.Option("--url", "-u", help="Base URL for IRR Explorer API")] = None,
+    debug: Annotated[bool, typer.Option("--debug", "-d", help="Enable debug logging")] = False,
+    max_connections: Annotated[
+        int, typer.Option("--max-connections", min=1, help="Maximum number of pooled HTTP connections")
+    ] = 100,
+    max_keepalive: Annotated[
+        int, typer.Option("--max-keepalive", min=0, help="Maximum number of idle keep-alive connections")
+    ] = 20,
+    keepalive_expiry: Annotated[
+        float, typer.Option("--keepalive-expiry", min=0, help="Seconds an idle keep-alive connection is kept open")
+    ] = 30.0,
+    http2: Annotated[bool, typer.Option("--http2/--no-http2", help="Use HTTP/2 multiplexing (requires h2)")] = False,
+    no_cache: Annotated[bool, typer.Option("--no-cache", help="Disable the on-disk response cache")] = False,
+    cache_ttl: Annotated[
+        Optional[float], typer.Option("--cache-ttl", min=0, help="Override cache TTL in seconds for all endpoints")
+    ] = None,
+    adaptive: Annotated[
+        bool,
+        typer.Option(
+            "--adaptive/--no-adaptive", help="Adapt in-flight requests to throttling, server errors and latency"
+        ),
+    ] = True,
+    hedge: Annotated[
+        bool,
+        typer.Option("--hedge/--no-hedge", help="Send a duplicate of requests slower than most, use the first answer"),
+    ] = False,
+    hedge_percentile: Annotated[
+        float, typer.Option("--hedge-percentile", min=50, max=99.9, help="Latency percentile after which to hedge")
+    ] = 95.0,
+    retry_budget: Annotated[
+        float, typer.Option("--retry-budget", min=0, help="Retries and hedges allowed, as a percentage of requests")
+    ] = 10.0,
+    profile: Annotated[
+        bool, typer.Option("--profile", help="Print wall time per phase (HTTP, decoding, rendering) to stderr")
+    ] = False,
+    profile_output: Annotated[
+        Optional[Path],
+        typer.Option("--profile-output", dir_okay=False, help="Write the --profile report as JSON to a file"),
+    ] = None,
+    snapshot: Annotated[
+        Optional[Path],
+        typer.Option(
+            "--snapshot", exists=True, dir_okay=False, help="Answer queries from a snapshot file, without network"
+        ),
+    ] = None,
+    deadline: Annotated[
+        Optional[float],
+        typer.Option(
+            "--deadline", min=0, help="Stop waiting for requests after SECONDS and print partial results (exit 3)"
+        ),
+    ] = None,
+    no_daemon: Annotated[
+        bool, typer.Option("--no-daemon", help="Send requests directly even when a daemon is running")
+    ] = False,
 ) -> None:
     """Query IRR Explorer for prefix information."""
     ctx.ensure_object(dict)
     ctx.obj["base_url"] = base_url
+    ctx.obj["client_options"] = {
+        "max_connections": max_connections,
+        "max_keepalive_connections": max_keepalive,
+        "keepalive_expiry": keepalive_expiry,
+        "http2": http2,
+        "cache": not no_cache,
+        "cache_ttl": cache_ttl,
+        "adaptive_concurrency": adaptive,
+        "hedge": hedge,
+        "hedge_percentile": hedge_percentile,
+        "snapshot": snapshot,
+        "deadline": deadline,
+        "daemon": not no_daemon,
+    }
+    ctx.obj["retry_budget"] = retry_budget / 100
     setup_logging(debug)
     logger.debug("CLI initialized with base_url: %s", base_url)
+    if snapshot is not None:
+        from irrexplorer_cli.snapshot import Snapshot
+
+        try:
+            Snapshot(snapshot).close()
+        except ValueError as exc:
+            typer.echo(f"Error: {exc}")
+            raise typer.Exit(1) from exc
+    if profile or profile_output is not None:
+        from irrexplorer_cli.profiling import start_profiling
+
+        start_profiling()
+        ctx.call_on_close(lambda: finish_profile(profile_output))
 
 
 @app.command(no_args_is_help=True)
-def prefix(
+def prefix(  # pylint: disable=too-many-arguments,too-many-positional-arguments,too-many-locals,too-many-branches
     ctx: typer.Context,
-    prefix_query: str = typer.Argument(None, help="Prefix to query (e.g., 193.0.0.0/21)"),
-    output_format: Optional[str] = typer.Option(None, "--format", "-f", help="Output format (json or csv)"),
+    prefix_query: Annotated[Optional[str], typer.Argument(help="Prefix to query (e.g., 193.0.0.0/21)")] = None,
+    output_format: Annotated[
+        Optional[str], typer.Option("--format", "-f", help="Output format (json, ndjson, csv, parquet or arrow)")
+    ] = None,
+    from_file: Annotated[
+        Optional[typer.FileText],
+        typer.Option("--from-file", "-i", help="Read prefixes to query from a file, one per line ('-' for stdin)"),
+    ] = None,
+    concurrency: Annotated[
+        int, typer.Option("--concurrency", "-c", min=1, help="Maximum number of concurrent queries in batch mode")
+    ] = 10,
+    view: Annotated[
+        View, typer.Option("--view", help="Rich output layout: panels, or one compact row per prefix")
+    ] = View.PANELS,
+    watch: Annotated[
+        Optional[float],
+        typer.Option("--watch", min=1, help="Re-query every WATCH seconds and print only what changed"),
+    ] = None,
+    summary: Annotated[
+        bool,
+        typer.Option("--summary", help="Print aggregate statistics over all queried prefixes instead of each result"),
+    ] = False,
+    output: Annotated[
+        Optional[str],
+        typer.Option("--output", "-o", help="Write results to a sink instead of printing them (sqlite:PATH)"),
+    ] = None,
 ) -> None:
     """Query IRR Explorer for prefix information."""
+    from irrexplorer_cli import helpers
+
     base_url: Optional[str] = ctx.obj.get("base_url")
-    if not prefix_query:
+    if from_file is not None:
+        prefix_queries = helpers.read_batch_queries(from_file)
+    elif prefix_query:
+        prefix_queries = [prefix_query]
+    else:
         if ctx:
             typer.echo(ctx.get_help())
         raise typer.Exit()
 
-    if not validate_prefix_format(prefix_query):
-        typer.echo(f"Error: Invalid prefix format: {prefix_query}")
-        raise typer.Exit(1)
+    for query in prefix_queries:
+        if not helpers.validate_prefix_format(query):
+            typer.echo(f"Error: Invalid prefix format: {query}")
+            raise typer.Exit(1)
 
-    if base_url and not validate_url_format(base_url):
+    if base_url and not helpers.validate_url_format(base_url):
         typer.echo(f"Error: Invalid URL format: {base_url}")
         raise typer.Exit(1)
 
-    asyncio.run(async_prefix_query(prefix_query, output_format, base_url))
+    from irrexplorer_cli import queries as query_functions
+
+    config = client_config(ctx)
+    output_format = resolve_output_format(output_format, view)
+    check_exclusive(summary=summary, output=output is not None)
+    if summary:
+        check_summary_options(watch, output_format)
+        run_query(query_functions.async_summary_query(prefix_queries, output_format, base_url, concurrency, config))
+    elif output is not None:
+        path = parse_output(output, watch, output_format)
+        run_query(query_functions.async_sqlite_export(prefix_queries, path, base_url, concurrency, config))
+    elif output_format in ("parquet", "arrow"):
+        check_columnar_output(watch, output_format)
+        run_query(query_functions.async_columnar_query(prefix_queries, output_format, base_url, concurrency, config))
+    elif watch is not None:
+        run_watch(prefix_queries, watch, output_format, base_url, config)
+    elif from_file is not None:
+        run_query(
+            query_functions.async_batch_prefix_query(prefix_queries, output_format, base_url, concurrency, config)
+        )
+    else:
+        run_query(query_functions.async_prefix_query(prefix_queries[0], output_format, base_url, config))
 
 
 @app.command(no_args_is_help=True)
-def asn(
+def asn(  # pylint: disable=too-many-arguments,too-many-positional-arguments,too-many-locals,too-many-branches
     ctx: typer.Context,
-    asn_query: str = typer.Argument(None, help="AS number to query (e.g., AS2111, as2111, or 2111)"),
-    output_format: Optional[str] = typer.Option(None, "--format", "-f", help="Output format (json or csv)"),
+    asn_query: Annotated[
+        Optional[str], typer.Argument(help="AS number to query (e.g., AS2111, as2111, or 2111)")
+    ] = None,
+    output_format: Annotated[
+        Optional[str], typer.Option("--format", "-f", help="Output format (json, ndjson, csv, parquet or arrow)")
+    ] = None,
+    from_file: Annotated[
+        Optional[typer.FileText],
+        typer.Option("--from-file", "-i", help="Read AS numbers to query from a file, one per line ('-' for stdin)"),
+    ] = None,
+    concurrency: Annotated[
+        int, typer.Option("--concurrency", "-c", min=1, help="Maximum number of concurrent requests in batch mode")
+    ] = 10,
+    view: Annotated[
+        View, typer.Option("--view", help="Rich output layout: panels, or one compact row per prefix")
+    ] = View.PANELS,
+    watch: Annotated[
+        Optional[float],
+        typer.Option("--watch", min=1, help="Re-query every WATCH seconds and print only what changed"),
+    ] = None,
+    aggregate: Annotated[
+        bool,
+        typer.Option("--aggregate", help="Aggregate originated prefixes into the fewest covering prefixes"),
+    ] = False,
+    summary: Annotated[
+        bool,
+        typer.Option("--summary", help="Print aggregate statistics over all queried prefixes instead of each result"),
+    ] = False,
+    output: Annotated[
+        Optional[str],
+        typer.Option("--output", "-o", help="Write results to a sink instead of printing them (sqlite:PATH)"),
+    ] = None,
 ) -> None:
     """Query IRR Explorer for AS number information."""
+    from irrexplorer_cli import helpers
+
     base_url: Optional[str] = ctx.obj.get("base_url")
-    if not asn_query:
+    if from_file is not None:
+        asn_queries = helpers.read_batch_queries(from_file)
+    elif asn_query:
+        asn_queries = [asn_query]
+    else:
         if ctx:
             typer.echo(ctx.get_help())
         raise typer.Exit()
 
-    if isinstance(asn_query, str):
-        if not asn_query.upper().startswith("AS"):
-            asn_query = f"AS{asn_query}"
-        else:
-            asn_query = f"AS{asn_query[2:]}"
+    asn_queries = [helpers.normalize_asn_format(query) for query in asn_queries]
+    for query in asn_queries:
+        if not helpers.validate_asn_format(query):
+            typer.echo(f"Error: Invalid ASN format: {query}")
+            raise typer.Exit(1)
 
-    if not validate_asn_format(asn_query):
-        typer.echo(f"Error: Invalid ASN format: {asn_query}")
+    if base_url and not helpers.validate_url_format(base_url):
+        typer.echo(f"Error: Invalid URL format: {base_url}")
         raise typer.Exit(1)
 
-    if base_url and not validate_url_format(base_url):
+    from irrexplorer_cli import queries as query_functions
+
+    config = client_config(ctx)
+    output_format = resolve_output_format(output_format, view)
+    check_exclusive(aggregate=aggregate, summary=summary, output=output is not None)
+    if aggregate:
+        check_aggregate_options(watch, output_format)
+        run_query(query_functions.async_aggregate_query(asn_queries, output_format, base_url, concurrency, config))
+    elif summary:
+        check_summary_options(watch, output_format)
+        run_query(query_functions.async_summary_query(asn_queries, output_format, base_url, concurrency, config))
+    elif output is not None:
+        path = parse_output(output, watch, output_format)
+        run_query(query_functions.async_sqlite_export(asn_queries, path, base_url, concurrency, config))
+    elif output_format in ("parquet", "arrow"):
+        check_columnar_output(watch, output_format)
+        run_query(query_functions.async_columnar_query(asn_queries, output_format, base_url, concurrency, config))
+    elif watch is not None:
+        run_watch(asn_queries, watch, output_format, base_url, config)
+    elif from_file is not None:
+        run_query(query_functions.async_batch_asn_query(asn_queries, output_format, base_url, concurrency, config))
+    else:
+        run_query(query_functions.async_asn_query(asn_queries[0], output_format, base_url, config))
+
+
+@app.command(no_args_is_help=True)
+def asset(
+    ctx: typer.Context,
+    as_set: Annotated[str, typer.Argument(help="AS set to query (e.g., AS-NLNOG)")],
+    expand: Annotated[
+        bool, typer.Option("--expand", help="Resolve nested sets recursively into all member AS numbers")
+    ] = False,
+    output_format: Annotated[
+        Optional[str],
+        typer.Option("--format", "-f", callback=set_output_format, help="Output format (json, ndjson or csv)"),
+    ] = None,
+    concurrency: Annotated[
+        int, typer.Option("--concurrency", "-c", min=1, help="Maximum number of concurrent requests with --expand")
+    ] = 10,
+) -> None:
+    """Query IRR Explorer for the members of an AS set."""
+    from irrexplorer_cli import helpers
+
+    base_url: Optional[str] = ctx.obj.get("base_url")
+    if not helpers.validate_as_set_format(as_set):
+        typer.echo(f"Error: Invalid AS set format: {as_set}")
+        raise typer.Exit(1)
+
+    if base_url and not helpers.validate_url_format(base_url):
+        typer.echo(f"Error: Invalid URL format: {base_url}")
+        raise typer.Exit(1)
+
+    from irrexplorer_cli import queries as query_functions
+
+    config = client_config(ctx)
+    run_query(
+        query_functions.async_asset_query(as_set, output_format, base_url, concurrency if expand else None, config)
+    )
+
+
+@snapshot_app.command("build", no_args_is_help=True)
+def snapshot_build(
+    ctx: typer.Context,
+    output: Annotated[Path, typer.Argument(dir_okay=False, help="Snapshot file to write")],
+    queries: Annotated[Optional[List[str]], typer.Argument(help="Prefixes and AS numbers to include")] = None,
+    from_file: Annotated[
+        Optional[typer.FileText],
+        typer.Option(
+            "--from-file", "-i", help="Read prefixes and AS numbers from a file, one per line ('-' for stdin)"
+        ),
+    ] = None,
+    concurrency: Annotated[
+        int, typer.Option("--concurrency", "-c", min=1, help="Maximum number of concurrent queries")
+    ] = 10,
+) -> None:
+    """Fetch prefixes and AS numbers into a snapshot file for use with --snapshot."""
+    from irrexplorer_cli import helpers
+
+    base_url: Optional[str] = ctx.obj.get("base_url")
+    snapshot_queries = list(queries or [])
+    if from_file is not None:
+        snapshot_queries += helpers.read_batch_queries(from_file)
+    if not snapshot_queries:
+        typer.echo("Error: No prefixes or AS numbers to include")
+        raise typer.Exit(1)
+
+    for index, query in enumerate(snapshot_queries):
+        if helpers.validate_prefix_format(query):
+            continue
+        if not helpers.validate_asn_format(query):
+            typer.echo(f"Error: Invalid prefix or ASN format: {query}")
+            raise typer.Exit(1)
+        snapshot_queries[index] = helpers.normalize_asn_format(query)
+
+    if base_url and not helpers.validate_url_format(base_url):
         typer.echo(f"Error: Invalid URL format: {base_url}")
         raise typer.Exit(1)
 
-    asyncio.run(async_asn_query(asn_query, output_format, base_url))
+    from irrexplorer_cli import queries as query_functions
+
+    config = client_config(ctx)
+    run_query(query_functions.async_snapshot_build(output, snapshot_queries, base_url, concurrency, config))
+
+
+@app.command()
+def daemon(
+    ctx: typer.Context,
+    socket_path: Annotated[
+        Optional[Path],
+        typer.Option(
+            "--socket",
+            dir_okay=False,
+            envvar="IRREXPLORER_SOCKET",
+            help="Socket to listen on (default: in $XDG_RUNTIME_DIR); queries find it through $IRREXPLORER_SOCKET",
+        ),
+    ] = None,
+) -> None:
+    """Keep a warm connection pool and response cache running for prefix and asn queries to use."""
+    import asyncio
+
+    from irrexplorer_cli.daemon import Daemon, default_socket_path
+
+    path = socket_path or default_socket_path()
+    typer.echo(f"Listening on {path}, stop with Ctrl-C")
+    try:
+        asyncio.run(Daemon(client_config(ctx)).serve(path))
+    except RuntimeError as exc:
+        typer.echo(f"Error: {exc}")
+        raise typer.Exit(1) from exc
+    except KeyboardInterrupt:
+        logger.debug("Daemon on %s stopped", path)
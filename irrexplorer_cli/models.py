@@ -1,9 +1,13 @@
 """Data models for IRR Explorer API responses."""
 
+import gc
 import logging
-from typing import Any, Dict, List, Optional
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Union
 
-from pydantic import BaseModel, model_validator
+from pydantic import BaseModel, TypeAdapter, model_validator
+
+from irrexplorer_cli.profiling import profile_phase
 
 logger = logging.getLogger(__name__)
 
@@ -46,18 +50,17 @@ class PrefixInfo(BaseModel):
     prefixSortKey: str
     goodnessOverall: int
 
-    def __init__(self, **data: Any) -> None:
-        logger.debug("Initializing PrefixInfo with data: %s", data)
-        super().__init__(**data)
-        logger.debug("PrefixInfo initialized successfully for prefix: %s", self.prefix)
-
     @model_validator(mode="after")
     def validate_prefix_info(self) -> "PrefixInfo":
         """Validate the prefix information after model creation."""
-        logger.debug("Validating PrefixInfo for prefix: %s", self.prefix)
-        logger.debug(
-            "Category: %s, RIR: %s, BGP Origins count: %d", self.categoryOverall, self.rir, len(self.bgpOrigins)
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Validated PrefixInfo for prefix: %s, Category: %s, RIR: %s, BGP Origins count: %d",
+                self.prefix,
+                self.categoryOverall,
+                self.rir,
+                len(self.bgpOrigins),
+            )
         return self
 
 
@@ -86,8 +89,50 @@ class AsSets(BaseModel):
     setsPerIrr: Dict[str, List[str]]
 
 
+class SetExpansion(BaseModel):
+    """An AS set in a set expansion, with its direct members in one IRR database."""
+
+    name: str
+    source: str
+    depth: int
+    path: List[str]
+    members: List[str]
+
+
 class AsnResult(BaseModel):
     """ASN query result information."""
 
     directOrigin: List[PrefixResult]
     overlaps: List[PrefixResult]
+
+
+PREFIX_INFO_LIST_ADAPTER: TypeAdapter[Optional[List[PrefixInfo]]] = TypeAdapter(Optional[List[PrefixInfo]])
+
+
+@contextmanager
+def paused_gc() -> Iterator[None]:
+    """Pause cyclic garbage collection while building large acyclic object trees."""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def decode_prefix_infos(raw: Union[bytes, str]) -> List[PrefixInfo]:
+    """Decode and validate a raw JSON array of prefix information in a single pass.
+
+    Parsing and validation cannot be told apart here, so both are profiled as validation.
+    """
+    if not raw.strip():
+        return []
+    with profile_phase("validate"), paused_gc():
+        return PREFIX_INFO_LIST_ADAPTER.validate_json(raw) or []
+
+
+def validate_prefix_infos(items: Optional[List[Dict[str, Any]]]) -> List[PrefixInfo]:
+    """Validate already decoded prefix information in a single batch."""
+    with profile_phase("validate"), paused_gc():
+        return PREFIX_INFO_LIST_ADAPTER.validate_python(items) or []
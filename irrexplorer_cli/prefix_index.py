@@ -0,0 +1,215 @@
+"""In-memory radix trie over fetched prefix information."""
+
+import ipaddress
+import logging
+import socket
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from irrexplorer_cli.models import PrefixInfo, paused_gc
+
+logger = logging.getLogger(__name__)
+
+
+def parse_network(prefix: str) -> Tuple[int, int, int]:
+    """Return the IP version, integer network address and length of a prefix or address.
+
+    Addresses are parsed with inet_pton, ipaddress takes ten times as long and dominates building the index.
+    """
+    address, _, length = prefix.partition("/")
+    for version, family, width in ((4, socket.AF_INET, 32), (6, socket.AF_INET6, 128)):
+        try:
+            packed = socket.inet_pton(family, address)
+        except OSError:
+            continue
+        bits = int(length) if length.isdigit() else width if not length else -1
+        if 0 <= bits <= width:
+            return version, int.from_bytes(packed, "big") & ~((1 << (width - bits)) - 1), bits
+        break
+    network = ipaddress.ip_network(prefix, strict=False)
+    return network.version, int(network.network_address), network.prefixlen
+
+
+class TrieNode:  # pylint: disable=too-few-public-methods
+    """Patricia trie node for a network, holding its prefix information if it was fetched."""
+
+    __slots__ = ("key", "length", "value", "complete", "children")
+
+    def __init__(self, key: int, length: int) -> None:
+        """Initialize node for the network with integer address key and prefix length."""
+        self.key = key
+        self.length = length
+        self.value: Optional[PrefixInfo] = None
+        self.complete = False
+        self.children: List[Optional["TrieNode"]] = [None, None]
+
+
+class PrefixTrie:
+    """Path-compressed binary trie keyed by integer network addresses of one address family."""
+
+    def __init__(self, width: int) -> None:
+        """Initialize an empty trie for addresses of width bits."""
+        self.width = width
+        self.root = TrieNode(0, 0)
+
+    def bit(self, key: int, position: int) -> int:
+        """Return the bit of key at position, counted from the most significant bit."""
+        return (key >> (self.width - 1 - position)) & 1
+
+    def mask(self, key: int, length: int) -> int:
+        """Return key with every bit after length cleared."""
+        return key & ~((1 << (self.width - length)) - 1)
+
+    def common_length(self, first: int, second: int, limit: int) -> int:
+        """Return the number of leading bits two keys share, up to limit."""
+        return min(self.width - (first ^ second).bit_length(), limit)
+
+    def insert(self, key: int, length: int) -> TrieNode:
+        """Return the node for a network, creating it and any branching node it needs."""
+        node = self.root
+        while node.length < length:
+            branch = self.bit(key, node.length)
+            child = node.children[branch]
+            if child is None:
+                child = node.children[branch] = TrieNode(key, length)
+                return child
+
+            common = self.common_length(child.key, key, min(child.length, length))
+            if common == child.length:
+                node = child
+                continue
+
+            # the new network branches off inside the child's compressed path
+            parent = TrieNode(self.mask(key, common), common)
+            parent.children[self.bit(child.key, common)] = child
+            node.children[branch] = parent
+            if common == length:
+                return parent
+            leaf = parent.children[self.bit(key, common)] = TrieNode(key, length)
+            return leaf
+        return node
+
+    def covering(self, key: int, length: int) -> Iterator[TrieNode]:
+        """Yield the nodes of networks covering (or equal to) a network, least specific first."""
+        node: Optional[TrieNode] = self.root
+        while node is not None and node.length <= length and self.mask(key, node.length) == node.key:
+            yield node
+            if node.length == length:
+                return
+            node = node.children[self.bit(key, node.length)]
+
+    def subtree(self, key: int, length: int) -> Iterator[TrieNode]:
+        """Yield the nodes of networks inside a network, in address order with shorter prefixes first."""
+        node: Optional[TrieNode] = self.root
+        while node is not None and node.length < length:
+            if self.mask(key, node.length) != node.key:
+                return
+            node = node.children[self.bit(key, node.length)]
+        if node is None or self.mask(node.key, length) != key:
+            return
+
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(child for child in reversed(node.children) if child is not None)
+
+
+class PrefixIndex:
+    """Index of fetched prefix information answering covering, more specific and overlap queries locally.
+
+    A network is marked complete once every prefix overlapping it has been fetched, which is what the
+    prefix API returns. Any network inside a complete network can then be answered without a request.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty IPv4 and IPv6 tries."""
+        self.tries = {4: PrefixTrie(32), 6: PrefixTrie(128)}
+        self.pending: List[PrefixInfo] = []
+        self.size = 0
+
+    def __len__(self) -> int:
+        """Return the number of indexed prefixes."""
+        self.build()
+        return self.size
+
+    def locate(self, prefix: str) -> Tuple[PrefixTrie, int, int]:
+        """Return the trie, integer key and length of a prefix or address."""
+        version, key, length = parse_network(prefix)
+        return self.tries[version], key, length
+
+    def add(self, info: PrefixInfo) -> None:
+        """Queue the information for a prefix, added or replaced on the next query."""
+        self.pending.append(info)
+
+    def add_all(self, infos: Iterable[PrefixInfo]) -> None:
+        """Queue the information for several prefixes."""
+        self.pending.extend(infos)
+
+    def build(self) -> None:
+        """Insert the queued prefix information.
+
+        Insertion is deferred to the first query, so results nobody queries again cost only a list append.
+        """
+        if not self.pending:
+            return
+        pending, self.pending = self.pending, []
+        with paused_gc():
+            for info in pending:
+                try:
+                    trie, key, length = self.locate(info.prefix)
+                except ValueError:
+                    logger.debug("Not indexing invalid prefix: %s", info.prefix)
+                    continue
+                node = trie.insert(key, length)
+                if node.value is None:
+                    self.size += 1
+                node.value = info
+
+    def mark_complete(self, prefix: str) -> None:
+        """Record that every prefix overlapping a network has been added."""
+        try:
+            trie, key, length = self.locate(prefix)
+        except ValueError:
+            return
+        trie.insert(key, length).complete = True
+
+    def is_complete(self, prefix: str) -> bool:
+        """Check whether a network lies inside a network marked complete."""
+        trie, key, length = self.locate(prefix)
+        return any(node.complete for node in trie.covering(key, length))
+
+    def covering(self, prefix: str) -> List[PrefixInfo]:
+        """Return the known prefixes covering (or equal to) a network, least specific first."""
+        self.build()
+        trie, key, length = self.locate(prefix)
+        return [node.value for node in trie.covering(key, length) if node.value is not None]
+
+    def more_specifics(self, prefix: str) -> List[PrefixInfo]:
+        """Return the known prefixes strictly inside a network, in address order."""
+        self.build()
+        trie, key, length = self.locate(prefix)
+        return [node.value for node in trie.subtree(key, length) if node.value is not None and node.length > length]
+
+    def overlaps(self, prefix: str) -> List[PrefixInfo]:
+        """Return the known prefixes overlapping a network: covering ones first, then more specific ones."""
+        return self.covering(prefix) + self.more_specifics(prefix)
+
+    def least_specific(self, prefix: str) -> Optional[str]:
+        """Return the least specific known prefix overlapping a network."""
+        covering = self.covering(prefix)
+        if covering:
+            return covering[0].prefix
+        more_specifics = self.more_specifics(prefix)
+        if not more_specifics:
+            return None
+        return min(more_specifics, key=lambda info: self.locate(info.prefix)[2]).prefix
+
+    def lookup(self, prefix: str) -> Optional[List[PrefixInfo]]:
+        """Return every prefix overlapping a network if the index holds them all, or None if it may not."""
+        try:
+            if not self.is_complete(prefix):
+                return None
+        except ValueError:
+            return None
+        logger.debug("Answering %s from the local prefix index", prefix)
+        return self.overlaps(prefix)
@@ -0,0 +1,213 @@
+"""Per-phase timing instrumentation for CLI invocations."""
+
+import contextlib
+import logging
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, ContextManager, Dict, Iterator, List, Optional
+
+from pydantic import BaseModel
+from rich.console import Console
+from rich.table import Table
+
+logger = logging.getLogger(__name__)
+
+# phases in the order they happen for a query, used to order the summary
+PHASES = ("index", "connect", "http", "cache", "decode", "validate", "format", "render")
+CONNECT_STEPS = ("connection.connect_tcp", "connection.connect_unix_socket", "connection.start_tls")
+SLOWEST_REQUESTS = 10
+
+TraceCallback = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
+
+class PhaseRecord(BaseModel):
+    """Wall time spent in one occurrence of a phase."""
+
+    phase: str
+    seconds: float = 0.0
+    detail: Optional[str] = None
+    bytes: Optional[int] = None
+
+
+class PhaseSummary(BaseModel):
+    """Aggregated wall time of every occurrence of a phase."""
+
+    phase: str
+    count: int
+    seconds: float
+    max_seconds: float
+    bytes: int
+
+
+class ProfileReport(BaseModel):
+    """Machine-readable profile of a CLI invocation."""
+
+    total_seconds: float
+    phases: List[PhaseSummary]
+    requests: List[PhaseRecord]
+    connections: List[PhaseRecord]
+
+
+class Profiler:
+    """Collect wall time per phase: connection setup, HTTP, decoding, validation, formatting and rendering.
+
+    Phases of concurrent requests overlap, so their totals can exceed the wall time of the invocation.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty profile starting now."""
+        self.started = time.perf_counter()
+        self.records: List[PhaseRecord] = []
+
+    @contextlib.contextmanager
+    def phase(self, name: str, detail: Optional[str] = None) -> Iterator[PhaseRecord]:
+        """Time the enclosed block as one occurrence of a phase."""
+        record = PhaseRecord(phase=name, detail=detail)
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.seconds = time.perf_counter() - start
+            self.records.append(record)
+
+    def tracer(self, url: str) -> TraceCallback:
+        """Return an httpx trace callback recording connection setup for a request."""
+        started: Dict[str, float] = {}
+
+        async def trace(event_name: str, _: Dict[str, Any]) -> None:
+            step, status = event_name.rsplit(".", 1)
+            if step not in CONNECT_STEPS:
+                return
+            if status == "started":
+                started[step] = time.perf_counter()
+            elif step in started:
+                seconds = time.perf_counter() - started.pop(step)
+                self.records.append(
+                    PhaseRecord(phase="connect", seconds=seconds, detail=f"{step.split('.', 1)[1]} {url}")
+                )
+
+        return trace
+
+    async def timed_chunks(self, chunks: AsyncIterator[bytes], url: str, started: float) -> AsyncIterator[bytes]:
+        """Yield streamed response chunks, recording the time spent waiting on the network.
+
+        Time between sending the request at ``started`` and the first read counts as waiting too.
+        """
+        record = PhaseRecord(phase="http", detail=url, seconds=time.perf_counter() - started, bytes=0)
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    chunk = await anext(chunks)
+                except StopAsyncIteration:
+                    return
+                finally:
+                    record.seconds += time.perf_counter() - start
+                record.bytes = (record.bytes or 0) + len(chunk)
+                yield chunk
+        finally:
+            self.records.append(record)
+
+    def summary(self) -> List[PhaseSummary]:
+        """Aggregate the recorded phases, in query order."""
+        groups: Dict[str, List[PhaseRecord]] = {}
+        for record in self.records:
+            groups.setdefault(record.phase, []).append(record)
+        order = {name: index for index, name in enumerate(PHASES)}
+        return [
+            PhaseSummary(
+                phase=name,
+                count=len(records),
+                seconds=sum(record.seconds for record in records),
+                max_seconds=max(record.seconds for record in records),
+                bytes=sum(record.bytes or 0 for record in records),
+            )
+            for name, records in sorted(groups.items(), key=lambda item: order.get(item[0], len(PHASES)))
+        ]
+
+    def report(self) -> ProfileReport:
+        """Build the machine-readable report of the invocation so far."""
+        return ProfileReport(
+            total_seconds=time.perf_counter() - self.started,
+            phases=self.summary(),
+            requests=[record for record in self.records if record.phase == "http"],
+            connections=[record for record in self.records if record.phase == "connect"],
+        )
+
+    def write(self, path: Path) -> None:
+        """Write the JSON report to a file."""
+        path.write_text(self.report().model_dump_json(indent=2), encoding="utf-8")
+
+    def print_summary(self, console: Console) -> None:
+        """Print the per-phase summary and the slowest requests as Rich tables."""
+        report = self.report()
+        table = Table(
+            title="Profile", caption=f"Total wall time: {report.total_seconds:.3f}s", header_style="bold cyan"
+        )
+        table.add_column("Phase")
+        table.add_column("Count", justify="right")
+        table.add_column("Total (s)", justify="right")
+        table.add_column("Max (s)", justify="right")
+        table.add_column("Bytes", justify="right")
+        for phase in report.phases:
+            table.add_row(
+                phase.phase,
+                str(phase.count),
+                f"{phase.seconds:.3f}",
+                f"{phase.max_seconds:.3f}",
+                str(phase.bytes) if phase.bytes else "",
+            )
+        console.print(table)
+
+        if report.requests:
+            requests = Table(title="Slowest requests", header_style="bold cyan")
+            requests.add_column("URL")
+            requests.add_column("Time (s)", justify="right")
+            requests.add_column("Bytes", justify="right")
+            for record in sorted(report.requests, key=lambda r: r.seconds, reverse=True)[:SLOWEST_REQUESTS]:
+                requests.add_row(record.detail or "", f"{record.seconds:.3f}", str(record.bytes or 0))
+            console.print(requests)
+
+
+_PROFILER: Optional[Profiler] = None
+_NO_PHASE: ContextManager[Optional[PhaseRecord]] = contextlib.nullcontext()
+
+
+def start_profiling() -> Profiler:
+    """Start collecting a profile for this process."""
+    global _PROFILER  # pylint: disable=global-statement
+    _PROFILER = Profiler()
+    return _PROFILER
+
+
+def stop_profiling() -> Optional[Profiler]:
+    """Stop collecting, returning the finished profile if one was active."""
+    global _PROFILER  # pylint: disable=global-statement
+    profiler, _PROFILER = _PROFILER, None
+    return profiler
+
+
+def active_profiler() -> Optional[Profiler]:
+    """Return the active profiler, or None when profiling is off."""
+    return _PROFILER
+
+
+def profile_phase(name: str, detail: Optional[str] = None) -> ContextManager[Optional[PhaseRecord]]:
+    """Time the enclosed block as a phase of the active profile, doing nothing when profiling is off."""
+    if _PROFILER is None:
+        return _NO_PHASE
+    return _PROFILER.phase(name, detail)
+
+
+def trace_extensions(url: str) -> Dict[str, Any]:
+    """Return httpx request arguments tracing connection setup, or none when profiling is off."""
+    if _PROFILER is None:
+        return {}
+    return {"extensions": {"trace": _PROFILER.tracer(url)}}
+
+
+def profile_chunks(chunks: AsyncIterator[bytes], url: str, started: float) -> AsyncIterator[bytes]:
+    """Wrap a streamed response body so its network time is profiled, when profiling is on."""
+    if _PROFILER is None:
+        return chunks
+    return _PROFILER.timed_chunks(chunks, url, started)
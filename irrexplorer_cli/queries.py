@@ -1,98 +1,889 @@
 """Query functions for the CLI tool."""
 
+import asyncio
+import contextlib
+import functools
+import itertools
 import json
 import logging
-from typing import Optional
+import sys
+import time
+from pathlib import Path
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+)
 
 import httpx
 import typer
+from rich.table import Table
 
+from irrexplorer_cli.aggregate import Aggregate, aggregate_prefixes
+from irrexplorer_cli.asset import AsSetExpansion, SetExpander
+from irrexplorer_cli.columnar import ColumnarWriter
+from irrexplorer_cli.compact import CompactTable
+from irrexplorer_cli.config import DEFAULT_BASE_URL, ClientConfig
+from irrexplorer_cli.daemon import DaemonExplorer, daemon_listening, default_socket_path, uses_daemon_transport
+from irrexplorer_cli.deadline import Deadline, mark_partial
 from irrexplorer_cli.helpers import (
     find_least_specific_prefix,
     format_as_sets,
+    format_as_sets_ndjson,
+    format_asn_prefix_ndjson,
+    format_asn_prefix_row,
     format_direct_origins,
     format_overlapping_prefixes,
+    format_prefix_ndjson,
     format_prefix_result,
+    is_same_prefix,
+    validate_asn_format,
+    validate_prefix_format,
 )
-from irrexplorer_cli.irrexplorer import IrrDisplay, IrrExplorer
+from irrexplorer_cli.irrexplorer import ASN_PREFIX_KEYS, IrrDisplay, IrrExplorer
+from irrexplorer_cli.models import PrefixInfo, decode_prefix_infos, validate_prefix_infos
+from irrexplorer_cli.profiling import profile_phase
+from irrexplorer_cli.snapshot import SnapshotExplorer, write_snapshot
+from irrexplorer_cli.sqlite_export import SqliteExport
+from irrexplorer_cli.summary import Summary, summarize
+from irrexplorer_cli.watch import WatchState
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+R = TypeVar("R")
+
+PrefixBatchResult = Tuple[str, List[PrefixInfo], Optional[str], List[PrefixInfo]]
+AsnBatchResult = Tuple[str, Dict[str, Any], Dict[str, Any]]
+
 
-async def process_overlaps(explorer: IrrExplorer, least_specific: str) -> None:
-    """Process and print overlapping prefixes."""
+async def iter_bounded(items: Iterable[T], worker: Callable[[T], Awaitable[R]], concurrency: int) -> AsyncIterator[R]:
+    """Run worker over items with bounded concurrency, yielding results as they complete."""
+    iterator = iter(items)
+    pending: Set["asyncio.Future[R]"] = set()
     try:
-        all_overlaps = await explorer.fetch_prefix_info(least_specific)
-        for result in all_overlaps:
-            print(format_prefix_result(result, "OVERLAP"))
+        while True:
+            for item in itertools.islice(iterator, concurrency - len(pending)):
+                pending.add(asyncio.ensure_future(worker(item)))
+            if not pending:
+                return
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+def create_explorer(base_url: Optional[str] = None, config: Optional[ClientConfig] = None) -> IrrExplorer:
+    """Create an API client for the given base URL and client settings.
+
+    Requests are answered from a snapshot file when one is set, or forwarded to a running daemon unless the
+    settings ask for a transport of their own, which the daemon's shared session would not honour.
+    """
+    if config is not None and config.snapshot is not None:
+        return SnapshotExplorer(config.snapshot, base_url or DEFAULT_BASE_URL, config)
+    if config is not None and config.daemon and daemon_listening(default_socket_path()):
+        if uses_daemon_transport(config):
+            return DaemonExplorer(default_socket_path(), base_url or DEFAULT_BASE_URL, config)
+        logger.debug("Connection options given, sending requests directly instead of through the daemon")
+    return IrrExplorer(base_url=base_url or DEFAULT_BASE_URL, config=config)
+
+
+@contextlib.asynccontextmanager
+async def open_explorer(
+    base_url: Optional[str] = None, config: Optional[ClientConfig] = None
+) -> AsyncIterator[IrrExplorer]:
+    """Create an API client for a query, exiting with an error when the instance cannot be reached.
+
+    The client is closed when the query is done, whether it succeeded or not.
+    """
+    explorer = create_explorer(base_url, config)
+    try:
+        yield explorer
+    except httpx.ConnectError as exc:
+        print(
+            f"Error: Unable to connect to {base_url or 'default IRR Explorer instance'}. "
+            "Please verify the URL is correct and the service is available."
+        )
+        raise typer.Exit(1) from exc
+    finally:
+        await explorer.close()
+
+
+async def leave_out_failure(fetch: Awaitable[T], query: str, reason: str = "failed to query {}") -> Optional[T]:
+    """Await the fetch of one query, returning None when it fails so the query is left out of the results.
+
+    The failure is logged and marks the results partial. A connect error is raised, failing the whole command.
+    """
+    try:
+        return await fetch
+    except httpx.ConnectError:
+        raise
+    except (httpx.HTTPError, ValueError) as exc:
+        logger.error("Failed to query %s: %s", query, exc)
+        mark_partial(reason.format(query))
+        return None
+
+
+async def process_overlaps(
+    explorer: IrrExplorer,
+    least_specific: str,
+    formatter: Callable[[PrefixInfo, str], str] = format_prefix_result,
+    pending: Optional[Awaitable[List[PrefixInfo]]] = None,
+) -> None:
+    """Process and print overlapping prefixes, awaiting an already started fetch if given."""
+    try:
+        all_overlaps = await (pending if pending is not None else explorer.fetch_prefix_info(least_specific))
+        with profile_phase("format"):
+            for result in all_overlaps:
+                print(formatter(result, "OVERLAP"), flush=True)
     except (httpx.HTTPError, ValueError, RuntimeError):
         pass
 
 
-async def async_prefix_query(pfx: str, output_format: Optional[str] = None, base_url: Optional[str] = None) -> None:
+async def compact_prefix_query(explorer: IrrExplorer, display: IrrDisplay, pfx: str) -> None:
+    """Print direct overlaps and all overlaps of the least specific match as one compact table.
+
+    All overlaps are fetched while the direct overlap rows are rendered, as in print_prefix_rows.
+    """
+    table = CompactTable(display.console)
+    direct_overlaps = await explorer.fetch_prefix_info(pfx)
+    least_specific = await find_least_specific_prefix(direct_overlaps)
+    pending: Optional["asyncio.Future[List[PrefixInfo]]"] = None
+    if least_specific and not is_same_prefix(pfx, least_specific):
+        pending = asyncio.ensure_future(explorer.fetch_prefix_info(least_specific))
+
+    try:
+        # let the request go out before rendering the direct overlap rows
+        await asyncio.sleep(0)
+        for result in direct_overlaps:
+            table.add("DIRECT", result)
+        table.flush()
+        if least_specific:
+            try:
+                for result in direct_overlaps if pending is None else await pending:
+                    table.add("OVERLAP", result)
+            except (httpx.HTTPError, ValueError, RuntimeError) as e:
+                table.flush()
+                display.console.print(f"[red]Error fetching overlaps for {least_specific}: {str(e)}[/red]")
+        table.close()
+    finally:
+        if pending is not None:
+            pending.cancel()
+
+
+async def print_prefix_rows(
+    explorer: IrrExplorer, pfx: str, direct_overlaps: List[PrefixInfo], formatter: Callable[[PrefixInfo, str], str]
+) -> None:
+    """Print direct overlap rows while all overlaps of the least specific match are fetched."""
+    least_specific = await find_least_specific_prefix(direct_overlaps)
+    pending: Optional["asyncio.Future[List[PrefixInfo]]"] = None
+    if least_specific and not is_same_prefix(pfx, least_specific):
+        pending = asyncio.ensure_future(explorer.fetch_prefix_info(least_specific))
+
+    try:
+        # let the request go out before printing the direct overlap rows
+        await asyncio.sleep(0)
+        with profile_phase("format"):
+            for result in direct_overlaps:
+                print(formatter(result, "DIRECT"), flush=True)
+        if least_specific and pending is not None:
+            await process_overlaps(explorer, least_specific, formatter, pending)
+        elif least_specific:
+            logger.debug("Least specific match is the queried prefix, reusing its overlaps")
+            with profile_phase("format"):
+                for result in direct_overlaps:
+                    print(formatter(result, "OVERLAP"), flush=True)
+    finally:
+        if pending is not None:
+            pending.cancel()
+
+
+async def async_prefix_query(
+    pfx: str,
+    output_format: Optional[str] = None,
+    base_url: Optional[str] = None,
+    config: Optional[ClientConfig] = None,
+) -> None:
     """Execute asynchronous prefix query and display results."""
     logger.debug("Starting prefix query for: %s", pfx)
     logger.debug("Output format: %s, Base URL: %s", output_format, base_url)
 
-    explorer = IrrExplorer(base_url=base_url) if base_url else IrrExplorer()
-    display = IrrDisplay()
+    async with open_explorer(base_url, config) as explorer:
+        display = IrrDisplay(explorer)
+
+        if output_format == "compact":
+            await compact_prefix_query(explorer, display, pfx)
+            return
 
-    try:
         direct_overlaps = await explorer.fetch_prefix_info(pfx)
         logger.debug("Received %d direct overlaps", len(direct_overlaps))
 
         if output_format == "json":
             logger.debug("Formatting output as JSON")
-            json_data = [result.model_dump() for result in direct_overlaps]
-            print(json.dumps(json_data, indent=2))
+            with profile_phase("format"):
+                json_data = [result.model_dump() for result in direct_overlaps]
+                print(json.dumps(json_data, indent=2))
             return
 
-        if output_format == "csv":
-            print("Type,Prefix,Category,RIR,RPKI_Status,BGP_Origins,IRR_Routes,Messages")
-            for result in direct_overlaps:
-                print(format_prefix_result(result, "DIRECT"))
-            least_specific = await find_least_specific_prefix(direct_overlaps)
-            if least_specific:
-                await process_overlaps(explorer, least_specific)
+        if output_format in ("csv", "ndjson"):
+            formatter: Callable[[PrefixInfo, str], str] = format_prefix_result
+            if output_format == "ndjson":
+                formatter = functools.partial(format_prefix_ndjson, query=pfx)
+            else:
+                print("Type,Prefix,Category,RIR,RPKI_Status,BGP_Origins,IRR_Routes,Messages")
+            await print_prefix_rows(explorer, pfx, direct_overlaps, formatter)
             return
 
-        await display.display_prefix_info(direct_overlaps)
+        await display.display_prefix_info(direct_overlaps, pfx)
 
-    except httpx.ConnectError as exc:
-        print(
-            f"Error: Unable to connect to {base_url or 'default IRR Explorer instance'}. "
-            "Please verify the URL is correct and the service is available."
-        )
-        raise typer.Exit(1) from exc
+
+ROW_TYPES = {"directOrigin": "DIRECT", "overlaps": "OVERLAP"}
+
+
+def iter_asn_prefix_rows(results: Dict[str, Any]) -> Iterator[Tuple[str, PrefixInfo]]:
+    """Validate the prefixes of an ASN response, yielding (row type, prefix) for direct origins, then overlaps."""
+    for key in ASN_PREFIX_KEYS:
+        for info in validate_prefix_infos(results.get(key, [])):
+            yield ROW_TYPES[key], info
+
+
+async def fetch_asn_bundle(
+    explorer: IrrExplorer, as_number: str, semaphore: Optional[asyncio.Semaphore] = None
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Fetch ASN prefix information and AS sets concurrently."""
+
+    async def bounded(fetch: Callable[[str], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        if semaphore is None:
+            return await fetch(as_number)
+        async with semaphore:
+            return await fetch(as_number)
+
+    info_task = asyncio.ensure_future(bounded(explorer.fetch_asn_info))
+    sets_task = asyncio.ensure_future(bounded(explorer.fetch_asn_sets))
+    try:
+        return await info_task, await sets_task
     finally:
-        await explorer.close()
+        info_task.cancel()
+        sets_task.cancel()
 
 
-async def async_asn_query(as_number: str, output_format: Optional[str] = None, base_url: Optional[str] = None) -> None:
-    """Execute asynchronous ASN query and display results."""
-    explorer = IrrExplorer(base_url=base_url) if base_url else IrrExplorer()
-    display = IrrDisplay()
+async def iter_streamed_prefixes(explorer: IrrExplorer, as_number: str) -> AsyncIterator[Tuple[str, PrefixInfo]]:
+    """Stream the prefixes of an AS number, ending early when the response fails part way.
 
+    The rows decoded before the failure stay in the output, which is marked partial. A connect error is
+    raised, failing the whole command.
+    """
     try:
-        results = await explorer.fetch_asn_info(as_number)
-        sets_data = await explorer.fetch_asn_sets(as_number)
+        async for key, pfx in explorer.stream_asn_info(as_number):
+            yield key, pfx
+    except httpx.ConnectError:
+        raise
+    except httpx.HTTPError as exc:
+        logger.error("Streaming prefixes of %s failed: %s", as_number, exc)
+        mark_partial(f"failed streaming prefixes of {as_number}")
 
-        if output_format == "json":
-            combined_data = {"asn_info": results, "as_sets": sets_data}
-            print(json.dumps(combined_data, indent=2), end="\n")
-        elif output_format == "csv":
+
+async def stream_asn_rows(explorer: IrrExplorer, as_number: str, output_format: str) -> None:
+    """Print ASN CSV rows or NDJSON records as each prefix is decoded from the streamed response."""
+    sets_task = asyncio.ensure_future(explorer.fetch_asn_sets(as_number))
+    try:
+        if output_format == "csv":
             print("Type,ASN,Prefix,Category,RIR,RPKI_Status,BGP_Origins,IRR_Routes,Messages", end="")
-            format_direct_origins(as_number, results)
-            format_overlapping_prefixes(as_number, results)
-            format_as_sets(as_number, sets_data)
-            print()
+        async for key, pfx in iter_streamed_prefixes(explorer, as_number):
+            row_type = ROW_TYPES[key]
+            with profile_phase("format"):
+                if output_format == "ndjson":
+                    print(format_asn_prefix_ndjson(row_type, as_number, pfx), flush=True)
+                else:
+                    print(f"\n{format_asn_prefix_row(row_type, as_number, pfx)}", end="", flush=True)
+
+        sets_data = await sets_task
+        with profile_phase("format"):
+            if output_format == "ndjson":
+                for record in format_as_sets_ndjson(as_number, sets_data):
+                    print(record, flush=True)
+            else:
+                format_as_sets(as_number, sets_data)
+                print()
+    finally:
+        sets_task.cancel()
+
+
+async def stream_asn_compact(explorer: IrrExplorer, display: IrrDisplay, as_number: str) -> None:
+    """Print ASN prefixes as one compact table, row by row as they are decoded, followed by the AS sets."""
+    sets_task = asyncio.ensure_future(explorer.fetch_asn_sets(as_number))
+    try:
+        table = CompactTable(display.console)
+        async for key, pfx in iter_streamed_prefixes(explorer, as_number):
+            table.add(ROW_TYPES[key], pfx)
+        table.close()
+        display.display_as_sets(await sets_task, as_number)
+    finally:
+        sets_task.cancel()
+
+
+async def async_asn_query(
+    as_number: str,
+    output_format: Optional[str] = None,
+    base_url: Optional[str] = None,
+    config: Optional[ClientConfig] = None,
+) -> None:
+    """Execute asynchronous ASN query and display results."""
+    async with open_explorer(base_url, config) as explorer:
+        display = IrrDisplay(explorer)
+
+        if output_format in ("csv", "ndjson"):
+            await stream_asn_rows(explorer, as_number, output_format)
+            return
+        if output_format == "compact":
+            await stream_asn_compact(explorer, display, as_number)
+            return
+
+        results, sets_data = await fetch_asn_bundle(explorer, as_number)
+
+        if output_format == "json":
+            with profile_phase("format"):
+                combined_data = {"asn_info": results, "as_sets": sets_data}
+                print(json.dumps(combined_data, indent=2), end="\n")
         else:
             await display.display_asn_info(results, as_number, sets_data)
-    except httpx.ConnectError as exc:
-        print(
-            f"Error: Unable to connect to {base_url or 'default IRR Explorer instance'}. "
-            "Please verify the URL is correct and the service is available."
+
+
+async def fetch_prefix_overlaps(explorer: IrrExplorer, pfx: str, with_overlaps: bool) -> PrefixBatchResult:
+    """Fetch direct overlaps and, optionally, all overlaps of the least specific match for one prefix."""
+    least_specific: Optional[str] = None
+    all_overlaps: List[PrefixInfo] = []
+    direct_overlaps = await explorer.fetch_prefix_info(pfx)
+    if with_overlaps:
+        least_specific = await find_least_specific_prefix(direct_overlaps)
+        if least_specific and is_same_prefix(pfx, least_specific):
+            all_overlaps = direct_overlaps
+        elif least_specific:
+            all_overlaps = await explorer.fetch_prefix_info(least_specific)
+    return pfx, direct_overlaps, least_specific, all_overlaps
+
+
+async def fetch_prefix_batch_item(explorer: IrrExplorer, pfx: str, with_overlaps: bool) -> PrefixBatchResult:
+    """Fetch the overlaps of one prefix of a batch, leaving a failed prefix out."""
+    result = await leave_out_failure(fetch_prefix_overlaps(explorer, pfx, with_overlaps), f"prefix {pfx}")
+    return (pfx, [], None, []) if result is None else result
+
+
+def format_prefix_batch_result(
+    batch_result: PrefixBatchResult, output_format: str, json_data: Dict[str, List[Dict[str, Any]]]
+) -> None:
+    """Print a single batch prefix result as CSV rows led by the queried prefix or as NDJSON, or collect it for JSON."""
+    pfx, direct_overlaps, _, all_overlaps = batch_result
+    if output_format == "json":
+        json_data[pfx] = [result.model_dump() for result in direct_overlaps]
+    elif output_format == "ndjson":
+        for result in direct_overlaps:
+            print(format_prefix_ndjson(result, "DIRECT", pfx))
+        for result in all_overlaps:
+            print(format_prefix_ndjson(result, "OVERLAP", pfx))
+        sys.stdout.flush()
+    else:
+        for result in direct_overlaps:
+            print(f"{pfx},{format_prefix_result(result, 'DIRECT')}")
+        for result in all_overlaps:
+            print(f"{pfx},{format_prefix_result(result, 'OVERLAP')}")
+
+
+async def output_prefix_batch_result(
+    display: IrrDisplay,
+    batch_result: PrefixBatchResult,
+    output_format: Optional[str],
+    json_data: Dict[str, List[Dict[str, Any]]],
+) -> None:
+    """Output a single batch prefix result, collecting JSON output for the final document."""
+    pfx, direct_overlaps, least_specific, all_overlaps = batch_result
+    if output_format in ("json", "ndjson", "csv"):
+        with profile_phase("format", pfx):
+            format_prefix_batch_result(batch_result, output_format, json_data)
+    elif output_format == "compact":
+        table = CompactTable(display.console)
+        for result in direct_overlaps:
+            table.add("DIRECT", result)
+        for result in all_overlaps:
+            table.add("OVERLAP", result)
+        table.close()
+    else:
+        await display.display_direct_overlaps(direct_overlaps)
+        if least_specific:
+            await display.print_all_overlaps(least_specific, all_overlaps)
+
+
+async def async_batch_prefix_query(
+    prefixes: List[str],
+    output_format: Optional[str] = None,
+    base_url: Optional[str] = None,
+    concurrency: int = 10,
+    config: Optional[ClientConfig] = None,
+) -> None:
+    """Execute prefix queries for many prefixes concurrently over a single client."""
+    logger.debug("Starting batch prefix query for %d prefixes with concurrency %d", len(prefixes), concurrency)
+
+    async with open_explorer(base_url, config) as explorer:
+        display = IrrDisplay(explorer)
+        with_overlaps = output_format != "json"
+        json_data: Dict[str, List[Dict[str, Any]]] = {}
+
+        async def worker(pfx: str) -> PrefixBatchResult:
+            return await fetch_prefix_batch_item(explorer, pfx, with_overlaps)
+
+        if output_format == "csv":
+            print("Query,Type,Prefix,Category,RIR,RPKI_Status,BGP_Origins,IRR_Routes,Messages")
+
+        async for batch_result in iter_bounded(dict.fromkeys(prefixes), worker, concurrency):
+            await output_prefix_batch_result(display, batch_result, output_format, json_data)
+
+        if output_format == "json":
+            with profile_phase("format"):
+                ordered = {pfx: json_data[pfx] for pfx in dict.fromkeys(prefixes) if pfx in json_data}
+                print(json.dumps(ordered, indent=2))
+
+
+def print_asn_ndjson(as_number: str, results: Dict[str, Any], sets_data: Dict[str, Any]) -> None:
+    """Print already fetched ASN prefixes and AS sets as NDJSON records."""
+    for row_type, pfx in iter_asn_prefix_rows(results):
+        print(format_asn_prefix_ndjson(row_type, as_number, pfx))
+    for record in format_as_sets_ndjson(as_number, sets_data):
+        print(record)
+    sys.stdout.flush()
+
+
+def print_asn_compact(display: IrrDisplay, as_number: str, results: Dict[str, Any], sets_data: Dict[str, Any]) -> None:
+    """Print already fetched ASN prefixes as a compact table, followed by the AS sets."""
+    table = CompactTable(display.console)
+    for row_type, pfx in iter_asn_prefix_rows(results):
+        table.add(row_type, pfx)
+    table.close()
+    display.display_as_sets(sets_data, as_number)
+
+
+async def async_batch_asn_query(
+    as_numbers: List[str],
+    output_format: Optional[str] = None,
+    base_url: Optional[str] = None,
+    concurrency: int = 10,
+    config: Optional[ClientConfig] = None,
+) -> None:
+    """Execute ASN queries for many AS numbers concurrently over a single client."""
+    logger.debug("Starting batch ASN query for %d AS numbers with concurrency %d", len(as_numbers), concurrency)
+
+    async with open_explorer(base_url, config) as explorer:
+        display = IrrDisplay(explorer)
+        semaphore = asyncio.Semaphore(concurrency)
+        json_data: Dict[str, Dict[str, Any]] = {}
+
+        async def worker(as_number: str) -> AsnBatchResult:
+            bundle = await leave_out_failure(fetch_asn_bundle(explorer, as_number, semaphore), as_number)
+            if bundle is None:
+                return as_number, {"directOrigin": [], "overlaps": []}, {"setsPerIrr": {}}
+            return as_number, *bundle
+
+        if output_format == "csv":
+            print("Type,ASN,Prefix,Category,RIR,RPKI_Status,BGP_Origins,IRR_Routes,Messages", end="")
+
+        async for as_number, results, sets_data in iter_bounded(dict.fromkeys(as_numbers), worker, concurrency):
+            if output_format == "json":
+                json_data[as_number] = {"asn_info": results, "as_sets": sets_data}
+            elif output_format == "ndjson":
+                with profile_phase("format", as_number):
+                    print_asn_ndjson(as_number, results, sets_data)
+            elif output_format == "csv":
+                with profile_phase("format", as_number):
+                    format_direct_origins(as_number, results)
+                    format_overlapping_prefixes(as_number, results)
+                    format_as_sets(as_number, sets_data)
+                    sys.stdout.flush()
+            elif output_format == "compact":
+                print_asn_compact(display, as_number, results, sets_data)
+            else:
+                await display.display_asn_info(results, as_number, sets_data)
+
+        if output_format == "json":
+            with profile_phase("format"):
+                ordered = {
+                    as_number: json_data[as_number] for as_number in dict.fromkeys(as_numbers) if as_number in json_data
+                }
+                print(json.dumps(ordered, indent=2), end="\n")
+        elif output_format == "csv":
+            print()
+
+
+async def fetch_snapshot_prefix(explorer: IrrExplorer, pfx: str) -> Tuple[List[str], List[PrefixInfo]]:
+    """Fetch the overlaps of a prefix and of its least specific match, returning the networks they cover."""
+    direct_overlaps = await explorer.fetch_prefix_info(pfx)
+    least_specific = await find_least_specific_prefix(direct_overlaps)
+    if not least_specific or is_same_prefix(pfx, least_specific):
+        return [pfx], direct_overlaps
+    return [pfx, least_specific], direct_overlaps + await explorer.fetch_prefix_info(least_specific)
+
+
+SNAPSHOT_LEFT_OUT = "left {} out of the snapshot"
+
+
+async def collect_snapshot(
+    explorer: IrrExplorer, prefixes: List[str], as_numbers: List[str], concurrency: int
+) -> Tuple[List[PrefixInfo], List[str], Dict[str, Tuple[bytes, bytes]]]:
+    """Fetch prefixes and AS numbers, returning prefix information, the networks it covers and ASN responses."""
+    semaphore = asyncio.Semaphore(concurrency)
+    infos: List[PrefixInfo] = []
+    complete: List[str] = []
+    asns: Dict[str, Tuple[bytes, bytes]] = {}
+
+    async def prefix_worker(pfx: str) -> Tuple[List[str], List[PrefixInfo]]:
+        fetched = await leave_out_failure(fetch_snapshot_prefix(explorer, pfx), f"prefix {pfx}", SNAPSHOT_LEFT_OUT)
+        return ([], []) if fetched is None else fetched
+
+    async def asn_worker(as_number: str) -> Tuple[str, List[PrefixInfo], Optional[Tuple[bytes, bytes]]]:
+        bundle = await leave_out_failure(fetch_asn_bundle(explorer, as_number, semaphore), as_number, SNAPSHOT_LEFT_OUT)
+        if bundle is None:
+            return as_number, [], None
+        results, sets_data = bundle
+        asn_infos = [info for _, info in iter_asn_prefix_rows(results)]
+        return as_number, asn_infos, (json.dumps(results).encode(), json.dumps(sets_data).encode())
+
+    async for networks, prefix_infos in iter_bounded(prefixes, prefix_worker, concurrency):
+        complete.extend(networks)
+        infos.extend(prefix_infos)
+    async for as_number, asn_infos, responses in iter_bounded(as_numbers, asn_worker, concurrency):
+        infos.extend(asn_infos)
+        if responses is not None:
+            asns[as_number] = responses
+    return infos, complete, asns
+
+
+async def async_snapshot_build(
+    output: Path,
+    queries: List[str],
+    base_url: Optional[str] = None,
+    concurrency: int = 10,
+    config: Optional[ClientConfig] = None,
+) -> None:
+    """Fetch prefixes and AS numbers and write them to a snapshot file for offline queries.
+
+    Prefix queries also fetch their least specific match, so both the direct and the overlap views
+    of a prefix can be answered offline. Queries that fail are left out of the snapshot.
+    """
+    async with open_explorer(base_url, config) as explorer:
+        prefixes = [query for query in dict.fromkeys(queries) if validate_prefix_format(query)]
+        as_numbers = [query for query in dict.fromkeys(queries) if query not in prefixes]
+        infos, complete, asns = await collect_snapshot(explorer, prefixes, as_numbers, concurrency)
+        count = write_snapshot(output, infos, complete, asns)
+        print(f"Wrote {count} prefixes and {len(asns)} AS numbers to {output}")
+
+
+async def poll_watch_query(explorer: IrrExplorer, query: str) -> List[PrefixInfo]:
+    """Fetch the prefixes of a watched prefix or AS number.
+
+    Requests go through IrrExplorer.get so a timeout fails the poll instead of looking like every prefix was removed.
+    """
+    if not validate_asn_format(query):
+        return decode_prefix_infos((await explorer.get(f"/api/prefixes/prefix/{query}")).content)
+    results = (await explorer.get(f"/api/prefixes/asn/{query}")).json() or {}
+    return [info for _, info in iter_asn_prefix_rows(results)]
+
+
+def print_watch_poll(
+    display: IrrDisplay, heading: str, output_format: Optional[str], state: WatchState, infos: List[PrefixInfo]
+) -> None:
+    """Record a poll, printing the heading and a summary for the first one and what changed for the later ones."""
+    first = state.digests is None
+    changes = state.update(infos)
+    if output_format == "ndjson":
+        for change in changes:
+            print(change.ndjson(), flush=True)
+    elif first:
+        display.console.print(
+            f"[bold]{heading}:[/bold] {len(infos)} prefixes, " f"{state.size} prefix, IRR route and ROA records"
         )
-        raise typer.Exit(1) from exc
-    finally:
-        await explorer.close()
+    elif changes:
+        display.console.print(f"[bold]{time.strftime('%Y-%m-%d %H:%M:%S')}[/bold] {len(changes)} changes")
+        display.console.print(*(change.text() for change in changes), sep="\n", soft_wrap=True)
+
+
+async def async_watch_query(
+    query: str,
+    interval: float,
+    output_format: Optional[str] = None,
+    base_url: Optional[str] = None,
+    config: Optional[ClientConfig] = None,
+) -> None:
+    """Poll a prefix or AS number every interval seconds, printing only what changed since the previous poll.
+
+    Every poll is sent to the API: the response cache, the local prefix index and the daemon are bypassed.
+    A deadline applies to each poll, and a poll that misses it keeps the previous state like a failed one.
+    """
+    config = (config or ClientConfig()).model_copy(update={"cache": False, "prefix_index": False, "daemon": False})
+    async with open_explorer(base_url, config) as explorer:
+        display = IrrDisplay(explorer)
+        state = WatchState()
+        heading = f"Watching {query} every {interval:g}s"
+        while True:
+            started = time.monotonic()
+            explorer.session.deadline = Deadline(config.deadline)
+            try:
+                infos = await poll_watch_query(explorer, query)
+            except httpx.ConnectError:
+                raise
+            except (httpx.HTTPError, ValueError) as exc:
+                logger.warning("Poll of %s failed, keeping the previous state: %s", query, exc)
+            else:
+                with profile_phase("format", query):
+                    print_watch_poll(display, heading, output_format, state, infos)
+            await asyncio.sleep(max(interval - (time.monotonic() - started), 0))
+
+
+def print_asset_expansion(display: IrrDisplay, expansion: AsSetExpansion, output_format: Optional[str]) -> None:
+    """Print the member AS numbers and nested sets of an AS set."""
+    if output_format == "json":
+        print(expansion.model_dump_json(indent=2))
+    elif output_format == "ndjson":
+        for asn in expansion.asns:
+            print(json.dumps({"type": "ASN", "set": expansion.name, "asn": asn}, separators=(",", ":")))
+        for name, depth in expansion.sets.items():
+            print(
+                json.dumps(
+                    {"type": "SET", "set": expansion.name, "member": name, "depth": depth}, separators=(",", ":")
+                )
+            )
+    elif output_format == "csv":
+        print("Type,Set,Member,Depth")
+        for asn in expansion.asns:
+            print(f"ASN,{expansion.name},AS{asn},")
+        for name, depth in expansion.sets.items():
+            print(f"SET,{expansion.name},{name},{depth}")
+    else:
+        display.console.print(
+            f"[bold]{expansion.name}:[/bold] {len(expansion.asns)} AS numbers in {len(expansion.sets)} nested sets "
+            f"({expansion.requests} requests)"
+        )
+        if expansion.asns:
+            display.console.print(" ".join(f"AS{asn}" for asn in expansion.asns))
+        for label, names in (("Not found", expansion.missing), ("Failed", expansion.failed)):
+            if names:
+                display.console.print(f"[yellow]{label}: {', '.join(names)}[/yellow]")
+        if expansion.cycles:
+            cycles = ", ".join(f"{name} -> {member}" for name, member in expansion.cycles)
+            display.console.print(f"[yellow]Cycles: {cycles}[/yellow]")
+
+
+async def async_asset_query(
+    as_set: str,
+    output_format: Optional[str] = None,
+    base_url: Optional[str] = None,
+    expand_concurrency: Optional[int] = None,
+    config: Optional[ClientConfig] = None,
+) -> None:
+    """Query the members of an AS set.
+
+    With expand_concurrency, nested sets are resolved recursively with up to that many concurrent requests;
+    without it only the set's own members are listed.
+    """
+    async with open_explorer(base_url, config) as explorer:
+        display = IrrDisplay(explorer)
+        if expand_concurrency is None:
+            expansion = await SetExpander(explorer).direct_members(as_set)
+        else:
+            expansion = await SetExpander(explorer, expand_concurrency).expand(as_set)
+        with profile_phase("format", expansion.name):
+            print_asset_expansion(display, expansion, output_format)
+
+
+async def fetch_aggregates(explorer: IrrExplorer, as_number: str) -> Tuple[str, int, List[Aggregate]]:
+    """Fetch the prefixes an AS number originates and aggregate them."""
+    results = await leave_out_failure(explorer.fetch_asn_info(as_number), as_number)
+    if results is None:
+        return as_number, 0, []
+    prefixes = [item["prefix"] for item in results.get("directOrigin", [])]
+    with profile_phase("aggregate", as_number):
+        return as_number, len(prefixes), aggregate_prefixes(prefixes)
+
+
+def print_aggregates(display: IrrDisplay, as_number: str, total: int, aggregates: List[Aggregate]) -> None:
+    """Print the aggregates of an AS number as a Rich table."""
+    table = Table(title=f"{as_number}: {total} prefixes in {len(aggregates)} aggregates", title_justify="left")
+    table.add_column("Aggregate")
+    table.add_column("Prefixes", justify="right")
+    for aggregate in aggregates:
+        table.add_row(aggregate.prefix, str(aggregate.count))
+    display.console.print(table)
+
+
+async def async_aggregate_query(
+    as_numbers: List[str],
+    output_format: Optional[str] = None,
+    base_url: Optional[str] = None,
+    concurrency: int = 10,
+    config: Optional[ClientConfig] = None,
+) -> None:
+    """Print the direct origin prefixes of AS numbers aggregated into the fewest covering prefixes."""
+    async with open_explorer(base_url, config) as explorer:
+        display = IrrDisplay(explorer)
+        json_data: Dict[str, List[Dict[str, Any]]] = {}
+        if output_format == "csv":
+            print("ASN,Prefix,Count")
+        async for as_number, total, aggregates in iter_bounded(
+            dict.fromkeys(as_numbers), functools.partial(fetch_aggregates, explorer), concurrency
+        ):
+            if output_format == "json":
+                json_data[as_number] = [aggregate.model_dump() for aggregate in aggregates]
+            elif output_format == "ndjson":
+                for aggregate in aggregates:
+                    record = {"type": "AGGREGATE", "asn": as_number, **aggregate.model_dump()}
+                    print(json.dumps(record, separators=(",", ":")))
+            elif output_format == "csv":
+                for aggregate in aggregates:
+                    print(f"{as_number},{aggregate.prefix},{aggregate.count}")
+            else:
+                print_aggregates(display, as_number, total, aggregates)
+        if output_format == "json":
+            ordered = {as_number: json_data[as_number] for as_number in dict.fromkeys(as_numbers)}
+            print(json.dumps(ordered, indent=2))
+
+
+SUMMARY_LEFT_OUT = "left {} out of the summary"
+
+
+async def fetch_summary_infos(explorer: IrrExplorer, query: str) -> List[PrefixInfo]:
+    """Fetch the prefixes of a prefix or AS number to summarize, leaving a failed query out."""
+    if not validate_asn_format(query):
+        return await leave_out_failure(explorer.fetch_prefix_info(query), query, SUMMARY_LEFT_OUT) or []
+    results = await leave_out_failure(explorer.fetch_asn_info(query), query, SUMMARY_LEFT_OUT)
+    return [] if results is None else [info for _, info in iter_asn_prefix_rows(results)]
+
+
+def print_summary(display: IrrDisplay, summary: Summary) -> None:
+    """Print a summary as Rich tables."""
+    display.console.print(f"[bold]{summary.prefixes} prefixes[/bold]")
+    categories = Table(title="Categories", title_justify="left")
+    categories.add_column("Category")
+    categories.add_column("Prefixes", justify="right")
+    for category, count in summary.categories.items():
+        categories.add_row(category, str(count))
+    display.console.print(categories)
+
+    statuses = sorted({status for counts in summary.rpki_by_rir.values() for status in counts})
+    rpki = Table(title="RPKI status per RIR", title_justify="left")
+    rpki.add_column("RIR")
+    for status in statuses:
+        rpki.add_column(status, justify="right")
+    for rir, counts in summary.rpki_by_rir.items():
+        rpki.add_row(rir, *(str(counts.get(status, 0)) for status in statuses))
+    display.console.print(rpki)
+
+    display.console.print(
+        f"BGP origins without an IRR route object: {summary.irr_mismatches} of {summary.bgp_originated} "
+        f"originated prefixes ({summary.irr_mismatch_rate:.1%})"
+    )
+    for version, histogram in summary.prefix_lengths.items():
+        if histogram:
+            lengths = Table(title=f"{version} prefix lengths", title_justify="left")
+            lengths.add_column("Length", justify="right")
+            lengths.add_column("Prefixes", justify="right")
+            for length, count in histogram.items():
+                lengths.add_row(f"/{length}", str(count))
+            display.console.print(lengths)
+
+
+async def async_summary_query(
+    queries: List[str],
+    output_format: Optional[str] = None,
+    base_url: Optional[str] = None,
+    concurrency: int = 10,
+    config: Optional[ClientConfig] = None,
+) -> None:
+    """Print aggregate statistics over the prefixes of prefixes or AS numbers, each prefix counted once."""
+    async with open_explorer(base_url, config) as explorer:
+        display = IrrDisplay(explorer)
+        infos: Dict[str, PrefixInfo] = {}
+        async for query_infos in iter_bounded(
+            dict.fromkeys(queries), functools.partial(fetch_summary_infos, explorer), concurrency
+        ):
+            infos.update((info.prefix, info) for info in query_infos)
+        with profile_phase("summary", f"{len(infos)} prefixes"):
+            summary = summarize(infos.values())
+        if output_format == "json":
+            print(summary.model_dump_json(indent=2))
+        else:
+            print_summary(display, summary)
+
+
+async def fetch_columnar_rows(explorer: IrrExplorer, query: str) -> Tuple[str, List[Tuple[str, PrefixInfo]]]:
+    """Fetch the prefix rows of a prefix or AS number as (row type, prefix), leaving a failed query out."""
+    if not validate_asn_format(query):
+        pfx, direct_overlaps, _, all_overlaps = await fetch_prefix_batch_item(explorer, query, True)
+        return pfx, [("DIRECT", info) for info in direct_overlaps] + [("OVERLAP", info) for info in all_overlaps]
+    results = await leave_out_failure(explorer.fetch_asn_info(query), query)
+    return query, [] if results is None else list(iter_asn_prefix_rows(results))
+
+
+async def async_columnar_query(
+    queries: List[str],
+    output_format: str,
+    base_url: Optional[str] = None,
+    concurrency: int = 10,
+    config: Optional[ClientConfig] = None,
+) -> None:
+    """Write the prefixes of prefixes or AS numbers to stdout as Parquet or Arrow IPC, in row groups as they arrive."""
+    async with open_explorer(base_url, config) as explorer:
+        writer = ColumnarWriter(sys.stdout.buffer, output_format)
+        async for query, rows in iter_bounded(
+            dict.fromkeys(queries), functools.partial(fetch_columnar_rows, explorer), concurrency
+        ):
+            with profile_phase("format", query):
+                for row_type, info in rows:
+                    writer.add(row_type, query, info)
+        writer.close()
+
+
+async def fetch_export_rows(
+    explorer: IrrExplorer, query: str, semaphore: Optional[asyncio.Semaphore] = None
+) -> Tuple[str, List[Tuple[str, PrefixInfo]], Optional[Dict[str, Any]]]:
+    """Fetch the prefix rows of a prefix, or the prefix rows and AS sets of an AS number, leaving a failed query out."""
+    if not validate_asn_format(query):
+        return *await fetch_columnar_rows(explorer, query), None
+    bundle = await leave_out_failure(fetch_asn_bundle(explorer, query, semaphore), query)
+    if bundle is None:
+        return query, [], None
+    results, sets_data = bundle
+    return query, list(iter_asn_prefix_rows(results)), sets_data
+
+
+async def async_sqlite_export(
+    queries: List[str],
+    path: Path,
+    base_url: Optional[str] = None,
+    concurrency: int = 10,
+    config: Optional[ClientConfig] = None,
+) -> None:
+    """Write the prefixes of prefixes or AS numbers, and the AS sets of AS numbers, into a SQLite database."""
+    async with open_explorer(base_url, config) as explorer:
+        export = SqliteExport(path)
+        try:
+            async for query, rows, sets_data in iter_bounded(
+                dict.fromkeys(queries),
+                functools.partial(fetch_export_rows, explorer, semaphore=asyncio.Semaphore(concurrency)),
+                concurrency,
+            ):
+                with profile_phase("export", query):
+                    for row_type, info in rows:
+                        export.add_prefix(row_type, query, info)
+                    if sets_data is not None:
+                        export.add_as_sets(query, sets_data)
+        finally:
+            export.close()
+    print(f"Wrote {export.count} prefixes to {path}")
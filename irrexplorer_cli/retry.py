@@ -0,0 +1,116 @@
+"""Retry budget and hedged requests for bounding tail latency."""
+
+import asyncio
+import collections
+import logging
+import math
+from typing import Deque, Optional, Set, TypeVar
+
+import httpx
+from backoff.types import Details
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_RETRY_RATIO = 0.1
+MIN_RETRIES = 10
+LATENCY_WINDOW = 200
+MIN_HEDGE_SAMPLES = 20
+
+
+class RetryBudget:
+    """Cap retries and hedged requests to a fraction of all requests, plus a few to get started."""
+
+    def __init__(self, ratio: float = DEFAULT_RETRY_RATIO, min_retries: int = MIN_RETRIES) -> None:
+        """Initialize budget allowing ratio extra attempts per request."""
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.requests = 0
+        self.retries = 0
+
+    def record_request(self) -> None:
+        """Count a first attempt, which earns part of a retry."""
+        self.requests += 1
+
+    def can_retry(self) -> bool:
+        """Check whether another retry fits in the budget."""
+        return self.retries < self.min_retries + self.ratio * self.requests
+
+    def spend(self) -> None:
+        """Count a retry or hedged request."""
+        self.retries += 1
+
+    def try_spend(self) -> bool:
+        """Count a retry if it fits in the budget."""
+        if not self.can_retry():
+            return False
+        self.spend()
+        return True
+
+
+_BUDGET = RetryBudget()
+
+
+def retry_budget() -> RetryBudget:
+    """Return the process-wide retry budget."""
+    return _BUDGET
+
+
+def configure_retry_budget(ratio: float) -> RetryBudget:
+    """Replace the process-wide retry budget with one allowing ratio retries per request."""
+    global _BUDGET  # pylint: disable=global-statement
+    _BUDGET = RetryBudget(ratio)
+    return _BUDGET
+
+
+def budget_exhausted(exc: Exception) -> bool:
+    """Backoff giveup predicate: stop retrying once the retry budget is spent."""
+    if _BUDGET.can_retry():
+        return False
+    logger.warning("Retry budget exhausted, not retrying: %s", exc)
+    return True
+
+
+def not_retryable(exc: Exception) -> bool:
+    """Backoff giveup predicate: retry transport errors, 429 and 5xx only, within the retry budget."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+        if status != 429 and status < 500:
+            return True
+    return budget_exhausted(exc)
+
+
+def spend_retry(_: Details) -> None:
+    """Backoff handler counting each retry against the budget."""
+    _BUDGET.spend()
+
+
+class LatencyWindow:
+    """Latencies of the most recent successful requests."""
+
+    def __init__(self, size: int = LATENCY_WINDOW) -> None:
+        """Initialize an empty window of the given size."""
+        self.samples: Deque[float] = collections.deque(maxlen=size)
+
+    def add(self, seconds: float) -> None:
+        """Record the latency of a successful request."""
+        self.samples.append(seconds)
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """Return a latency percentile, or None until enough requests have completed."""
+        if len(self.samples) < MIN_HEDGE_SAMPLES:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(math.ceil(percent / 100 * len(ordered)), len(ordered)) - 1]
+
+
+async def first_success(attempts: Set["asyncio.Future[T]"]) -> T:
+    """Return the result of the first attempt to succeed, or raise the error of an attempt when all fail."""
+    pending = set(attempts)
+    while pending:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for attempt in done:
+            if attempt.exception() is None:
+                return attempt.result()
+    return next(iter(attempts)).result()
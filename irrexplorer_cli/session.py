@@ -0,0 +1,100 @@
+"""HTTP session management for IRR Explorer API clients."""
+
+import asyncio
+import contextlib
+import importlib.util
+import logging
+from typing import Any, AsyncContextManager, Awaitable, Callable, Dict, Generic, Optional, TypeVar
+
+import httpx
+
+from irrexplorer_cli.config import ClientConfig
+from irrexplorer_cli.deadline import Deadline
+from irrexplorer_cli.limiter import AdaptiveLimiter
+from irrexplorer_cli.prefix_index import PrefixIndex
+from irrexplorer_cli.retry import LatencyWindow
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def http2_available() -> bool:
+    """Check whether the optional HTTP/2 dependency is installed."""
+    return importlib.util.find_spec("h2") is not None
+
+
+class SingleFlight(Generic[T]):
+    """Coalesce concurrent calls for the same key into a single in-flight call."""
+
+    def __init__(self) -> None:
+        """Initialize with no calls in flight."""
+        self.inflight: Dict[str, "asyncio.Future[T]"] = {}
+
+    async def do(self, key: str, func: Callable[[], Awaitable[T]]) -> T:
+        """Run func for key, or wait for the identical call already in flight."""
+        future = self.inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(func())
+            self.inflight[key] = future
+            future.add_done_callback(lambda done: self.forget(key, done))
+        else:
+            logger.debug("Joining in-flight request: %s", key)
+        # shield so a cancelled caller does not cancel the call for everyone else
+        return await asyncio.shield(future)
+
+    def forget(self, key: str, future: "asyncio.Future[T]") -> None:
+        """Drop a finished call so later calls start a fresh one."""
+        if self.inflight.get(key) is future:
+            del self.inflight[key]
+
+
+class SessionManager:  # pylint: disable=too-many-instance-attributes
+    """Long-lived HTTP connection pools, one per API base URL."""
+
+    def __init__(self, config: Optional[ClientConfig] = None) -> None:
+        """Initialize session manager with pool settings."""
+        self.config = config or ClientConfig()
+        self.timeout = httpx.Timeout(self.config.timeout)
+        self.limits = httpx.Limits(
+            max_connections=self.config.max_connections,
+            max_keepalive_connections=self.config.max_keepalive_connections,
+            keepalive_expiry=self.config.keepalive_expiry,
+        )
+        self.http2 = self.config.http2
+        if self.http2 and not http2_available():
+            logger.warning("HTTP/2 requested but the 'h2' package is not installed, falling back to HTTP/1.1")
+            self.http2 = False
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self.single_flight: SingleFlight[Any] = SingleFlight()
+        self.prefix_index = PrefixIndex() if self.config.prefix_index else None
+        self.limiter = AdaptiveLimiter(self.config.max_connections) if self.config.adaptive_concurrency else None
+        self.latencies = LatencyWindow()
+        self.deadline = Deadline(self.config.deadline)
+
+    def hedge_delay(self) -> Optional[float]:
+        """Return how long to wait for a response before hedging it, or None when hedging is off."""
+        if not self.config.hedge:
+            return None
+        return self.latencies.percentile(self.config.hedge_percentile)
+
+    def slot(self) -> AsyncContextManager[None]:
+        """Wait for the adaptive limiter to allow a request, when it is enabled."""
+        if self.limiter is None:
+            return contextlib.nullcontext()
+        return self.limiter.slot()
+
+    def client(self, base_url: str) -> httpx.AsyncClient:
+        """Return the pooled client for a base URL, creating it on first use."""
+        key = base_url.rstrip("/")
+        if key not in self._clients:
+            logger.debug("Creating connection pool for %s (http2=%s)", key, self.http2)
+            self._clients[key] = httpx.AsyncClient(timeout=self.timeout, limits=self.limits, http2=self.http2)
+        return self._clients[key]
+
+    async def close(self) -> None:
+        """Close every pooled client."""
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for client in clients:
+            await client.aclose()
@@ -0,0 +1,283 @@
+"""Offline snapshot files of fetched prefix and ASN data, read through mmap."""
+
+import bisect
+import logging
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from irrexplorer_cli.config import DEFAULT_BASE_URL, ClientConfig
+from irrexplorer_cli.irrexplorer import IrrExplorer
+from irrexplorer_cli.models import PrefixInfo
+from irrexplorer_cli.prefix_index import parse_network
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"IRXS"
+FORMAT_VERSION = 1
+
+# magic, format version, prefix record count, ASN record count, section offsets, prefix lengths per IP version
+HEADER = struct.Struct(">4sHxxQQQQQ17s17s")
+# IP version, network address, prefix length, flags, then the offset and size of the PrefixInfo JSON
+PREFIX_RECORD = struct.Struct(">B16sBBQI")
+# the sort key of a prefix record, its first 18 bytes
+PREFIX_KEY = struct.Struct(">B16sB")
+# AS number, then the offsets and sizes of the ASN prefix and AS set JSON responses
+ASN_RECORD = struct.Struct(">IQIQI")
+ASN_KEY = struct.Struct(">I")
+
+# every prefix overlapping the record's network is in the snapshot
+COMPLETE = 1
+
+EMPTY_PREFIXES = b"[]"
+EMPTY_ASN = b"{}"
+
+
+def pack_key(version: int, address: int, length: int) -> bytes:
+    """Pack a network into a prefix record key, which sorts by version, address and then length."""
+    return PREFIX_KEY.pack(version, address.to_bytes(16, "big"), length)
+
+
+def asn_number(asn: str) -> int:
+    """Return the integer AS number of an ASN such as AS2111."""
+    return int(asn.upper().removeprefix("AS"))
+
+
+def prefix_records(infos: Iterable[PrefixInfo], complete: Iterable[str]) -> Dict[bytes, Tuple[int, bytes]]:
+    """Map the sort key of every network to its flags and PrefixInfo JSON, empty for complete networks only."""
+    records: Dict[bytes, Tuple[int, bytes]] = {}
+    for info in infos:
+        try:
+            records[pack_key(*parse_network(info.prefix))] = (0, info.model_dump_json().encode())
+        except ValueError:
+            logger.debug("Not storing invalid prefix: %s", info.prefix)
+    for prefix in complete:
+        try:
+            key = pack_key(*parse_network(prefix))
+        except ValueError:
+            continue
+        records[key] = (COMPLETE, records.get(key, (0, b""))[1])
+    return records
+
+
+def pack_prefix_records(
+    records: List[Tuple[bytes, Tuple[int, bytes]]], offset: int
+) -> Tuple[List[bytes], List[bytes], Dict[int, int]]:
+    """Pack sorted prefix records with their JSON stored from offset on, and the prefix lengths per IP version."""
+    table: List[bytes] = []
+    blobs: List[bytes] = []
+    lengths = {4: 0, 6: 0}
+    for key, (flags, body) in records:
+        version, address, length = PREFIX_KEY.unpack(key)
+        lengths[version] |= 1 << length
+        table.append(PREFIX_RECORD.pack(version, address, length, flags, offset, len(body)))
+        blobs.append(body)
+        offset += len(body)
+    return table, blobs, lengths
+
+
+def pack_asn_records(asn_items: List[Tuple[int, Tuple[bytes, bytes]]], offset: int) -> Tuple[List[bytes], List[bytes]]:
+    """Pack sorted ASN records with their responses stored from offset on."""
+    table: List[bytes] = []
+    blobs: List[bytes] = []
+    for asn, (info_body, sets_body) in asn_items:
+        table.append(ASN_RECORD.pack(asn, offset, len(info_body), offset + len(info_body), len(sets_body)))
+        blobs.extend((info_body, sets_body))
+        offset += len(info_body) + len(sets_body)
+    return table, blobs
+
+
+def write_snapshot(
+    path: Path, infos: Iterable[PrefixInfo], complete: Iterable[str], asns: Dict[str, Tuple[bytes, bytes]]
+) -> int:
+    """Write prefix information, the networks it fully covers and raw ASN responses to a snapshot file.
+
+    Returns the number of prefix records. The file is written next to its destination and moved into place.
+    """
+    records = sorted(prefix_records(infos, complete).items())
+    asn_items = sorted((asn_number(asn), responses) for asn, responses in asns.items())
+    asn_table = HEADER.size + len(records) * PREFIX_RECORD.size
+    data = asn_table + len(asn_items) * ASN_RECORD.size
+    prefix_table, prefix_blobs, lengths = pack_prefix_records(records, data)
+    asn_records, asn_blobs = pack_asn_records(asn_items, data + sum(len(blob) for blob in prefix_blobs))
+
+    partial = path.with_name(f".{path.name}.tmp")
+    with partial.open("wb") as file:
+        file.write(
+            HEADER.pack(
+                MAGIC,
+                FORMAT_VERSION,
+                len(records),
+                len(asn_items),
+                HEADER.size,
+                asn_table,
+                data,
+                lengths[4].to_bytes(17, "big"),
+                lengths[6].to_bytes(17, "big"),
+            )
+        )
+        file.writelines(prefix_table + asn_records + prefix_blobs + asn_blobs)
+    os.replace(partial, path)
+    logger.debug("Wrote %d prefix and %d ASN records to %s", len(records), len(asn_items), path)
+    return len(records)
+
+
+class RecordKeys:
+    """Sequence view of the sort keys of fixed-width records in a mapped file, for bisect."""
+
+    def __init__(self, buffer: mmap.mmap, start: int, count: int, record_size: int, key_size: int) -> None:
+        """Initialize view of count records of record_size bytes starting at offset start."""
+        self.buffer = buffer
+        self.start = start
+        self.count = count
+        self.record_size = record_size
+        self.key_size = key_size
+
+    def __len__(self) -> int:
+        """Return the number of records."""
+        return self.count
+
+    def __getitem__(self, index: int) -> bytes:
+        """Return the key of a record."""
+        offset = self.start + index * self.record_size
+        return self.buffer[offset : offset + self.key_size]
+
+    def find(self, key: bytes) -> Optional[int]:
+        """Return the index of the record with a key, or None."""
+        index = bisect.bisect_left(self, key)
+        if index < self.count and self[index] == key:
+            return index
+        return None
+
+
+class Snapshot:
+    """Read-only snapshot file, mapped into memory so opening it costs nothing and lookups touch a few pages.
+
+    Prefix records are sorted by IP version, network address and prefix length, so the networks inside a
+    network form one contiguous run, and each covering network is found with one binary search per length.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Map a snapshot file, raising ValueError when it is not one."""
+        self.path = path
+        with path.open("rb") as file:
+            try:
+                self.buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as exc:
+                raise ValueError(f"Not an irrexplorer snapshot: {path}") from exc
+        if len(self.buffer) < HEADER.size or self.buffer[:4] != MAGIC:
+            self.buffer.close()
+            raise ValueError(f"Not an irrexplorer snapshot: {path}")
+
+        _, version, prefix_count, asn_count, prefix_table, asn_table, _, v4_lengths, v6_lengths = HEADER.unpack_from(
+            self.buffer
+        )
+        if version != FORMAT_VERSION:
+            self.buffer.close()
+            raise ValueError(f"Unsupported snapshot format version {version}: {path}")
+        logger.debug("Mapped snapshot %s (%d prefixes, %d AS numbers)", path, prefix_count, asn_count)
+        self.prefixes = RecordKeys(self.buffer, prefix_table, prefix_count, PREFIX_RECORD.size, PREFIX_KEY.size)
+        self.asns = RecordKeys(self.buffer, asn_table, asn_count, ASN_RECORD.size, ASN_KEY.size)
+        self.lengths = {4: int.from_bytes(v4_lengths, "big"), 6: int.from_bytes(v6_lengths, "big")}
+
+    def prefix_record(self, index: int) -> Tuple[int, bytes]:
+        """Return the flags and PrefixInfo JSON of a prefix record."""
+        _, _, _, flags, offset, size = PREFIX_RECORD.unpack_from(
+            self.buffer, self.prefixes.start + index * PREFIX_RECORD.size
+        )
+        return flags, self.buffer[offset : offset + size]
+
+    def covering(self, version: int, address: int, length: int) -> Iterator[int]:
+        """Yield the indexes of records covering (or equal to) a network, least specific first."""
+        lengths = self.lengths[version]
+        width = 32 if version == 4 else 128
+        for covering_length in range(length + 1):
+            if lengths >> covering_length & 1:
+                network = address & ~((1 << (width - covering_length)) - 1)
+                index = self.prefixes.find(pack_key(version, network, covering_length))
+                if index is not None:
+                    yield index
+
+    def inside(self, version: int, address: int, length: int) -> range:
+        """Return the index range of records strictly inside a network, in address order."""
+        width = 32 if version == 4 else 128
+        last = address | ((1 << (width - length)) - 1)
+        start = bisect.bisect_left(self.prefixes, pack_key(version, address, length + 1))
+        end = bisect.bisect_right(self.prefixes, pack_key(version, last, width))
+        return range(start, end)
+
+    def overlaps(self, prefix: str) -> Tuple[List[bytes], bool]:
+        """Return the PrefixInfo JSON of every stored prefix overlapping a network.
+
+        The second value tells whether the snapshot holds all of them, which is the case when the
+        network lies inside a network fetched while building the snapshot.
+        """
+        version, address, length = parse_network(prefix)
+        complete = False
+        bodies: List[bytes] = []
+        for index in self.covering(version, address, length):
+            flags, body = self.prefix_record(index)
+            complete = complete or bool(flags & COMPLETE)
+            if body:
+                bodies.append(body)
+        for index in self.inside(version, address, length):
+            _, body = self.prefix_record(index)
+            if body:
+                bodies.append(body)
+        return bodies, complete
+
+    def asn(self, asn: str) -> Optional[Tuple[bytes, bytes]]:
+        """Return the raw ASN prefix and AS set responses stored for an AS number, or None."""
+        index = self.asns.find(ASN_KEY.pack(asn_number(asn)))
+        if index is None:
+            return None
+        _, info_offset, info_size, sets_offset, sets_size = ASN_RECORD.unpack_from(
+            self.buffer, self.asns.start + index * ASN_RECORD.size
+        )
+        return self.buffer[info_offset : info_offset + info_size], self.buffer[sets_offset : sets_offset + sets_size]
+
+    def close(self) -> None:
+        """Unmap the file."""
+        self.buffer.close()
+
+
+class SnapshotExplorer(IrrExplorer):
+    """API client answering every request from a snapshot file, without any network access."""
+
+    def __init__(self, path: Path, base_url: str = DEFAULT_BASE_URL, config: Optional[ClientConfig] = None) -> None:
+        """Initialize client over a snapshot file; the response cache and prefix index are not needed."""
+        config = (config or ClientConfig()).model_copy(update={"cache": False, "prefix_index": False})
+        super().__init__(base_url=base_url, config=config)
+        self.snapshot = Snapshot(path)
+
+    def local_body(self, url: str) -> Optional[bytes]:
+        """Answer an API request from the snapshot."""
+        path = url.removeprefix(self.base_url)
+        if path.startswith("/api/prefixes/prefix/"):
+            prefix = path.removeprefix("/api/prefixes/prefix/")
+            try:
+                bodies, complete = self.snapshot.overlaps(prefix)
+            except ValueError:
+                logger.warning("Invalid prefix for snapshot lookup: %s", prefix)
+                return EMPTY_PREFIXES
+            if not complete:
+                logger.warning("Snapshot does not cover %s, overlapping prefixes may be missing", prefix)
+            return b"[" + b",".join(bodies) + b"]"
+
+        for endpoint, part in (("/api/prefixes/asn/", 0), ("/api/sets/member-of/", 1)):
+            if path.startswith(endpoint):
+                asn = path.removeprefix(endpoint)
+                stored = self.snapshot.asn(asn)
+                if stored is None:
+                    if not part:
+                        logger.warning("%s is not in the snapshot", asn)
+                    return EMPTY_ASN
+                return stored[part]
+        raise ValueError(f"Not available in snapshot: {path}")
+
+    async def close(self) -> None:
+        """Unmap the snapshot and close the unused HTTP session."""
+        self.snapshot.close()
+        await super().close()
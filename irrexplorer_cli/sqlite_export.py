@@ -0,0 +1,128 @@
+"""Export of query results into a SQLite database of normalized, indexed tables."""
+
+import logging
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from irrexplorer_cli.models import PrefixInfo
+
+logger = logging.getLogger(__name__)
+
+# prefixes inserted per transaction
+BATCH_SIZE = 10_000
+
+TABLES = {
+    "prefixes": (
+        "id INTEGER PRIMARY KEY, query TEXT NOT NULL, type TEXT NOT NULL, prefix TEXT NOT NULL, rir TEXT, "
+        "category TEXT, goodness INTEGER, sort_key TEXT"
+    ),
+    "bgp_origins": "prefix_id INTEGER NOT NULL REFERENCES prefixes (id), asn INTEGER NOT NULL",
+    "irr_routes": (
+        "prefix_id INTEGER NOT NULL REFERENCES prefixes (id), irr TEXT NOT NULL, asn INTEGER NOT NULL, "
+        "rpki_status TEXT, rpki_max_length INTEGER, rpsl_pk TEXT, rpsl_text TEXT"
+    ),
+    "rpki_routes": (
+        "prefix_id INTEGER NOT NULL REFERENCES prefixes (id), asn INTEGER NOT NULL, "
+        "rpki_status TEXT, rpki_max_length INTEGER, rpsl_pk TEXT, rpsl_text TEXT"
+    ),
+    "messages": "prefix_id INTEGER NOT NULL REFERENCES prefixes (id), category TEXT, text TEXT",
+    "as_set_members": "asn INTEGER NOT NULL, irr TEXT NOT NULL, as_set TEXT NOT NULL",
+}
+
+# indexed columns per table; child rows are looked up by prefix and ASN together in joins
+INDEXES = {
+    "prefixes": (("prefix",), ("category",)),
+    "bgp_origins": (("prefix_id", "asn"), ("asn",)),
+    "irr_routes": (("prefix_id", "asn"), ("asn",), ("rpki_status",)),
+    "rpki_routes": (("prefix_id", "asn"), ("asn",), ("rpki_status",)),
+    "messages": (("prefix_id",),),
+    "as_set_members": (("asn",), ("as_set",)),
+}
+
+
+class SqliteExport:
+    """Writer of prefixes and AS set memberships into normalized SQLite tables.
+
+    Rows are buffered and inserted with executemany, one transaction per BATCH_SIZE prefixes. Indexes are
+    created when the export is closed, after the bulk inserts. Exporting into an existing database adds to it.
+    """
+
+    def __init__(self, path: Path, batch_size: int = BATCH_SIZE) -> None:
+        """Initialize export into a database file, creating its tables."""
+        self.path = path
+        self.batch_size = batch_size
+        self.rows: Dict[str, List[Tuple[Any, ...]]] = {table: [] for table in TABLES}
+        self.db = sqlite3.connect(path, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        for table, columns in TABLES.items():
+            self.db.execute(f"CREATE TABLE IF NOT EXISTS {table} ({columns})")
+        self.next_id = self.db.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM prefixes").fetchone()[0]
+        self.count = 0
+
+    def add_prefix(self, row_type: str, query: str, info: PrefixInfo) -> None:
+        """Add a prefix with its BGP origins, IRR routes, RPKI routes and messages."""
+        prefix_id = self.next_id
+        self.next_id += 1
+        self.rows["prefixes"].append(
+            (
+                prefix_id,
+                query,
+                row_type,
+                info.prefix,
+                info.rir,
+                info.categoryOverall,
+                info.goodnessOverall,
+                info.prefixSortKey,
+            )
+        )
+        self.rows["bgp_origins"].extend((prefix_id, asn) for asn in info.bgpOrigins)
+        self.rows["irr_routes"].extend(
+            (prefix_id, irr, route.asn, route.rpkiStatus, route.rpkiMaxLength, route.rpslPk, route.rpslText)
+            for irr, routes in info.irrRoutes.items()
+            for route in routes
+        )
+        self.rows["rpki_routes"].extend(
+            (prefix_id, route.asn, route.rpkiStatus, route.rpkiMaxLength, route.rpslPk, route.rpslText)
+            for route in info.rpkiRoutes
+        )
+        self.rows["messages"].extend((prefix_id, message.category, message.text) for message in info.messages)
+        if len(self.rows["prefixes"]) >= self.batch_size:
+            self.flush()
+
+    def add_as_sets(self, as_number: str, sets_data: Dict[str, Any]) -> None:
+        """Add the AS sets an AS number is a member of, per IRR database."""
+        asn = int(as_number.upper().removeprefix("AS"))
+        self.rows["as_set_members"].extend(
+            (asn, irr, as_set) for irr, as_sets in (sets_data.get("setsPerIrr") or {}).items() for as_set in as_sets
+        )
+
+    def flush(self) -> None:
+        """Insert the buffered rows in one transaction."""
+        self.db.execute("BEGIN")
+        try:
+            for table, rows in self.rows.items():
+                if rows:
+                    placeholders = ", ".join("?" * len(rows[0]))
+                    self.db.executemany(f"INSERT INTO {table} VALUES ({placeholders})", rows)
+        except sqlite3.Error:
+            self.db.execute("ROLLBACK")
+            raise
+        self.db.execute("COMMIT")
+        self.count += len(self.rows["prefixes"])
+        logger.debug("Inserted %d prefixes, %d in total", len(self.rows["prefixes"]), self.count)
+        self.rows = {table: [] for table in TABLES}
+
+    def close(self) -> None:
+        """Insert the remaining rows, create the indexes and close the database."""
+        try:
+            self.flush()
+            for table, indexes in INDEXES.items():
+                for columns in indexes:
+                    self.db.execute(
+                        f"CREATE INDEX IF NOT EXISTS {table}_{'_'.join(columns)} ON {table} ({', '.join(columns)})"
+                    )
+            self.db.execute("ANALYZE")
+        finally:
+            self.db.close()
@@ -0,0 +1,181 @@
+"""Incremental JSON decoding for large API responses."""
+
+import codecs
+import json
+import logging
+from typing import Any, AsyncIterable, AsyncIterator, Iterable, List, Optional, Tuple
+
+from irrexplorer_cli.profiling import profile_phase
+
+logger = logging.getLogger(__name__)
+
+WHITESPACE = " \t\n\r"
+
+# parser states
+START = "start"
+OBJECT_KEY = "object_key"
+OBJECT_COLON = "object_colon"
+OBJECT_VALUE = "object_value"
+ARRAY_ITEM = "array_item"
+DONE = "done"
+
+
+class JsonArrayStreamParser:  # pylint: disable=too-many-instance-attributes
+    """Push parser yielding the elements of selected top-level arrays one at a time.
+
+    The document is either an object whose arrays under ``keys`` are streamed,
+    or a top-level array whose elements are streamed under the empty key.
+    Any other values are decoded in full and skipped.
+    """
+
+    def __init__(self, keys: Optional[Iterable[str]] = None) -> None:
+        """Initialize parser for the given array keys."""
+        self.keys = set(keys or ())
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.state = START
+        self.key = ""
+        self.in_object = False
+        self.eof = False
+        self.retry_at = 0
+
+    def feed(self, text: str) -> List[Tuple[str, Any]]:
+        """Add decoded text and return every array element completed by it."""
+        self.buffer = self.buffer[self.pos :] + text
+        self.retry_at = max(self.retry_at - self.pos, 0)
+        self.pos = 0
+        return self.parse()
+
+    def close(self) -> List[Tuple[str, Any]]:
+        """Signal end of input and return the remaining elements."""
+        self.eof = True
+        self.retry_at = 0
+        items = self.parse()
+        if self.state not in (START, DONE) or self.buffer[self.pos :].strip(WHITESPACE):
+            raise ValueError("Truncated or invalid JSON document")
+        return items
+
+    def skip_whitespace(self) -> bool:
+        """Advance past whitespace, returning whether more input is buffered."""
+        while self.pos < len(self.buffer) and self.buffer[self.pos] in WHITESPACE:
+            self.pos += 1
+        return self.pos < len(self.buffer)
+
+    def decode_value(self) -> Tuple[bool, Any]:
+        """Decode one complete JSON value at the current position."""
+        if len(self.buffer) < self.retry_at:
+            return False, None
+        try:
+            value, end = self.decoder.raw_decode(self.buffer, self.pos)
+        except json.JSONDecodeError as e:
+            if self.eof:
+                raise ValueError(f"Invalid JSON document: {e}") from e
+            # wait until the buffer doubles before retrying, keeping large values linear
+            self.retry_at = 2 * len(self.buffer)
+            return False, None
+        if end == len(self.buffer) and not self.eof:
+            # a number at the end of the buffer may continue in the next chunk
+            return False, None
+        self.pos = end
+        self.retry_at = 0
+        return True, value
+
+    def parse(self) -> List[Tuple[str, Any]]:
+        """Consume as much buffered input as possible."""
+        items: List[Tuple[str, Any]] = []
+        steps = {
+            START: self.step_start,
+            OBJECT_KEY: self.step_object_key,
+            OBJECT_COLON: self.step_object_colon,
+            OBJECT_VALUE: self.step_object_value,
+            ARRAY_ITEM: self.step_array_item,
+        }
+        while self.state != DONE and self.skip_whitespace():
+            if not steps[self.state](self.buffer[self.pos], items):
+                break
+        return items
+
+    def step_start(self, char: str, _: List[Tuple[str, Any]]) -> bool:
+        """Detect whether the document is an object or a top-level array."""
+        if char == "{":
+            self.pos += 1
+            self.in_object, self.state = True, OBJECT_KEY
+        elif char == "[":
+            self.pos += 1
+            self.key, self.state = "", ARRAY_ITEM
+        else:
+            # null or another scalar document carries no elements
+            complete, _ = self.decode_value()
+            if not complete:
+                return False
+            self.state = DONE
+        return True
+
+    def step_object_key(self, char: str, _: List[Tuple[str, Any]]) -> bool:
+        """Read the next object key or the end of the object."""
+        if char in ",}":
+            self.pos += 1
+            self.state = DONE if char == "}" else OBJECT_KEY
+            return True
+        complete, key = self.decode_value()
+        if not complete:
+            return False
+        self.key, self.state = key, OBJECT_COLON
+        return True
+
+    def step_object_colon(self, char: str, _: List[Tuple[str, Any]]) -> bool:
+        """Read the separator between an object key and its value."""
+        if char != ":":
+            raise ValueError(f"Expected ':' after key {self.key!r}")
+        self.pos += 1
+        self.state = OBJECT_VALUE
+        return True
+
+    def step_object_value(self, char: str, _: List[Tuple[str, Any]]) -> bool:
+        """Start streaming a selected array, or skip any other value."""
+        if char == "[" and self.key in self.keys:
+            self.pos += 1
+            self.state = ARRAY_ITEM
+            return True
+        complete, _ = self.decode_value()
+        if not complete:
+            return False
+        self.state = OBJECT_KEY
+        return True
+
+    def step_array_item(self, char: str, items: List[Tuple[str, Any]]) -> bool:
+        """Emit the next array element, or leave the array at its end."""
+        if char in ",]":
+            self.pos += 1
+            if char == "]":
+                self.state = OBJECT_KEY if self.in_object else DONE
+            return True
+        complete, item = self.decode_value()
+        if not complete:
+            return False
+        items.append((self.key, item))
+        return True
+
+
+async def iter_json_items(
+    chunks: AsyncIterable[bytes], keys: Optional[Iterable[str]] = None
+) -> AsyncIterator[Tuple[str, Any]]:
+    """Yield (key, element) pairs from a streamed JSON document as soon as each element is complete."""
+    parser = JsonArrayStreamParser(keys)
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    async for chunk in chunks:
+        with profile_phase("decode"):
+            items = parser.feed(decoder.decode(chunk))
+        for item in items:
+            yield item
+    for item in parser.feed(decoder.decode(b"", final=True)):
+        yield item
+    for item in parser.close():
+        yield item
+
+
+async def aiter_chunks(body: bytes, chunk_size: int = 65536) -> AsyncIterator[bytes]:
+    """Yield an in-memory body in chunks, like a streamed response."""
+    for start in range(0, len(body), chunk_size):
+        yield body[start : start + chunk_size]
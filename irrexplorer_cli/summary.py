@@ -0,0 +1,170 @@
+"""Aggregate statistics over many prefixes, computed on columns of their fields."""
+
+import array
+import collections
+import importlib.util
+import logging
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Sequence
+
+from pydantic import BaseModel
+
+from irrexplorer_cli.models import PrefixInfo
+
+logger = logging.getLogger(__name__)
+
+WIDTHS = {4: 32, 6: 128}
+
+
+def numpy_available() -> bool:
+    """Check whether the optional NumPy dependency is installed."""
+    return importlib.util.find_spec("numpy") is not None
+
+
+class EncodedColumn:  # pylint: disable=too-few-public-methods
+    """Column of strings stored as integer codes into the list of distinct values."""
+
+    def __init__(self) -> None:
+        """Initialize an empty column."""
+        self.values: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.codes = array.array("i")
+
+    def append(self, value: str) -> None:
+        """Append a value, encoding it."""
+        code = self.index.get(value)
+        if code is None:
+            code = self.index[value] = len(self.values)
+            self.values.append(value)
+        self.codes.append(code)
+
+
+class PrefixColumns:  # pylint: disable=too-few-public-methods
+    """Fields of many prefixes, one typed array per field.
+
+    The arrays hold machine integers, so NumPy can use them without copying.
+    """
+
+    def __init__(self, infos: Iterable[PrefixInfo]) -> None:
+        """Load the summarized fields of every prefix."""
+        self.length = array.array("h")
+        self.version = array.array("b")
+        self.origins = array.array("i")
+        # whether a BGP origin has no IRR route object for the prefix
+        self.mismatch = array.array("b")
+        self.category = EncodedColumn()
+        self.rir = EncodedColumn()
+        self.rpki = EncodedColumn()
+        for info in infos:
+            address, _, length = info.prefix.partition("/")
+            version = 6 if ":" in address else 4
+            self.version.append(version)
+            self.length.append(int(length) if length.isdigit() else WIDTHS[version])
+            self.origins.append(len(info.bgpOrigins))
+            irr_asns = {route.asn for routes in info.irrRoutes.values() for route in routes}
+            self.mismatch.append(any(origin not in irr_asns for origin in info.bgpOrigins))
+            self.category.append(info.categoryOverall)
+            self.rir.append(info.rir)
+            self.rpki.append(info.rpkiRoutes[0].rpkiStatus if info.rpkiRoutes else "NOT_FOUND")
+
+    def __len__(self) -> int:
+        """Return the number of prefixes."""
+        return len(self.length)
+
+
+class Summary(BaseModel):
+    """Aggregate statistics of a set of prefixes."""
+
+    prefixes: int
+    categories: Dict[str, int]
+    rpki_by_rir: Dict[str, Dict[str, int]]
+    bgp_originated: int
+    irr_mismatches: int
+    irr_mismatch_rate: float
+    prefix_lengths: Dict[str, Dict[int, int]]
+
+
+class Counts(NamedTuple):
+    """Counts computed over the columns, indexed by value code; NumPy arrays or lists."""
+
+    categories: Sequence[int]
+    rpki_by_rir: Sequence[Sequence[int]]
+    originated: int
+    mismatches: int
+    lengths: Mapping[int, Sequence[int]]
+
+
+def build_summary(columns: PrefixColumns, counts: Counts) -> Summary:
+    """Label the counts computed over the columns with the values they count."""
+    originated, mismatches = int(counts.originated), int(counts.mismatches)
+    return Summary(
+        prefixes=len(columns),
+        categories={name: int(counts.categories[code]) for name, code in sorted(columns.category.index.items())},
+        rpki_by_rir={
+            rir: {
+                status: int(counts.rpki_by_rir[rir_code][code]) for status, code in sorted(columns.rpki.index.items())
+            }
+            for rir, rir_code in sorted(columns.rir.index.items())
+        },
+        bgp_originated=originated,
+        irr_mismatches=mismatches,
+        irr_mismatch_rate=mismatches / originated if originated else 0.0,
+        prefix_lengths={
+            f"IPv{version}": {length: int(count) for length, count in enumerate(histogram) if count}
+            for version, histogram in counts.lengths.items()
+        },
+    )
+
+
+def summarize_numpy(columns: PrefixColumns) -> Summary:
+    """Compute the summary with one vectorized pass per statistic."""
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    length = np.frombuffer(columns.length, dtype=np.int16)
+    version = np.frombuffer(columns.version, dtype=np.int8)
+    origins = np.frombuffer(columns.origins, dtype=np.intc)
+    mismatch = np.frombuffer(columns.mismatch, dtype=np.int8)
+    rir = np.frombuffer(columns.rir.codes, dtype=np.intc)
+    rpki = np.frombuffer(columns.rpki.codes, dtype=np.intc)
+    statuses = len(columns.rpki.values)
+
+    return build_summary(
+        columns,
+        Counts(
+            np.bincount(np.frombuffer(columns.category.codes, dtype=np.intc), minlength=len(columns.category.values)),
+            np.bincount(rir * statuses + rpki, minlength=len(columns.rir.values) * statuses).reshape(-1, statuses),
+            np.count_nonzero(origins),
+            np.count_nonzero(mismatch),
+            {v: np.bincount(length[version == v], minlength=width + 1) for v, width in WIDTHS.items()},
+        ),
+    )
+
+
+def summarize_python(columns: PrefixColumns) -> Summary:
+    """Compute the summary with counters, when NumPy is not installed."""
+    categories = collections.Counter(columns.category.codes)
+    pairs = collections.Counter(zip(columns.rir.codes, columns.rpki.codes, strict=True))
+    lengths = {version: [0] * (width + 1) for version, width in WIDTHS.items()}
+    for version, length in zip(columns.version, columns.length, strict=True):
+        lengths[version][length] += 1
+    return build_summary(
+        columns,
+        Counts(
+            [categories[code] for code in range(len(columns.category.values))],
+            [
+                [pairs[rir, status] for status in range(len(columns.rpki.values))]
+                for rir in range(len(columns.rir.values))
+            ],
+            sum(1 for count in columns.origins if count),
+            sum(columns.mismatch),
+            lengths,
+        ),
+    )
+
+
+def summarize(infos: Iterable[PrefixInfo]) -> Summary:
+    """Compute category counts, RPKI status per RIR, IRR/BGP origin mismatches and prefix length histograms."""
+    columns = PrefixColumns(infos)
+    if columns and numpy_available():
+        return summarize_numpy(columns)
+    logger.debug("Summarizing %d prefixes without NumPy", len(columns))
+    return summarize_python(columns)
@@ -0,0 +1,121 @@
+"""Change detection between successive polls of the same query."""
+
+import json
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from pydantic import BaseModel
+from rich.text import Text
+
+from irrexplorer_cli.models import BaseRoute, PrefixInfo
+
+logger = logging.getLogger(__name__)
+
+# prefix, IRR database ("" for the prefix itself, "RPKI" for ROAs) and rpslPk ("" for the prefix itself)
+RecordKey = Tuple[str, str, str]
+RecordFields = Tuple[object, ...]
+
+PREFIX_FIELDS = ("categoryOverall", "rir", "bgpOrigins")
+ROUTE_FIELDS = ("asn", "rpkiStatus", "rpkiMaxLength")
+CHANGE_STYLES = {"added": "green", "removed": "red", "changed": "yellow"}
+CHANGE_MARKS = {"added": "+", "removed": "-", "changed": "~"}
+
+
+class Change(BaseModel):
+    """A prefix, IRR route or ROA added, removed or changed since the previous poll."""
+
+    change: str
+    prefix: str
+    source: str
+    rpslPk: str
+    old: Dict[str, object]
+    new: Dict[str, object]
+
+    def text(self) -> Text:
+        """Format the change as one styled line."""
+        label = " ".join(part for part in (self.prefix, self.source, self.rpslPk) if part)
+        if self.change == "changed":
+            details = ", ".join(f"{field} {self.old[field]} -> {self.new[field]}" for field in self.new)
+        else:
+            details = ", ".join(f"{field} {value}" for field, value in (self.new or self.old).items())
+        return Text(f"{CHANGE_MARKS[self.change]} {label}: {details}", style=CHANGE_STYLES[self.change])
+
+    def ndjson(self) -> str:
+        """Format the change as an NDJSON record."""
+        return json.dumps(self.model_dump(), separators=(",", ":"))
+
+
+def route_fields(route: BaseRoute) -> RecordFields:
+    """Return the compared fields of an IRR route or ROA."""
+    return route.asn, route.rpkiStatus, route.rpkiMaxLength
+
+
+def records(infos: Iterable[PrefixInfo]) -> Iterable[Tuple[RecordKey, RecordFields]]:
+    """Yield the compared fields of every prefix, IRR route and ROA, keyed by prefix, database and rpslPk."""
+    for info in infos:
+        yield (info.prefix, "", ""), (info.categoryOverall, info.rir, tuple(info.bgpOrigins))
+        for database, routes in info.irrRoutes.items():
+            for route in routes:
+                yield (info.prefix, database, route.rpslPk), route_fields(route)
+        for roa in info.rpkiRoutes:
+            yield (info.prefix, "RPKI", roa.rpslPk), route_fields(roa)
+
+
+def field_names(key: RecordKey) -> Tuple[str, ...]:
+    """Return the names of the compared fields of a record."""
+    return ROUTE_FIELDS if key[1] else PREFIX_FIELDS
+
+
+def named(key: RecordKey, fields: RecordFields) -> Dict[str, object]:
+    """Return the compared fields of a record by name."""
+    return dict(zip(field_names(key), fields, strict=True))
+
+
+def change(kind: str, key: RecordKey, old: Dict[str, object], new: Dict[str, object]) -> Change:
+    """Create a change of a record."""
+    return Change(change=kind, prefix=key[0], source=key[1], rpslPk=key[2], old=old, new=new)
+
+
+class WatchState:
+    """Digests of every record seen in the previous poll.
+
+    Each record keeps a hash of its compared fields next to the fields, so an unchanged record costs one
+    integer comparison and only changed records are formatted.
+    """
+
+    def __init__(self) -> None:
+        """Initialize with no previous poll."""
+        self.digests: Optional[Dict[RecordKey, Tuple[int, RecordFields]]] = None
+
+    @property
+    def size(self) -> int:
+        """Return the number of records in the previous poll."""
+        return len(self.digests or {})
+
+    def update(self, infos: Iterable[PrefixInfo]) -> List[Change]:
+        """Record a new poll, returning what changed since the previous one (nothing for the first poll)."""
+        digests = {key: (hash(fields), fields) for key, fields in records(infos)}
+        previous, self.digests = self.digests, digests
+        if previous is None:
+            return []
+
+        changes: List[Change] = []
+        for key, (digest, fields) in digests.items():
+            old = previous.pop(key, None)
+            if old is None:
+                changes.append(change("added", key, {}, named(key, fields)))
+            elif old[0] != digest:
+                before, after = named(key, old[1]), named(key, fields)
+                changed = [field for field in after if before[field] != after[field]]
+                changes.append(
+                    change(
+                        "changed",
+                        key,
+                        {field: before[field] for field in changed},
+                        {field: after[field] for field in changed},
+                    )
+                )
+        # whatever is left of the previous poll is gone
+        changes.extend(change("removed", key, named(key, fields), {}) for key, (_, fields) in previous.items())
+        logger.debug("%d changes in a poll of %d records", len(changes), len(digests))
+        return changes
@@ -0,0 +1,25 @@
+"""Shared pytest configuration."""
+
+from pathlib import Path
+
+import pytest
+
+from irrexplorer_cli.deadline import reset_partial
+from irrexplorer_cli.retry import configure_retry_budget
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Keep the on-disk response cache and daemon socket out of the user's directories."""
+    cache_home = tmp_path / "cache"
+    monkeypatch.setenv("XDG_CACHE_HOME", str(cache_home))
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path / "run"))
+    monkeypatch.delenv("IRREXPLORER_SOCKET", raising=False)
+    return cache_home
+
+
+@pytest.fixture(autouse=True)
+def fresh_retry_budget() -> None:
+    """Give every test its own process-wide retry budget."""
+    configure_retry_budget(0.1)
+    reset_partial()
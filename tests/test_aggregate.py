@@ -0,0 +1,103 @@
+"""Test suite for prefix aggregation."""
+
+import asyncio
+import ipaddress
+import json
+import random
+from typing import Any, Dict
+from unittest.mock import patch
+
+import httpx
+import pytest
+import respx
+from typer.testing import CliRunner
+
+from irrexplorer_cli.aggregate import Aggregate, aggregate_prefixes
+from irrexplorer_cli.config import ClientConfig
+from irrexplorer_cli.main import app
+from irrexplorer_cli.queries import async_aggregate_query
+from tests.fixtures import create_basic_prefix_info
+
+
+def test_aggregate_prefixes() -> None:
+    """Test adjacent and nested prefixes merge, per address family, counting the prefixes each covers."""
+    prefixes = [
+        "2001:db8:1::/48",
+        "10.0.1.0/24",
+        "10.0.0.0/24",
+        "10.0.0.0/25",
+        "10.0.2.0/23",
+        "10.0.5.0/24",
+        "2001:db8::/48",
+        "not-a-prefix",
+    ]
+    assert aggregate_prefixes(prefixes) == [
+        Aggregate(prefix="10.0.0.0/22", count=4),
+        Aggregate(prefix="10.0.5.0/24", count=1),
+        Aggregate(prefix="2001:db8::/47", count=2),
+    ]
+
+
+def test_aggregate_matches_ipaddress() -> None:
+    """Test aggregation gives the same prefixes as ipaddress.collapse_addresses."""
+    rng = random.Random(2111)
+    networks = [
+        ipaddress.IPv4Network((rng.getrandbits(20) << 12, length), strict=False)
+        for length in (rng.randint(14, 24) for _ in range(500))
+    ]
+    aggregates = aggregate_prefixes(str(network) for network in networks)
+    assert [aggregate.prefix for aggregate in aggregates] == [
+        str(network) for network in ipaddress.collapse_addresses(networks)
+    ]
+    assert sum(aggregate.count for aggregate in aggregates) == len(networks)
+
+
+@pytest.mark.asyncio
+async def test_aggregate_query_csv(capsys: pytest.CaptureFixture[str]) -> None:
+    """Test the aggregate query prints one CSV row per aggregate and nothing for an AS without prefixes."""
+    direct = [create_basic_prefix_info(prefix=prefix).model_dump() for prefix in ("192.0.2.0/25", "192.0.2.128/25")]
+    with respx.mock:
+        respx.get("https://example.com/api/prefixes/asn/AS64496").mock(
+            return_value=httpx.Response(200, json={"directOrigin": direct, "overlaps": []})
+        )
+        respx.get("https://example.com/api/prefixes/asn/AS64497").mock(
+            return_value=httpx.Response(200, json={"directOrigin": [], "overlaps": []})
+        )
+        await async_aggregate_query(["AS64497", "AS64496"], "csv", "https://example.com", config=ClientConfig())
+    assert capsys.readouterr().out == "ASN,Prefix,Count\nAS64496,192.0.2.0/24,2\n"
+
+
+@pytest.mark.asyncio
+async def test_aggregate_query_json_keeps_input_order(capsys: pytest.CaptureFixture[str]) -> None:
+    """Test the JSON document lists AS numbers in input order, whichever finishes first."""
+    direct = [create_basic_prefix_info(prefix="192.0.2.0/24").model_dump()]
+
+    async def fetch_asn_info(as_number: str) -> Dict[str, Any]:
+        await asyncio.sleep(0.05 if as_number == "AS64496" else 0)
+        return {"directOrigin": direct, "overlaps": []}
+
+    with patch("irrexplorer_cli.irrexplorer.IrrExplorer.fetch_asn_info", side_effect=fetch_asn_info):
+        await async_aggregate_query(["AS64496", "AS64497"], "json", config=ClientConfig())
+    assert list(json.loads(capsys.readouterr().out)) == ["AS64496", "AS64497"]
+
+
+def test_aggregate_option() -> None:
+    """Test --aggregate runs the aggregate query and rejects --watch, --summary, --output and the columnar formats."""
+    runner = CliRunner()
+    with patch("irrexplorer_cli.queries.async_aggregate_query", return_value=None) as mock_query:
+        result = runner.invoke(app, ["asn", "64496", "--aggregate", "--format", "json"])
+    assert not result.exit_code
+    mock_query.assert_called_once_with(["AS64496"], "json", None, 10, ClientConfig(cache=True))
+
+    result = runner.invoke(app, ["asn", "AS64496", "--aggregate", "--watch", "60"])
+    assert result.exit_code == 1
+    assert "--aggregate cannot be combined with --watch" in result.stdout
+
+    result = runner.invoke(app, ["asn", "AS64496", "--aggregate", "--format", "parquet"])
+    assert result.exit_code == 1
+    assert "--aggregate does not support parquet output" in result.stdout
+
+    for options in (["--summary"], ["--output", "sqlite:out.sqlite3"]):
+        result = runner.invoke(app, ["asn", "AS64496", "--aggregate", *options])
+        assert result.exit_code == 1
+        assert f"Error: --aggregate and {options[0]} cannot be combined" in result.stdout
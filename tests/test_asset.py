@@ -0,0 +1,141 @@
+"""Test suite for AS set expansion."""
+
+import json
+from typing import Any, Dict, List
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+import respx
+from typer.testing import CliRunner
+
+from irrexplorer_cli.asset import AsSetExpansion, SetExpander
+from irrexplorer_cli.config import ClientConfig
+from irrexplorer_cli.irrexplorer import IrrDisplay, IrrExplorer
+from irrexplorer_cli.main import app
+from irrexplorer_cli.queries import async_asset_query, print_asset_expansion
+
+BASE_URL = "https://example.com"
+
+
+def expansion(name: str, depth: int, members: List[str]) -> Dict[str, Any]:
+    """Create an API set expansion entry."""
+    return {"name": name, "source": "RIPE", "depth": depth, "path": [name], "members": members}
+
+
+def mock_sets(sets: Dict[str, List[Dict[str, Any]]]) -> Dict[str, respx.Route]:
+    """Mock the set expansion endpoint for each set."""
+    return {
+        name: respx.get(f"{BASE_URL}/api/sets/expand/{name}").mock(return_value=httpx.Response(200, json=entries))
+        for name, entries in sets.items()
+    }
+
+
+@pytest.mark.asyncio
+async def test_expand_requests_only_sets_missing_from_the_memo() -> None:
+    """Test nested sets in a response are not requested again, cycles end, and missing sets are reported."""
+    explorer = IrrExplorer(base_url=BASE_URL, config=ClientConfig())
+    with respx.mock:
+        routes = mock_sets(
+            {
+                "AS-ROOT": [
+                    expansion("AS-ROOT", 0, ["AS1", "AS-A", "as-b"]),
+                    expansion("AS-A", 1, ["AS2", "AS-C", "AS1"]),
+                ],
+                "AS-B": [expansion("AS-B", 0, ["AS3", "AS-ROOT", "AS-GONE"])],
+                "AS-C": [expansion("AS-C", 0, ["AS4", "AS-A"])],
+                "AS-GONE": [],
+            }
+        )
+        result = await SetExpander(explorer, concurrency=4).expand("as-root")
+    await explorer.close()
+
+    assert result.asns == [1, 2, 3, 4]
+    assert result.sets == {"AS-A": 1, "AS-B": 1, "AS-C": 2, "AS-GONE": 2}
+    assert result.missing == ["AS-GONE"]
+    assert sorted(result.cycles) == [("AS-B", "AS-ROOT"), ("AS-C", "AS-A")]
+    assert result.requests == 4
+    assert all(route.call_count == 1 for route in routes.values())
+
+
+@pytest.mark.asyncio
+async def test_direct_members_and_failures() -> None:
+    """Test without expansion only the set's own members are listed, and failed sets are reported."""
+    explorer = IrrExplorer(base_url=BASE_URL, config=ClientConfig())
+    with respx.mock:
+        mock_sets({"AS-ROOT": [expansion("AS-ROOT", 0, ["AS1", "AS-A"]), expansion("AS-A", 1, ["AS2"])]})
+        respx.get(f"{BASE_URL}/api/sets/expand/AS-BROKEN").mock(return_value=httpx.Response(400))
+        expander = SetExpander(explorer)
+        direct = await expander.direct_members("AS-ROOT")
+        broken = await expander.direct_members("AS-BROKEN")
+    await explorer.close()
+
+    assert direct.asns == [1]
+    assert direct.sets == {"AS-A": 1}
+    assert broken.failed == ["AS-BROKEN"]
+    assert not broken.missing
+
+
+@pytest.mark.asyncio
+async def test_set_expansion_retries_only_transient_errors() -> None:
+    """Test a missing set is requested once, while a server error is retried."""
+    explorer = IrrExplorer(base_url=BASE_URL, config=ClientConfig())
+    with respx.mock, patch("asyncio.sleep", AsyncMock()):
+        missing = respx.get(f"{BASE_URL}/api/sets/expand/AS-GONE").mock(return_value=httpx.Response(404))
+        busy = respx.get(f"{BASE_URL}/api/sets/expand/AS-ROOT").mock(
+            side_effect=[httpx.Response(503), httpx.Response(200, json=[expansion("AS-ROOT", 0, ["AS1"])])]
+        )
+        with pytest.raises(httpx.HTTPStatusError):
+            await explorer.fetch_set_expansion("AS-GONE")
+        entries = await explorer.fetch_set_expansion("AS-ROOT")
+    await explorer.close()
+
+    assert missing.call_count == 1
+    assert busy.call_count == 2
+    assert [entry.members for entry in entries] == [["AS1"]]
+
+
+@pytest.mark.asyncio
+async def test_asset_query(capsys: pytest.CaptureFixture[str]) -> None:
+    """Test the asset query lists the set's own members, and resolves nested sets with a concurrency."""
+    with respx.mock:
+        mock_sets(
+            {
+                "AS-ROOT": [expansion("AS-ROOT", 0, ["AS1", "AS-A"]), expansion("AS-A", 1, ["AS2"])],
+                "AS-A": [expansion("AS-A", 0, ["AS2"])],
+            }
+        )
+        await async_asset_query("AS-ROOT", "csv", BASE_URL, config=ClientConfig())
+        await async_asset_query("AS-ROOT", "ndjson", BASE_URL, 2, ClientConfig())
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[:3] == ["Type,Set,Member,Depth", "ASN,AS-ROOT,AS1,", "SET,AS-ROOT,AS-A,1"]
+    assert [json.loads(line)["asn"] for line in lines[3:5]] == [1, 2]
+
+
+def test_asset_csv_skips_empty_sections(capsys: pytest.CaptureFixture[str]) -> None:
+    """Test the CSV output has no empty lines when a set has no member AS numbers or nested sets."""
+    empty = AsSetExpansion(name="AS-EMPTY", asns=[], sets={}, missing=[], failed=[], cycles=[], requests=1)
+    print_asset_expansion(IrrDisplay(), empty, "csv")
+    print_asset_expansion(IrrDisplay(), empty.model_copy(update={"sets": {"AS-A": 1}}), "csv")
+    assert capsys.readouterr().out == "Type,Set,Member,Depth\nType,Set,Member,Depth\nSET,AS-EMPTY,AS-A,1\n"
+
+
+def test_asset_command() -> None:
+    """Test the asset command validates the set name and passes its options on."""
+    runner = CliRunner()
+    with patch("irrexplorer_cli.queries.async_asset_query", return_value=None) as mock_query:
+        result = runner.invoke(app, ["asset", "AS2111:AS-CUSTOMERS", "--expand", "-c", "20", "--format", "json"])
+        assert not result.exit_code
+        mock_query.assert_called_once_with("AS2111:AS-CUSTOMERS", "json", None, 20, ClientConfig(cache=True))
+        runner.invoke(app, ["asset", "AS-NLNOG", "-c", "20"])
+        mock_query.assert_called_with("AS-NLNOG", None, None, None, ClientConfig(cache=True))
+
+    result = runner.invoke(app, ["asset", "AS2111"])
+    assert result.exit_code == 1
+    assert "Invalid AS set format" in result.stdout
+
+    with patch("irrexplorer_cli.queries.async_asset_query", return_value=None) as mock_query:
+        result = runner.invoke(app, ["asset", "AS-NLNOG", "--format", "parquet"])
+    assert result.exit_code == 2
+    assert "Invalid value for '--format'" in result.output
+    mock_query.assert_not_called()
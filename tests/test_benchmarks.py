@@ -0,0 +1,42 @@
+"""Smoke tests keeping the benchmark suite runnable."""
+
+import json
+import urllib.request
+
+from benchmarks import bench_e2e, bench_micro
+from benchmarks.__main__ import find_regressions
+from benchmarks.payloads import prefix_payload
+from benchmarks.server import api_routes, serve
+from benchmarks.timing import BenchResult
+from irrexplorer_cli.models import decode_prefix_infos
+
+
+def test_payload_matches_model() -> None:
+    """Test synthetic payloads validate as prefix information."""
+    infos = decode_prefix_infos(prefix_payload(3))
+    assert [info.prefix for info in infos] == ["10.0.0.0/24", "10.0.1.0/24", "10.0.2.0/24"]
+
+
+def test_stand_in_server_routes() -> None:
+    """Test the stand-in server answers API paths and 404s unknown paths."""
+    with serve(api_routes(2)) as server:
+        with urllib.request.urlopen(f"{server.base_url}/api/sets/member-of/AS64496") as response:
+            assert "setsPerIrr" in json.loads(response.read())
+        assert server.lookup("/api/prefixes/asn/AS1") == server.routes["/api/prefixes/asn/"]
+        assert server.lookup("/unknown") is None
+
+
+def test_suites_run() -> None:
+    """Test every benchmark case runs on a tiny payload."""
+    micro = bench_micro.run([1], repeat=1)
+    e2e = bench_e2e.run([1], repeat=1)
+    assert len(micro) == 3
+    assert len(e2e) == 8
+    assert all(result.seconds > 0 for result in micro + e2e)
+
+
+def test_find_regressions() -> None:
+    """Test only cases slower than the threshold are reported."""
+    baseline = [BenchResult(name="a", size=1, seconds=1.0), BenchResult(name="b", size=1, seconds=1.0)]
+    results = [BenchResult(name="a", size=1, seconds=1.1), BenchResult(name="b", size=1, seconds=1.5)]
+    assert find_regressions(results, baseline, 0.2) == ["b [1]: 1.0000s -> 1.5000s (+50%)"]
@@ -0,0 +1,109 @@
+"""Test suite for the on-disk response cache."""
+
+from pathlib import Path
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from irrexplorer_cli.cache import ResponseCache, default_cache_dir
+from irrexplorer_cli.config import ClientConfig
+from irrexplorer_cli.irrexplorer import IrrExplorer
+
+PREFIX_URL = "https://example.com/api/prefixes/prefix/192.0.2.0/24"
+SETS_URL = "https://example.com/api/sets/member-of/AS12345"
+
+
+def test_default_cache_dir(isolated_cache_dir: Path) -> None:
+    """Test cache directory honours XDG_CACHE_HOME."""
+    assert default_cache_dir() == isolated_cache_dir / "irrexplorer-cli"
+
+
+def test_cache_roundtrip(tmp_path: Path) -> None:
+    """Test stored bodies are returned until they expire."""
+    cache = ResponseCache(tmp_path / "cache.sqlite3")
+    assert cache.get(PREFIX_URL) is None
+    cache.set(PREFIX_URL, b"[]")
+    assert cache.get(PREFIX_URL) == b"[]"
+
+    stored_at = cache.db.execute("SELECT stored_at FROM responses").fetchone()[0]
+    with patch("irrexplorer_cli.cache.time.time", return_value=stored_at + 301):
+        assert cache.get(PREFIX_URL) is None
+    assert not cache.db.execute("SELECT key FROM responses").fetchall()
+    cache.close()
+
+
+def test_cache_endpoint_ttls(tmp_path: Path) -> None:
+    """Test TTLs depend on the endpoint unless overridden."""
+    cache = ResponseCache(tmp_path / "cache.sqlite3")
+    assert cache.ttl_for(PREFIX_URL) == 300.0
+    assert cache.ttl_for(SETS_URL) == 900.0
+    assert cache.ttl_for("https://example.com/api/other") == 300.0
+    assert ResponseCache(tmp_path / "cache.sqlite3", ttl=5.0).ttl_for(SETS_URL) == 5.0
+
+
+def test_cache_lru_eviction(tmp_path: Path) -> None:
+    """Test least recently used entries are evicted above the size cap."""
+    cache = ResponseCache(tmp_path / "cache.sqlite3", max_bytes=10)
+    with patch("irrexplorer_cli.cache.time.time", side_effect=[1.0, 2.0, 3.0, 4.0]):
+        cache.set("a", b"1234")
+        cache.set("b", b"1234")
+        assert cache.get("a") == b"1234"
+        cache.set("c", b"1234")
+    assert cache.db.execute("SELECT key FROM responses ORDER BY key").fetchall() == [("a",), ("c",)]
+
+    cache.set("huge", b"x" * 11)
+    assert cache.get("huge") is None
+    cache.clear()
+    assert cache.get("a") is None
+    cache.close()
+
+
+def test_cache_unavailable(tmp_path: Path) -> None:
+    """Test an unusable cache location behaves like a cache miss."""
+    blocker = tmp_path / "blocker"
+    blocker.write_text("")
+    cache = ResponseCache(blocker / "cache.sqlite3")
+    cache.set(PREFIX_URL, b"[]")
+    assert cache.get(PREFIX_URL) is None
+
+
+@pytest.mark.asyncio
+async def test_explorer_answers_from_cache() -> None:
+    """Test repeated fetches are served from the cache."""
+    explorer = IrrExplorer(base_url="https://example.com", config=ClientConfig(cache=True))
+    response = httpx.Response(200, json={"setsPerIrr": {"RIPE": ["AS-TEST"]}}, request=httpx.Request("GET", SETS_URL))
+
+    with patch.object(explorer.client, "get", return_value=response) as mock_get:
+        first = await explorer.fetch_asn_sets("AS12345")
+        second = await explorer.fetch_asn_sets("AS12345")
+        assert first == second == {"setsPerIrr": {"RIPE": ["AS-TEST"]}}
+        mock_get.assert_called_once_with(SETS_URL)
+    await explorer.close()
+
+
+def test_cache_insert_cost_is_constant(tmp_path: Path) -> None:
+    """Test an insert costs about the same in a full cache as in an empty one, counted in SQLite VM steps."""
+    cache = ResponseCache(tmp_path / "cache.sqlite3", max_bytes=2000 * 2048)
+    steps = 0
+
+    def count_step() -> int:
+        nonlocal steps
+        steps += 1
+        return 0
+
+    def insert_steps(first: int, count: int) -> int:
+        nonlocal steps
+        steps = 0
+        for number in range(first, first + count):
+            cache.set(f"https://example.com/{number}", b"x" * 2048)
+        return steps
+
+    cache.db.set_progress_handler(count_step, 10)
+    empty = insert_steps(0, 200)
+    insert_steps(200, 1800)
+    # the cache is full now, so these inserts also evict
+    full = insert_steps(2000, 200)
+    assert cache.size() <= 2000 * 2048
+    assert full < empty * 2
+    cache.close()
@@ -6,6 +6,7 @@ import httpx
 import pytest
 from typer.testing import CliRunner
 
+from irrexplorer_cli.config import ClientConfig
 from irrexplorer_cli.irrexplorer import IrrExplorer
 from irrexplorer_cli.main import app
 
@@ -105,7 +106,7 @@ def test_format_option() -> None:
 
 def test_asn_query_command() -> None:
     """Test ASN query command execution."""
-    with patch("irrexplorer_cli.main.async_asn_query", return_value=None) as mock_query:
+    with patch("irrexplorer_cli.queries.async_asn_query", return_value=None) as mock_query:
         result = runner.invoke(app, ["asn", "AS202196"])
         assert not result.exit_code
-        mock_query.assert_called_once_with("AS202196", None, None)
+        mock_query.assert_called_once_with("AS202196", None, None, ClientConfig(cache=True))
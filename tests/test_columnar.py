@@ -0,0 +1,102 @@
+"""Test suite for Parquet and Arrow output."""
+
+import importlib.util
+import io
+from pathlib import Path
+from unittest.mock import patch
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from typer.testing import CliRunner
+
+from irrexplorer_cli.columnar import ColumnarWriter, ListColumn, pyarrow_available
+from irrexplorer_cli.config import ClientConfig
+from irrexplorer_cli.main import app
+from irrexplorer_cli.queries import async_columnar_query
+from tests.fixtures import COMMON_RPKI_ROUTE, create_basic_prefix_info
+
+INFO = create_basic_prefix_info(
+    irrRoutes={"RIPE": [COMMON_RPKI_ROUTE], "RADB": [{**COMMON_RPKI_ROUTE, "asn": 64496, "rpkiMaxLength": None}]},
+    messages=[{"text": "Expected route object in RIPE", "category": "danger"}],
+)
+
+
+def test_list_column() -> None:
+    """Test lists of structs are buffered as one flat list per field and the row offsets."""
+    column = ListColumn(("database", "asn", "rpkiMaxLength"))
+    for database, routes in INFO.irrRoutes.items():
+        column.extend(routes, database=database)
+    column.end_row()
+    column.end_row()
+    assert column.offsets == [0, 2, 2]
+    assert column.fields == {"database": ["RIPE", "RADB"], "asn": [12345, 64496], "rpkiMaxLength": [24, None]}
+
+    column = ListColumn()
+    column.extend(INFO.bgpOrigins)
+    column.end_row()
+    assert (column.values, column.offsets) == (INFO.bgpOrigins, [0, len(INFO.bgpOrigins)])
+
+
+def test_pyarrow_available() -> None:
+    """Test the optional PyArrow dependency is detected."""
+    assert pyarrow_available() == (importlib.util.find_spec("pyarrow") is not None)
+
+
+@pytest.mark.parametrize("output_format", ["parquet", "arrow"])
+def test_columnar_writer(output_format: str) -> None:
+    """Test rows are written in row groups as typed and nested columns."""
+    sink = io.BytesIO()
+    writer = ColumnarWriter(sink, output_format, row_group_size=2)
+    for _ in range(5):
+        writer.add("DIRECT", "AS12345", INFO)
+    writer.close()
+
+    sink.seek(0)
+    if output_format == "parquet":
+        parquet = pq.ParquetFile(sink)
+        assert parquet.num_row_groups == 3
+        table = parquet.read()
+    else:
+        reader = pa.ipc.open_file(sink)
+        assert reader.num_record_batches == 3
+        table = reader.read_all()
+    assert table.num_rows == 5
+    assert table.schema.field("bgpOrigins").type == pa.list_(pa.int64())
+    assert table.column("irrRoutes")[0].as_py()[1] == {"database": "RADB", **INFO.irrRoutes["RADB"][0].model_dump()}
+    assert table.column("messages")[4].as_py() == [message.model_dump() for message in INFO.messages]
+
+
+@pytest.mark.asyncio
+async def test_columnar_query_writes_file(tmp_path: Path) -> None:
+    """Test a columnar query writes a Parquet file that reads back as the queried prefix rows."""
+    path = tmp_path / "prefixes.parquet"
+    with (
+        path.open("wb") as sink,
+        patch("sys.stdout", io.TextIOWrapper(sink)),
+        patch("irrexplorer_cli.irrexplorer.IrrExplorer.fetch_prefix_info", side_effect=[[INFO], [INFO]]),
+    ):
+        await async_columnar_query(["192.0.2.0/24"], "parquet")
+
+    table = pq.read_table(path)
+    assert table.column("query").to_pylist() == ["192.0.2.0/24", "192.0.2.0/24"]
+    assert table.column("type").to_pylist() == ["DIRECT", "OVERLAP"]
+    assert table.column("prefix").to_pylist() == [INFO.prefix, INFO.prefix]
+    assert table.column("bgpOrigins").to_pylist() == [INFO.bgpOrigins, INFO.bgpOrigins]
+
+
+def test_columnar_option() -> None:
+    """Test --format parquet writes the columnar output and requires pyarrow."""
+    runner = CliRunner()
+    with (
+        patch("irrexplorer_cli.columnar.pyarrow_available", return_value=True),
+        patch("irrexplorer_cli.queries.async_columnar_query", return_value=None) as mock_query,
+    ):
+        result = runner.invoke(app, ["asn", "AS64496", "--format", "parquet"])
+    assert not result.exit_code
+    mock_query.assert_called_once_with(["AS64496"], "parquet", None, 10, ClientConfig(cache=True))
+
+    with patch("irrexplorer_cli.columnar.pyarrow_available", return_value=False):
+        result = runner.invoke(app, ["prefix", "192.0.2.0/24", "--format", "arrow"])
+    assert result.exit_code == 1
+    assert "--format arrow requires pyarrow" in result.stdout
@@ -0,0 +1,64 @@
+"""Test suite for the compact table view."""
+
+import io
+
+import pytest
+from rich.console import Console
+
+from irrexplorer_cli.compact import COLUMNS, FLUSH_ROWS, CompactTable, fit
+from tests.fixtures import create_basic_prefix_info
+
+
+def make_table() -> CompactTable:
+    """Create a compact table printing to an in-memory plain console."""
+    return CompactTable(Console(file=io.StringIO(), width=100, color_system=None))
+
+
+def output_lines(table: CompactTable) -> list[str]:
+    """Return the lines printed by a compact table."""
+    file = table.console.file
+    assert isinstance(file, io.StringIO)
+    return file.getvalue().splitlines()
+
+
+def test_fit_pads_and_truncates() -> None:
+    """Test cells are padded to their width and truncated with an ellipsis."""
+    assert fit("abc", 5) == "abc  "
+    assert fit("abcdefgh", 5) == "abcd…"
+
+
+def test_rows_aligned_with_header() -> None:
+    """Test each prefix is one row with columns aligned to the header."""
+    table = make_table()
+    table.add("DIRECT", create_basic_prefix_info(prefix="192.0.2.0/24", categoryOverall="warning"))
+    table.add("OVERLAP", create_basic_prefix_info(prefix="192.0.0.0/16"))
+    table.close()
+
+    header, rule, direct, overlap = output_lines(table)
+    assert header.split() == ["Type", "Prefix", "RIR", "Status", "RPKI", "Origins", "IRR", "Routes"]
+    assert set(rule) == {"─"}
+    assert direct.split()[:4] == ["DIRECT", "192.0.2.0/24", "RIPE", "warning"]
+    assert overlap.startswith("OVERLAP 192.0.0.0/16")
+    rir_offset = sum(width + 1 for _, width in COLUMNS[:2])
+    assert header.index("RIR") == direct.index("RIPE") == rir_offset
+
+
+def test_rows_printed_in_batches(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test queued rows are printed once a batch fills up, with a single header."""
+    monkeypatch.setattr("irrexplorer_cli.compact.FLUSH_SECONDS", 3600.0)
+    table = make_table()
+    info = create_basic_prefix_info()
+    for _ in range(FLUSH_ROWS):
+        table.add("DIRECT", info)
+    assert len(output_lines(table)) == FLUSH_ROWS + 2
+    table.add("DIRECT", info)
+    table.close()
+    assert len(output_lines(table)) == FLUSH_ROWS + 3
+    assert table.count == FLUSH_ROWS + 1
+
+
+def test_empty_table_notice() -> None:
+    """Test a table without rows prints a notice instead of a header."""
+    table = make_table()
+    table.close()
+    assert output_lines(table) == ["No prefix information found"]
@@ -0,0 +1,124 @@
+"""Test suite for the resident daemon."""
+
+import asyncio
+import contextlib
+from pathlib import Path
+from typing import AsyncIterator
+
+import httpx
+import pytest
+import respx
+
+from irrexplorer_cli.config import ClientConfig
+from irrexplorer_cli.daemon import Daemon, DaemonExplorer, daemon_listening, default_socket_path
+from irrexplorer_cli.queries import create_explorer
+from tests.fixtures import create_basic_prefix_info
+
+BASE_URL = "https://example.com"
+PREFIX_URL = f"{BASE_URL}/api/prefixes/prefix/192.0.2.0/24"
+
+
+@contextlib.asynccontextmanager
+async def running_daemon() -> AsyncIterator[Path]:
+    """Run a daemon on the default socket path for the duration of the block."""
+    path = default_socket_path()
+    server = asyncio.ensure_future(Daemon(ClientConfig(cache=True)).serve(path))
+    while not daemon_listening(path):
+        await asyncio.sleep(0.01)
+    try:
+        yield path
+    finally:
+        server.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await server
+    assert not path.exists()
+
+
+@pytest.mark.asyncio
+async def test_requests_share_the_daemon_cache() -> None:
+    """Test clients of separate invocations forward to the daemon, which answers repeats from its cache."""
+    info = create_basic_prefix_info(prefix="192.0.2.0/24")
+    with respx.mock:
+        route = respx.get(PREFIX_URL).mock(return_value=httpx.Response(200, json=[info.model_dump()]))
+        async with running_daemon():
+            for _ in range(2):
+                explorer = create_explorer(BASE_URL, ClientConfig(cache=True, prefix_index=False))
+                assert isinstance(explorer, DaemonExplorer)
+                assert await explorer.fetch_prefix_info("192.0.2.0/24") == [info]
+                await explorer.close()
+    assert route.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_no_cache_requests_skip_the_daemon_cache() -> None:
+    """Test a client without cache gets a fresh response through the daemon, and a TTL of 0 expires entries."""
+    info = create_basic_prefix_info(prefix="192.0.2.0/24")
+    with respx.mock:
+        route = respx.get(PREFIX_URL).mock(return_value=httpx.Response(200, json=[info.model_dump()]))
+        async with running_daemon():
+            for config in (
+                ClientConfig(cache=True, prefix_index=False),
+                ClientConfig(cache=False, prefix_index=False),
+                ClientConfig(cache=True, cache_ttl=0, prefix_index=False),
+            ):
+                explorer = create_explorer(BASE_URL, config)
+                assert isinstance(explorer, DaemonExplorer)
+                assert await explorer.fetch_prefix_info("192.0.2.0/24") == [info]
+                await explorer.close()
+                await asyncio.sleep(0.01)
+    assert route.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_connection_options_skip_the_daemon() -> None:
+    """Test clients with connection settings of their own send requests directly instead of to the daemon."""
+    async with running_daemon():
+        assert isinstance(create_explorer(BASE_URL, ClientConfig(cache=False)), DaemonExplorer)
+        for config in (ClientConfig(hedge=True), ClientConfig(max_connections=5), ClientConfig(http2=True)):
+            explorer = create_explorer(BASE_URL, config)
+            assert not isinstance(explorer, DaemonExplorer)
+            await explorer.close()
+
+
+@pytest.mark.asyncio
+async def test_daemon_passes_on_http_errors() -> None:
+    """Test an upstream error status reaches the client as an HTTP status error."""
+    with respx.mock:
+        respx.get(f"{BASE_URL}/api/sets/member-of/AS64496").mock(return_value=httpx.Response(404))
+        async with running_daemon() as path:
+            explorer = DaemonExplorer(path, BASE_URL, ClientConfig())
+            with pytest.raises(httpx.HTTPStatusError) as exc_info:
+                await explorer.send(f"{BASE_URL}/api/sets/member-of/AS64496")
+            await explorer.close()
+    assert exc_info.value.response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_requests_go_direct_without_daemon(tmp_path: Path) -> None:
+    """Test queries only use the daemon when one is listening, and fall back when it goes away."""
+    assert not isinstance(create_explorer(BASE_URL, ClientConfig()), DaemonExplorer)
+
+    explorer = DaemonExplorer(tmp_path / "gone.sock", BASE_URL, ClientConfig())
+    with respx.mock:
+        respx.get(PREFIX_URL).mock(return_value=httpx.Response(200, json=[]))
+        assert await explorer.fetch_prefix_info("192.0.2.0/24") == []
+    await explorer.close()
+    assert not explorer.forwarding
+
+
+@pytest.mark.asyncio
+async def test_daemon_passes_on_connect_errors() -> None:
+    """Test an upstream connection failure reaches the client as a connect error."""
+    with respx.mock:
+        respx.get(PREFIX_URL).mock(side_effect=httpx.ConnectError("Connection refused"))
+        async with running_daemon() as path:
+            explorer = DaemonExplorer(path, BASE_URL, ClientConfig())
+            with pytest.raises(httpx.ConnectError):
+                await explorer.send(PREFIX_URL)
+            await explorer.close()
+
+
+def test_socket_path_from_environment(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test IRREXPLORER_SOCKET overrides the default socket location."""
+    monkeypatch.setenv("IRREXPLORER_SOCKET", str(tmp_path / "elsewhere.sock"))
+    assert default_socket_path() == tmp_path / "elsewhere.sock"
@@ -0,0 +1,131 @@
+"""Test suite for the invocation deadline and partial results."""
+
+import asyncio
+import json
+import time
+from typing import Any, AsyncIterator
+from unittest.mock import patch
+
+import httpx
+import pytest
+import respx
+from typer.testing import CliRunner
+
+from irrexplorer_cli.config import ClientConfig
+from irrexplorer_cli.deadline import PARTIAL_EXIT_CODE, Deadline, mark_partial, partial_reasons
+from irrexplorer_cli.irrexplorer import IrrDisplay, IrrExplorer
+from irrexplorer_cli.main import app
+from irrexplorer_cli.queries import async_asn_query, leave_out_failure
+
+BASE_URL = "https://example.com"
+
+
+@pytest.mark.asyncio
+async def test_request_past_deadline_times_out() -> None:
+    """Test a request still running at the deadline fails like an httpx timeout, and later ones fail at once."""
+    deadline = Deadline(0.05)
+    with pytest.raises(httpx.TimeoutException):
+        async with deadline.request("https://example.com/slow"):
+            await asyncio.sleep(5)
+    started = time.monotonic()
+    with pytest.raises(httpx.TimeoutException, match="before requesting"):
+        async with deadline.request("https://example.com/next"):
+            pass
+    assert time.monotonic() - started < 0.05
+
+
+@pytest.mark.asyncio
+async def test_stream_chunks_past_deadline_time_out() -> None:
+    """Test a response stream stalling past the deadline fails after the chunks received so far."""
+
+    async def stalling() -> AsyncIterator[bytes]:
+        yield b"first"
+        await asyncio.sleep(5)
+        yield b"second"
+
+    received = []
+    with pytest.raises(httpx.TimeoutException):
+        async for chunk in Deadline(0.05).chunks(stalling(), "https://example.com/stream"):
+            received.append(chunk)
+    assert received == [b"first"]
+
+
+@pytest.mark.asyncio
+async def test_retry_waits_end_at_deadline() -> None:
+    """Test a backoff wait between retries ends at the deadline, after which the fetch is marked partial."""
+    explorer = IrrExplorer(base_url=BASE_URL, config=ClientConfig(deadline=0.3))
+    started = time.monotonic()
+    with respx.mock, patch("random.uniform", side_effect=lambda _, high: high):
+        respx.get(f"{BASE_URL}/api/sets/member-of/AS64496").mock(return_value=httpx.Response(503))
+        assert await explorer.fetch_asn_sets("AS64496") == {"setsPerIrr": {}}
+    await explorer.close()
+    assert time.monotonic() - started < 0.9
+    assert partial_reasons() == ["timed out fetching AS sets of AS64496"]
+
+
+@pytest.mark.asyncio
+async def test_fetch_past_deadline_is_marked_partial() -> None:
+    """Test a fetch cut short by the deadline returns no data and records the missing result."""
+    explorer = IrrExplorer(base_url=BASE_URL, config=ClientConfig(deadline=0.05))
+
+    async def respond(_: Any) -> httpx.Response:
+        await asyncio.sleep(5)
+        return httpx.Response(200, json=[])
+
+    started = time.monotonic()
+    with respx.mock:
+        respx.get(f"{BASE_URL}/api/prefixes/prefix/192.0.2.0/24").mock(side_effect=respond)
+        assert await explorer.fetch_prefix_info("192.0.2.0/24") == []
+    await explorer.close()
+
+    assert time.monotonic() - started < 1
+    assert partial_reasons() == ["timed out fetching prefix 192.0.2.0/24"]
+
+
+@pytest.mark.asyncio
+async def test_partial_json_stays_valid(capsys: pytest.CaptureFixture[str]) -> None:
+    """Test the timeout notice of a partial result goes to stderr, leaving the JSON and Rich results on stdout."""
+
+    async def respond(_: Any) -> httpx.Response:
+        await asyncio.sleep(5)
+        return httpx.Response(200, json={})
+
+    with respx.mock:
+        respx.get(f"{BASE_URL}/api/prefixes/asn/AS64496").mock(side_effect=respond)
+        respx.get(f"{BASE_URL}/api/sets/member-of/AS64496").mock(return_value=httpx.Response(200, json={}))
+        await async_asn_query("AS64496", "json", BASE_URL, ClientConfig(deadline=0.5))
+
+    captured = capsys.readouterr()
+    assert json.loads(captured.out)["asn_info"] == {"directOrigin": [], "overlaps": []}
+    assert "timed out" in captured.err
+    assert partial_reasons() == ["timed out fetching prefixes of AS64496"]
+    assert not IrrDisplay().console.stderr
+
+
+@pytest.mark.asyncio
+async def test_failed_query_is_left_out() -> None:
+    """Test a failed query is left out of the results and recorded, while a connect error is raised."""
+
+    async def fail(exc: Exception) -> str:
+        raise exc
+
+    assert await leave_out_failure(fail(ValueError("bad JSON")), "AS64496", "left {} out of the summary") is None
+    assert await leave_out_failure(asyncio.sleep(0, "data"), "AS64497") == "data"
+    with pytest.raises(httpx.ConnectError):
+        await leave_out_failure(fail(httpx.ConnectError("refused")), "AS64498")
+    assert partial_reasons() == ["left AS64496 out of the summary"]
+
+
+def test_partial_results_exit_code() -> None:
+    """Test the CLI prints what it has and exits with the partial results status when results are missing."""
+
+    async def partial_query(*_: Any) -> None:
+        print("192.0.2.0/24")
+        mark_partial("timed out fetching prefix 198.51.100.0/24")
+
+    with patch("irrexplorer_cli.queries.async_prefix_query", side_effect=partial_query) as query:
+        result = CliRunner().invoke(app, ["--deadline", "2", "prefix", "192.0.2.0/24"])
+
+    assert result.exit_code == PARTIAL_EXIT_CODE
+    assert "192.0.2.0/24" in result.stdout
+    assert query.call_args.args[3].deadline == 2
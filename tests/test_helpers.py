@@ -1,5 +1,6 @@
 """Test suite for helper functions."""
 
+import json
 from typing import Any, Dict, List
 
 import pytest
@@ -7,9 +8,15 @@ import pytest
 from irrexplorer_cli.helpers import (
     find_least_specific_prefix,
     format_as_sets,
+    format_as_sets_ndjson,
+    format_asn_prefix_ndjson,
     format_direct_origins,
     format_overlapping_prefixes,
+    format_prefix_ndjson,
     format_prefix_result,
+    is_same_prefix,
+    normalize_asn_format,
+    read_batch_queries,
     validate_asn_format,
     validate_prefix_format,
     validate_url_format,
@@ -180,3 +187,49 @@ def test_validate_url_format() -> None:
     assert validate_url_format("http://invalid") is False
     assert validate_url_format("https://example.com space") is False
     assert validate_url_format("") is False
+
+
+def test_read_batch_queries() -> None:
+    """Test batch query reading skips blank lines and comments."""
+    lines = ["192.0.2.0/24\n", "\n", "# comment\n", "  198.51.100.0/24  # inline comment\n"]
+    assert read_batch_queries(lines) == ["192.0.2.0/24", "198.51.100.0/24"]
+
+
+def test_normalize_asn_format() -> None:
+    """Test ASN normalization to the AS-prefixed form."""
+    assert normalize_asn_format("12345") == "AS12345"
+    assert normalize_asn_format("as12345") == "AS12345"
+    assert normalize_asn_format("AS12345") == "AS12345"
+
+
+def test_format_prefix_ndjson() -> None:
+    """Test prefix NDJSON records are compact single-line JSON."""
+    record = format_prefix_ndjson(create_basic_prefix_info(), "DIRECT", "192.0.2.0/24")
+    assert "\n" not in record
+    data = json.loads(record)
+    assert data["type"] == "DIRECT"
+    assert data["query"] == "192.0.2.0/24"
+    assert data["prefix"] == "192.0.2.0/24"
+    assert "query" not in json.loads(format_prefix_ndjson(create_basic_prefix_info(), "OVERLAP"))
+
+
+def test_format_asn_ndjson_records() -> None:
+    """Test ASN prefix and AS set NDJSON records."""
+    data = json.loads(format_asn_prefix_ndjson("OVERLAP", "AS12345", create_basic_prefix_info()))
+    assert data["type"] == "OVERLAP"
+    assert data["asn"] == "AS12345"
+    assert data["rpkiRoutes"][0]["rpkiStatus"] == "VALID"
+
+    records = [json.loads(line) for line in format_as_sets_ndjson("AS12345", COMMON_SETS_DATA)]
+    assert records[0] == {"type": "SET", "asn": "AS12345", "set": "AS-TEST1", "irr": "RIPE"}
+    assert len(records) == 6
+    assert not list(format_as_sets_ndjson("AS12345", {}))
+
+
+def test_is_same_prefix() -> None:
+    """Test prefixes and host addresses compare as networks."""
+    assert is_same_prefix("192.0.2.0/24", "192.0.2.0/24")
+    assert is_same_prefix("192.0.2.1", "192.0.2.1/32")
+    assert is_same_prefix("2001:db8::/32", "2001:0db8::/32")
+    assert not is_same_prefix("192.0.2.0/24", "192.0.2.0/23")
+    assert not is_same_prefix("invalid", "192.0.2.0/24")
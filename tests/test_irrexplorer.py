@@ -1,11 +1,14 @@
 """Test suite for IRR Explorer core functionality."""
 
-from typing import Any
+import json
+from typing import Any, List
 from unittest.mock import AsyncMock, Mock, patch
 
 import httpx
 import pytest
+import respx
 
+from irrexplorer_cli.config import ClientConfig
 from irrexplorer_cli.irrexplorer import IrrDisplay, IrrExplorer
 from irrexplorer_cli.models import PrefixInfo
 from tests.fixtures import COMMON_ASN_DATA, COMMON_PREFIX_INFO, COMMON_SETS_DATA, create_basic_prefix_info
@@ -290,7 +293,7 @@ async def test_fetch_prefix_info_empty_response() -> None:
     """Test prefix info fetch with empty response."""
     explorer = IrrExplorer()
     mock_response = Mock()
-    mock_response.json.return_value = []
+    mock_response.content = b"[]"
     mock_response.raise_for_status = Mock()
 
     async def mock_get(*_: Any) -> Mock:
@@ -354,3 +357,119 @@ def test_display_as_sets_edge_cases() -> None:
 
     # Test with empty setsPerIrr
     display.display_as_sets({"setsPerIrr": {}}, "AS12345")
+
+
+@pytest.mark.asyncio
+async def test_display_all_overlaps_uses_shared_explorer() -> None:
+    """Test all overlaps are fetched through the display's shared client."""
+    explorer = IrrExplorer(base_url="https://example.com")
+    display = IrrDisplay(explorer)
+    overlaps = [create_basic_prefix_info(prefix="192.0.2.0/23")]
+
+    with (
+        patch.object(explorer, "fetch_prefix_info", AsyncMock(return_value=overlaps)) as mock_fetch,
+        patch.object(display.console, "print"),
+    ):
+        await display.display_all_overlaps("192.0.2.0/23")
+        mock_fetch.assert_awaited_once_with("192.0.2.0/23")
+    assert not explorer.client.is_closed
+    await explorer.close()
+
+
+@pytest.mark.asyncio
+async def test_stream_asn_info() -> None:
+    """Test ASN prefixes are streamed from the response and from the cache."""
+    explorer = IrrExplorer(base_url="https://example.com", config=ClientConfig(cache=True))
+    body = json.dumps(COMMON_ASN_DATA | {"overlaps": [COMMON_PREFIX_INFO]}).encode()
+    explorer.cache.set("https://example.com/api/prefixes/asn/AS64496", body)  # type: ignore[union-attr]
+
+    with respx.mock:
+        respx.get("https://example.com/api/prefixes/asn/AS12345").mock(return_value=httpx.Response(200, content=body))
+        streamed = [(key, info.prefix) async for key, info in explorer.stream_asn_info("AS12345")]
+    cached = [(key, info.prefix) async for key, info in explorer.stream_asn_info("AS64496")]
+    assert streamed == cached == [("directOrigin", "192.0.2.0/24"), ("overlaps", "192.0.2.0/24")]
+    await explorer.close()
+
+
+@pytest.mark.asyncio
+async def test_stream_asn_info_retries_and_caches() -> None:
+    """Test a failed stream is fetched again with retries, and a streamed body fills the cache."""
+    explorer = IrrExplorer(base_url="https://example.com", config=ClientConfig(cache=True))
+    body = json.dumps(COMMON_ASN_DATA).encode()
+    with respx.mock, patch("asyncio.sleep", AsyncMock()):
+        route = respx.get("https://example.com/api/prefixes/asn/AS12345").mock(
+            side_effect=[httpx.Response(503), httpx.Response(503), httpx.Response(200, content=body)]
+        )
+        retried = [(key, info.prefix) async for key, info in explorer.stream_asn_info("AS12345")]
+        assert route.call_count == 3
+
+        respx.get("https://example.com/api/prefixes/asn/AS64496").mock(return_value=httpx.Response(200, content=body))
+        assert [item async for item in explorer.stream_asn_info("AS64496")]
+    assert retried == [("directOrigin", "192.0.2.0/24")]
+    assert explorer.cache.get("https://example.com/api/prefixes/asn/AS64496") == body  # type: ignore[union-attr]
+    await explorer.close()
+
+
+@pytest.mark.asyncio
+async def test_stream_asn_info_skips_caching_large_bodies() -> None:
+    """Test a streamed body larger than the cache size cap is not kept for the cache."""
+    explorer = IrrExplorer(base_url="https://example.com", config=ClientConfig(cache=True))
+    explorer.cache.max_bytes = 64  # type: ignore[union-attr]
+    body = json.dumps(COMMON_ASN_DATA).encode()
+    with respx.mock:
+        respx.get("https://example.com/api/prefixes/asn/AS12345").mock(return_value=httpx.Response(200, content=body))
+        assert [item async for item in explorer.stream_asn_info("AS12345")]
+    assert explorer.cache.get("https://example.com/api/prefixes/asn/AS12345") is None  # type: ignore[union-attr]
+    await explorer.close()
+
+
+@pytest.mark.asyncio
+async def test_stream_asn_info_timeout() -> None:
+    """Test ASN streaming stops with a warning on timeout."""
+    explorer = IrrExplorer()
+    with (
+        patch.object(explorer.client, "stream", side_effect=httpx.TimeoutException("Timeout")),
+        patch.object(explorer.console, "print") as mock_print,
+    ):
+        assert not [item async for item in explorer.stream_asn_info("AS12345")]
+        mock_print.assert_called_once()
+    await explorer.close()
+
+
+@pytest.mark.asyncio
+async def test_display_prefix_info_reuses_queried_prefix() -> None:
+    """Test all overlaps are not fetched again when the queried prefix is the least specific match."""
+    explorer = IrrExplorer(base_url="https://example.com")
+    display = IrrDisplay(explorer)
+    direct = [create_basic_prefix_info(prefix="192.0.2.0/24"), create_basic_prefix_info(prefix="192.0.2.0/25")]
+
+    with (
+        patch.object(explorer, "fetch_prefix_info", AsyncMock()) as mock_fetch,
+        patch.object(display, "print_all_overlaps", AsyncMock()) as mock_print_all,
+        patch.object(display.console, "print"),
+    ):
+        await display.display_prefix_info(direct, "192.0.2.0/24")
+        mock_fetch.assert_not_awaited()
+        mock_print_all.assert_awaited_once_with("192.0.2.0/24", direct)
+    await explorer.close()
+
+
+@pytest.mark.asyncio
+async def test_display_prefix_info_fetches_overlaps_while_rendering() -> None:
+    """Test the least specific fetch is started before the direct overlaps are rendered."""
+    explorer = IrrExplorer(base_url="https://example.com")
+    display = IrrDisplay(explorer)
+    events: List[str] = []
+
+    async def fetch(prefix: str) -> List[PrefixInfo]:
+        events.append(f"fetch {prefix}")
+        return [create_basic_prefix_info(prefix="192.0.0.0/16")]
+
+    with (
+        patch.object(explorer, "fetch_prefix_info", side_effect=fetch),
+        patch.object(display, "render", side_effect=lambda panel: events.append("render")),
+        patch.object(display.console, "print"),
+    ):
+        await display.display_prefix_info([create_basic_prefix_info(prefix="192.0.0.0/16")], "192.0.2.0/24")
+    assert events == ["fetch 192.0.0.0/16", "render", "render"]
+    await explorer.close()
@@ -0,0 +1,98 @@
+"""Test suite for the adaptive concurrency limiter."""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+import respx
+
+from irrexplorer_cli.config import ClientConfig
+from irrexplorer_cli.irrexplorer import IrrExplorer
+from irrexplorer_cli.limiter import AdaptiveLimiter, retry_after_seconds
+
+URL = "https://example.com/api/sets/member-of/AS64496"
+
+
+def test_retry_after_seconds() -> None:
+    """Test Retry-After is read as seconds or an HTTP date, and capped."""
+    assert retry_after_seconds(httpx.Response(429, headers={"Retry-After": "2"})) == 2.0
+    assert retry_after_seconds(httpx.Response(429, headers={"Retry-After": "86400"})) == 300.0
+    assert not retry_after_seconds(httpx.Response(429, headers={"Retry-After": "Mon, 01 Jan 2001 00:00:00 GMT"}))
+    assert retry_after_seconds(httpx.Response(429, headers={"Retry-After": "soon"})) is None
+    assert retry_after_seconds(httpx.Response(429)) is None
+
+
+def test_slow_start_then_halving() -> None:
+    """Test the limit grows by one per success until congestion halves it, then grows additively."""
+    limiter = AdaptiveLimiter(max_limit=100, initial_limit=4)
+    for _ in range(4):
+        limiter.on_success(0.1)
+    assert limiter.limit == 8
+    limiter.on_congestion("HTTP 503", None)
+    assert limiter.limit == 4
+    # only one decrease per round trip
+    limiter.on_congestion("HTTP 503", None)
+    assert limiter.limit == 4
+    limiter.on_success(0.1)
+    assert limiter.limit == pytest.approx(4.25)
+
+
+def test_latency_increase_counts_as_congestion() -> None:
+    """Test a sudden latency increase lowers the limit while steady slow responses do not."""
+    limiter = AdaptiveLimiter(max_limit=100, initial_limit=16)
+    for _ in range(20):
+        limiter.on_success(2.0)
+    assert limiter.limit == 36
+    for _ in range(10):
+        limiter.on_success(20.0)
+    assert limiter.limit < 36
+    assert not limiter.slow_start
+
+
+@pytest.mark.asyncio
+async def test_limits_requests_in_flight() -> None:
+    """Test no more requests than the limit are in flight at once."""
+    limiter = AdaptiveLimiter(max_limit=2, initial_limit=2)
+    inflight = peak = 0
+
+    async def request() -> None:
+        nonlocal inflight, peak
+        async with limiter.slot():
+            inflight += 1
+            peak = max(peak, inflight)
+            await asyncio.sleep(0.01)
+            inflight -= 1
+
+    await asyncio.gather(*(request() for _ in range(8)))
+    assert peak == 2
+    assert not limiter.inflight
+
+
+@pytest.mark.asyncio
+async def test_explorer_honours_retry_after() -> None:
+    """Test a 429 halves the shared limit and delays the retry by Retry-After."""
+    explorer = IrrExplorer(base_url="https://example.com", config=ClientConfig())
+    limiter = explorer.session.limiter
+    assert limiter is not None
+    with respx.mock:
+        route = respx.get(URL)
+        route.side_effect = [
+            httpx.Response(429, headers={"Retry-After": "0.3"}),
+            httpx.Response(200, json={"setsPerIrr": {}}),
+        ]
+        started = time.monotonic()
+        assert await explorer.fetch_asn_sets("AS64496") == {"setsPerIrr": {}}
+    await explorer.close()
+
+    assert route.call_count == 2
+    assert limiter.paused_until >= started + 0.3
+    assert time.monotonic() - started >= 0.3
+    # halved from the initial 4, then one success
+    assert limiter.limit == pytest.approx(2.5)
+
+
+def test_adaptive_can_be_disabled() -> None:
+    """Test sessions without adaptive concurrency have no limiter."""
+    explorer = IrrExplorer(config=ClientConfig(adaptive_concurrency=False))
+    assert explorer.session.limiter is None
@@ -1,5 +1,6 @@
 """Test cases for main module."""
 
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -7,6 +8,7 @@ import typer
 from click.core import Command
 from typer.testing import CliRunner
 
+from irrexplorer_cli.config import ClientConfig
 from irrexplorer_cli.main import app, asn, prefix
 
 runner = CliRunner()
@@ -112,7 +114,7 @@ def test_asn_direct_no_args() -> None:
         asn(ctx)
 
 
-@patch("irrexplorer_cli.main.validate_url_format")
+@patch("irrexplorer_cli.helpers.validate_url_format")
 def test_prefix_invalid_url_format(mock_validate_url: MagicMock) -> None:
     """Test prefix command with invalid URL format."""
     mock_validate_url.return_value = False
@@ -123,7 +125,7 @@ def test_prefix_invalid_url_format(mock_validate_url: MagicMock) -> None:
     assert exc_info.value.exit_code == 1
 
 
-@patch("irrexplorer_cli.main.validate_url_format")
+@patch("irrexplorer_cli.helpers.validate_url_format")
 def test_asn_invalid_url_format(mock_validate_url: MagicMock) -> None:
     """Test ASN command with invalid URL format."""
     mock_validate_url.return_value = False
@@ -132,3 +134,40 @@ def test_asn_invalid_url_format(mock_validate_url: MagicMock) -> None:
     with pytest.raises(typer.Exit) as exc_info:
         asn(ctx, "AS12345")
     assert exc_info.value.exit_code == 1
+
+
+def test_prefix_from_file(tmp_path: Path) -> None:
+    """Test prefix command in batch mode reading from a file."""
+    batch_file = tmp_path / "prefixes.txt"
+    batch_file.write_text("192.0.2.0/24\n# comment\n\n198.51.100.0/24\n")
+    with patch("irrexplorer_cli.queries.async_batch_prefix_query", return_value=None) as mock_query:
+        result = runner.invoke(app, ["prefix", "--from-file", str(batch_file), "--format", "csv", "-c", "5"])
+        assert not result.exit_code
+        mock_query.assert_called_once_with(
+            ["192.0.2.0/24", "198.51.100.0/24"], "csv", None, 5, ClientConfig(cache=True)
+        )
+
+
+def test_prefix_from_stdin_invalid_prefix() -> None:
+    """Test prefix command in batch mode rejecting invalid input from stdin."""
+    result = runner.invoke(app, ["prefix", "--from-file", "-"], input="192.0.2.0/24\ninvalid\n")
+    assert result.exit_code == 1
+    assert "Error: Invalid prefix format: invalid" in result.stdout
+
+
+def test_asn_from_file(tmp_path: Path) -> None:
+    """Test ASN command in batch mode normalizing AS numbers from a file."""
+    batch_file = tmp_path / "asns.txt"
+    batch_file.write_text("AS12345\nas64496\n64497\n")
+    with patch("irrexplorer_cli.queries.async_batch_asn_query", return_value=None) as mock_query:
+        result = runner.invoke(app, ["asn", "--from-file", str(batch_file)])
+        assert not result.exit_code
+        mock_query.assert_called_once_with(["AS12345", "AS64496", "AS64497"], None, None, 10, ClientConfig(cache=True))
+
+
+def test_compact_view_selects_compact_output() -> None:
+    """Test --view compact only replaces the default Rich output."""
+    with patch("irrexplorer_cli.queries.async_asn_query", return_value=None) as mock_query:
+        runner.invoke(app, ["asn", "AS12345", "--view", "compact"])
+        runner.invoke(app, ["asn", "AS12345", "--view", "compact", "--format", "csv"])
+        assert [call.args[1] for call in mock_query.call_args_list] == ["compact", "csv"]
@@ -1,8 +1,20 @@
 """Test suite for data models."""
 
+import gc
+import json
 from typing import Dict, List
 
-from irrexplorer_cli.models import AsResponse, AsSets, IrrRoute, PrefixInfo
+import pytest
+from pydantic import ValidationError
+
+from irrexplorer_cli.models import (
+    AsResponse,
+    AsSets,
+    IrrRoute,
+    PrefixInfo,
+    decode_prefix_infos,
+    validate_prefix_infos,
+)
 from tests.fixtures import COMMON_PREFIX_INFO, COMMON_RPKI_ROUTE
 
 
@@ -48,3 +60,31 @@ def test_as_sets_model() -> None:
     data: Dict[str, Dict[str, List[str]]] = {"setsPerIrr": {"RIPE": ["AS-TEST"]}}
     sets = AsSets.model_validate(data)
     assert "RIPE" in sets.setsPerIrr
+
+
+def test_decode_prefix_infos() -> None:
+    """Test batched decoding of raw JSON prefix arrays."""
+    raw = json.dumps([COMMON_PREFIX_INFO, {**COMMON_PREFIX_INFO, "prefix": "198.51.100.0/24"}]).encode()
+    infos = decode_prefix_infos(raw)
+    assert [info.prefix for info in infos] == ["192.0.2.0/24", "198.51.100.0/24"]
+    assert infos[0] == PrefixInfo.model_validate(COMMON_PREFIX_INFO)
+    assert not decode_prefix_infos(b"")
+    assert not decode_prefix_infos(b"null")
+    with pytest.raises(ValidationError):
+        decode_prefix_infos(b'[{"prefix": "192.0.2.0/24"}]')
+
+
+def test_validate_prefix_infos() -> None:
+    """Test batched validation of decoded prefix dictionaries."""
+    assert validate_prefix_infos([COMMON_PREFIX_INFO])[0].prefix == "192.0.2.0/24"
+    assert not validate_prefix_infos(None)
+
+
+def test_decode_prefix_infos_restores_gc() -> None:
+    """Test garbage collection is re-enabled after a batched decode, even on errors."""
+    assert gc.isenabled()
+    decode_prefix_infos(b"[]")
+    assert gc.isenabled()
+    with pytest.raises(ValidationError):
+        decode_prefix_infos(b'[{"prefix": "192.0.2.0/24"}]')
+    assert gc.isenabled()
@@ -0,0 +1,106 @@
+"""Test suite for the local prefix index."""
+
+import ipaddress
+import random
+from typing import List
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from irrexplorer_cli.irrexplorer import IrrExplorer
+from irrexplorer_cli.models import PrefixInfo
+from irrexplorer_cli.prefix_index import PrefixIndex
+from tests.fixtures import create_basic_prefix_info
+
+PREFIXES = ["192.0.0.0/16", "192.0.2.0/24", "192.0.2.0/25", "192.0.2.128/25", "192.0.3.0/24", "198.51.100.0/24"]
+
+
+def make_index(prefixes: List[str]) -> PrefixIndex:
+    """Create an index holding prefix information for each prefix."""
+    index = PrefixIndex()
+    index.add_all(create_basic_prefix_info(prefix=prefix) for prefix in prefixes)
+    return index
+
+
+def prefixes_of(infos: List[PrefixInfo]) -> List[str]:
+    """Return the prefixes of a list of prefix information."""
+    return [info.prefix for info in infos]
+
+
+def test_covering_and_more_specifics() -> None:
+    """Test covering prefixes are least specific first and more specifics in address order."""
+    index = make_index(PREFIXES)
+    assert prefixes_of(index.covering("192.0.2.128/26")) == ["192.0.0.0/16", "192.0.2.0/24", "192.0.2.128/25"]
+    assert prefixes_of(index.more_specifics("192.0.0.0/16")) == [
+        "192.0.2.0/24",
+        "192.0.2.0/25",
+        "192.0.2.128/25",
+        "192.0.3.0/24",
+    ]
+    assert prefixes_of(index.overlaps("192.0.2.0/24")) == [
+        "192.0.0.0/16",
+        "192.0.2.0/24",
+        "192.0.2.0/25",
+        "192.0.2.128/25",
+    ]
+    assert not index.overlaps("203.0.113.0/24")
+    assert len(index) == len(PREFIXES)
+
+
+def test_least_specific() -> None:
+    """Test the least specific overlapping prefix is found on either side of a network."""
+    index = make_index(PREFIXES)
+    assert index.least_specific("192.0.2.1") == "192.0.0.0/16"
+    assert index.least_specific("192.0.0.0/8") == "192.0.0.0/16"
+    assert index.least_specific("10.0.0.0/8") is None
+
+
+def test_ipv4_and_ipv6_are_separate() -> None:
+    """Test IPv6 prefixes live in their own trie."""
+    index = make_index(["::/0", "2001:db8::/32", "2001:db8:1::/48", "0.0.0.0/0"])
+    assert prefixes_of(index.covering("2001:db8:1:2::/64")) == ["::/0", "2001:db8::/32", "2001:db8:1::/48"]
+    assert prefixes_of(index.covering("192.0.2.0/24")) == ["0.0.0.0/0"]
+
+
+def test_lookup_requires_complete_supernet() -> None:
+    """Test networks are only answered locally inside a network marked complete."""
+    index = make_index(PREFIXES)
+    assert index.lookup("192.0.2.0/24") is None
+    index.mark_complete("192.0.0.0/16")
+    local = index.lookup("192.0.2.0/24")
+    assert local is not None
+    assert prefixes_of(local) == prefixes_of(index.overlaps("192.0.2.0/24"))
+    assert index.lookup("198.51.100.0/24") is None
+    assert index.lookup("invalid") is None
+
+
+def test_matches_linear_scan() -> None:
+    """Test trie queries agree with a linear scan over random networks."""
+    rng = random.Random(7)
+    networks = {
+        ipaddress.ip_network((rng.getrandbits(32), length), strict=False)
+        for length in (8, 12, 16, 20, 24, 28, 32)
+        for _ in range(60)
+    }
+    index = make_index([str(network) for network in networks])
+    for _ in range(200):
+        query = ipaddress.ip_network((rng.getrandbits(32), rng.choice((8, 16, 24, 32))), strict=False)
+        expected = sorted(str(network) for network in networks if network.overlaps(query))
+        assert sorted(prefixes_of(index.overlaps(str(query)))) == expected
+
+
+@pytest.mark.asyncio
+async def test_explorer_answers_from_index() -> None:
+    """Test a prefix inside an already fetched network is answered without a request."""
+    explorer = IrrExplorer(base_url="https://example.com")
+    response = AsyncMock()
+    response.content = (
+        b"[" + b",".join(create_basic_prefix_info(prefix=p).model_dump_json().encode() for p in PREFIXES[:4]) + b"]"
+    )
+
+    with patch.object(explorer, "get", AsyncMock(return_value=response)) as mock_get:
+        await explorer.fetch_prefix_info("192.0.0.0/16")
+        local = await explorer.fetch_prefix_info("192.0.2.128/25")
+        mock_get.assert_awaited_once_with("/api/prefixes/prefix/192.0.0.0/16")
+    assert prefixes_of(local) == ["192.0.0.0/16", "192.0.2.0/24", "192.0.2.128/25"]
+    await explorer.close()
@@ -0,0 +1,135 @@
+"""Test suite for per-phase timing instrumentation."""
+
+import json
+from pathlib import Path
+from typing import AsyncIterator, Iterator
+from unittest.mock import patch
+
+import httpx
+import pytest
+import respx
+from typer.testing import CliRunner
+
+from irrexplorer_cli.config import ClientConfig
+from irrexplorer_cli.irrexplorer import IrrExplorer
+from irrexplorer_cli.main import app
+from irrexplorer_cli.profiling import (
+    Profiler,
+    active_profiler,
+    profile_phase,
+    start_profiling,
+    stop_profiling,
+    trace_extensions,
+)
+from irrexplorer_cli.queries import async_prefix_query
+from tests.fixtures import COMMON_PREFIX_INFO
+
+runner = CliRunner()
+PREFIX_URL = "https://example.com/api/prefixes/prefix/192.0.2.0/24"
+
+
+@pytest.fixture(name="profiler")
+def profiler_fixture() -> Iterator[Profiler]:
+    """Provide an active profiler, stopping it after the test."""
+    yield start_profiling()
+    stop_profiling()
+
+
+def test_profile_phase_is_noop_when_off() -> None:
+    """Test phases are not recorded without an active profiler."""
+    assert active_profiler() is None
+    with profile_phase("format") as record:
+        assert record is None
+    assert not trace_extensions(PREFIX_URL)
+
+
+def test_summary_orders_and_aggregates_phases(profiler: Profiler) -> None:
+    """Test the summary aggregates records per phase in query order."""
+    with profile_phase("render"):
+        pass
+    for size in (10, 20):
+        with profile_phase("http", PREFIX_URL) as record:
+            assert record is not None
+            record.bytes = size
+
+    summary = profiler.summary()
+    assert [phase.phase for phase in summary] == ["http", "render"]
+    assert summary[0].count == 2
+    assert summary[0].bytes == 30
+    assert summary[0].max_seconds <= summary[0].seconds
+
+
+@pytest.mark.asyncio
+async def test_tracer_records_connection_setup(profiler: Profiler) -> None:
+    """Test the httpx trace callback records TCP and TLS setup."""
+    trace = profiler.tracer(PREFIX_URL)
+    for event in ("connect_tcp.started", "connect_tcp.complete", "start_tls.started", "start_tls.failed"):
+        await trace(f"connection.{event}", {})
+    await trace("http11.send_request_headers.started", {})
+    assert [record.detail for record in profiler.report().connections] == [
+        f"connect_tcp {PREFIX_URL}",
+        f"start_tls {PREFIX_URL}",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_explorer_records_http_and_validation(profiler: Profiler) -> None:
+    """Test API requests record their URL and size, and decoding records validation."""
+    body = json.dumps([COMMON_PREFIX_INFO]).encode()
+    explorer = IrrExplorer(base_url="https://example.com", config=ClientConfig())
+    with respx.mock:
+        respx.get(PREFIX_URL).mock(return_value=httpx.Response(200, content=body))
+        await explorer.fetch_prefix_info("192.0.2.0/24")
+    await explorer.close()
+
+    report = profiler.report()
+    assert [(record.detail, record.bytes) for record in report.requests] == [(PREFIX_URL, len(body))]
+    assert "validate" in [phase.phase for phase in report.phases]
+
+
+@pytest.mark.asyncio
+async def test_timed_chunks_counts_streamed_bytes(profiler: Profiler) -> None:
+    """Test streamed bodies are recorded as one request with their total size."""
+
+    async def chunks() -> AsyncIterator[bytes]:
+        yield b"abc"
+        yield b"de"
+
+    received = [chunk async for chunk in profiler.timed_chunks(chunks(), PREFIX_URL, 0.0)]
+    assert received == [b"abc", b"de"]
+    assert profiler.report().requests[0].bytes == 5
+
+
+@pytest.mark.asyncio
+async def test_profiling_keeps_query_output(profiler: Profiler) -> None:
+    """Test profiling records formatting without changing the printed output."""
+    with (
+        patch("irrexplorer_cli.irrexplorer.IrrExplorer.fetch_prefix_info", return_value=[]),
+        patch("builtins.print") as mock_print,
+    ):
+        await async_prefix_query("192.0.2.0/24", "json", config=ClientConfig())
+    mock_print.assert_called_once_with("[]")
+    assert [phase.phase for phase in profiler.summary()] == ["format"]
+
+
+def test_profile_output_writes_json_report(tmp_path: Path) -> None:
+    """Test --profile-output writes a JSON report and stops profiling."""
+    report_path = tmp_path / "profile.json"
+    with patch("irrexplorer_cli.queries.async_prefix_query") as mock_query:
+        result = runner.invoke(app, ["--profile-output", str(report_path), "prefix", "192.0.2.0/24"])
+    assert not result.exit_code
+    mock_query.assert_called_once()
+    assert active_profiler() is None
+    report = json.loads(report_path.read_text(encoding="utf-8"))
+    assert set(report) == {"total_seconds", "phases", "requests", "connections"}
+
+
+def test_profile_prints_summary_to_stderr() -> None:
+    """Test --profile prints the phase table after the command."""
+    with (
+        patch("irrexplorer_cli.queries.async_prefix_query"),
+        patch("irrexplorer_cli.profiling.Profiler.print_summary") as mock_summary,
+    ):
+        result = runner.invoke(app, ["--profile", "prefix", "192.0.2.0/24"])
+    assert not result.exit_code
+    mock_summary.assert_called_once()
@@ -1,16 +1,26 @@
-""" Tests for the queries module. """
+"""Tests for the queries module."""
 
+import asyncio
 import json
-from typing import Any, Dict, List
+from typing import Any, AsyncIterator, Dict, List, Tuple
 from unittest.mock import patch
 
 import httpx
 import pytest
 import typer
 
+from irrexplorer_cli.deadline import partial_reasons
 from irrexplorer_cli.irrexplorer import IrrExplorer
-from irrexplorer_cli.queries import async_asn_query, async_prefix_query, process_overlaps
-from tests.fixtures import create_basic_prefix_info
+from irrexplorer_cli.models import PrefixInfo
+from irrexplorer_cli.queries import (
+    async_asn_query,
+    async_batch_asn_query,
+    async_batch_prefix_query,
+    async_prefix_query,
+    iter_bounded,
+    process_overlaps,
+)
+from tests.fixtures import COMMON_ASN_DATA, COMMON_SETS_DATA, create_basic_prefix_info
 
 
 @pytest.mark.asyncio
@@ -34,8 +44,13 @@ async def test_asn_query_csv_output() -> None:
     mock_results: Dict[str, List[Any]] = {"directOrigin": [], "overlaps": []}
     mock_sets: Dict[str, Dict[str, Any]] = {"setsPerIrr": {}}
 
+    async def mock_stream(_: str) -> AsyncIterator[Tuple[str, PrefixInfo]]:
+        for key in ("directOrigin", "overlaps"):
+            for item in mock_results[key]:
+                yield key, PrefixInfo.model_validate(item)
+
     with (
-        patch("irrexplorer_cli.irrexplorer.IrrExplorer.fetch_asn_info", return_value=mock_results),
+        patch("irrexplorer_cli.irrexplorer.IrrExplorer.stream_asn_info", side_effect=mock_stream),
         patch("irrexplorer_cli.irrexplorer.IrrExplorer.fetch_asn_sets", return_value=mock_sets),
         patch("builtins.print") as mock_print,
     ):
@@ -100,3 +115,318 @@ async def test_prefix_query_csv_overlaps_path() -> None:
         patch("builtins.print"),
     ):
         await async_prefix_query("192.0.2.0/24", output_format="csv", base_url=None)
+
+
+@pytest.mark.asyncio
+async def test_iter_bounded_limits_concurrency() -> None:
+    """Test bounded iteration never exceeds the concurrency limit."""
+    in_flight = 0
+    max_in_flight = 0
+
+    async def worker(item: int) -> int:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return item * 2
+
+    results = [result async for result in iter_bounded(range(20), worker, 3)]
+    assert sorted(results) == [item * 2 for item in range(20)]
+    assert max_in_flight == 3
+
+
+@pytest.mark.asyncio
+async def test_batch_prefix_query_csv_output() -> None:
+    """Test batch prefix query with CSV output."""
+    direct = [create_basic_prefix_info(prefix="192.0.2.0/24")]
+    overlaps = [create_basic_prefix_info(prefix="192.0.2.0/23")]
+
+    with (
+        patch("irrexplorer_cli.irrexplorer.IrrExplorer.fetch_prefix_info", side_effect=[direct, overlaps]),
+        patch("builtins.print") as mock_print,
+    ):
+        await async_batch_prefix_query(["192.0.2.128/25"], "csv")
+        printed = [call.args[0] for call in mock_print.call_args_list]
+        assert printed[0] == "Query,Type,Prefix,Category,RIR,RPKI_Status,BGP_Origins,IRR_Routes,Messages"
+        assert printed[1].startswith("192.0.2.128/25,DIRECT,192.0.2.0/24,")
+        assert printed[2].startswith("192.0.2.128/25,OVERLAP,192.0.2.0/23,")
+
+
+@pytest.mark.asyncio
+async def test_batch_prefix_query_json_output() -> None:
+    """Test batch prefix query with JSON output keeps input order and skips failures."""
+
+    async def fake_fetch(pfx: str) -> List[Any]:
+        if pfx == "198.51.100.0/24":
+            raise httpx.HTTPError("Test error")
+        return [create_basic_prefix_info(prefix=pfx)]
+
+    with (
+        patch("irrexplorer_cli.irrexplorer.IrrExplorer.fetch_prefix_info", side_effect=fake_fetch),
+        patch("builtins.print") as mock_print,
+    ):
+        await async_batch_prefix_query(["203.0.113.0/24", "198.51.100.0/24", "192.0.2.0/24"], "json")
+        data = json.loads(mock_print.call_args.args[0])
+        assert list(data) == ["203.0.113.0/24", "198.51.100.0/24", "192.0.2.0/24"]
+        assert data["198.51.100.0/24"] == []
+
+
+@pytest.mark.asyncio
+async def test_batch_prefix_query_connection_error() -> None:
+    """Test batch prefix query aborts on connection error."""
+    with (
+        patch(
+            "irrexplorer_cli.irrexplorer.IrrExplorer.fetch_prefix_info", side_effect=httpx.ConnectError("Test error")
+        ),
+        patch("builtins.print"),
+        pytest.raises(typer.Exit),
+    ):
+        await async_batch_prefix_query(["192.0.2.0/24"], "csv")
+
+
+@pytest.mark.asyncio
+async def test_batch_asn_query_csv_output() -> None:
+    """Test batch ASN query streams CSV rows for every AS number."""
+    with (
+        patch("irrexplorer_cli.irrexplorer.IrrExplorer.fetch_asn_info", return_value=COMMON_ASN_DATA),
+        patch("irrexplorer_cli.irrexplorer.IrrExplorer.fetch_asn_sets", return_value=COMMON_SETS_DATA),
+        patch("builtins.print") as mock_print,
+    ):
+        await async_batch_asn_query(["AS12345", "AS64496", "AS12345"], "csv")
+        printed = "".join(call.args[0] if call.args else "\n" for call in mock_print.call_args_list)
+        rows = printed.splitlines()
+        assert rows[0] == "Type,ASN,Prefix,Category,RIR,RPKI_Status,BGP_Origins,IRR_Routes,Messages"
+        assert sum(row.startswith("DIRECT,") for row in rows) == 2
+        assert any(row.startswith("SET,AS64496,AS-TEST1,RIPE") for row in rows)
+
+
+@pytest.mark.asyncio
+async def test_batch_asn_query_json_output() -> None:
+    """Test batch ASN query with JSON output and a failing AS number."""
+
+    async def fake_fetch_info(asn: str) -> Dict[str, Any]:
+        if asn == "AS64496":
+            raise httpx.HTTPError("Test error")
+        return COMMON_ASN_DATA
+
+    with (
+        patch("irrexplorer_cli.irrexplorer.IrrExplorer.fetch_asn_info", side_effect=fake_fetch_info),
+        patch("irrexplorer_cli.irrexplorer.IrrExplorer.fetch_asn_sets", return_value=COMMON_SETS_DATA),
+        patch("builtins.print") as mock_print,
+    ):
+        await async_batch_asn_query(["AS12345", "AS64496"], "json")
+        data = json.loads(mock_print.call_args.args[0])
+        assert list(data) == ["AS12345", "AS64496"]
+        assert data["AS12345"]["as_sets"] == COMMON_SETS_DATA
+        assert data["AS64496"]["asn_info"] == {"directOrigin": [], "overlaps": []}
+
+
+@pytest.mark.asyncio
+async def test_batch_asn_query_connection_error() -> None:
+    """Test batch ASN query aborts on connection error."""
+    with (
+        patch("irrexplorer_cli.irrexplorer.IrrExplorer.fetch_asn_info", side_effect=httpx.ConnectError("Test error")),
+        patch("irrexplorer_cli.irrexplorer.IrrExplorer.fetch_asn_sets", return_value=COMMON_SETS_DATA),
+        patch("builtins.print"),
+        pytest.raises(typer.Exit),
+    ):
+        await async_batch_asn_query(["AS12345"])
+
+
+@pytest.mark.asyncio
+async def test_asn_query_csv_streams_rows() -> None:
+    """Test ASN CSV output prints direct, overlap and set rows from the stream."""
+    direct = create_basic_prefix_info(prefix="192.0.2.0/24")
+    overlap = create_basic_prefix_info(prefix="198.51.100.0/24")
+
+    async def mock_stream(_: str) -> AsyncIterator[Tuple[str, PrefixInfo]]:
+        yield "directOrigin", direct
+        yield "overlaps", overlap
+
+    with (
+        patch("irrexplorer_cli.irrexplorer.IrrExplorer.stream_asn_info", side_effect=mock_stream),
+        patch("irrexplorer_cli.irrexplorer.IrrExplorer.fetch_asn_sets", return_value=COMMON_SETS_DATA),
+        patch("builtins.print") as mock_print,
+    ):
+        await async_asn_query("AS12345", "csv")
+        rows = "".join(call.args[0] if call.args else "\n" for call in mock_print.call_args_list).splitlines()
+        assert rows[1].startswith("DIRECT,AS12345,192.0.2.0/24,")
+        assert rows[2].startswith("OVERLAP,AS12345,198.51.100.0/24,")
+        assert rows[3] == "SET,AS12345,AS-TEST1,RIPE,N/A,N/A,N/A,N/A,N/A"
+
+
+@pytest.mark.asyncio
+async def test_asn_query_csv_stream_failure_is_partial() -> None:
+    """Test a stream failing after some rows keeps those rows and marks the results partial."""
+    direct = create_basic_prefix_info(prefix="192.0.2.0/24")
+
+    async def mock_stream(_: str) -> AsyncIterator[Tuple[str, PrefixInfo]]:
+        yield "directOrigin", direct
+        raise httpx.RemoteProtocolError("peer closed connection")
+
+    with (
+        patch("irrexplorer_cli.irrexplorer.IrrExplorer.stream_asn_info", side_effect=mock_stream),
+        patch("irrexplorer_cli.irrexplorer.IrrExplorer.fetch_asn_sets", return_value=COMMON_SETS_DATA),
+        patch("builtins.print") as mock_print,
+    ):
+        await async_asn_query("AS12345", "csv")
+        rows = "".join(call.args[0] if call.args else "\n" for call in mock_print.call_args_list).splitlines()
+        assert rows[1].startswith("DIRECT,AS12345,192.0.2.0/24,")
+    assert partial_reasons() == ["failed streaming prefixes of AS12345"]
+
+
+@pytest.mark.asyncio
+async def test_prefix_query_ndjson_output() -> None:
+    """Test prefix query NDJSON output emits one record per prefix."""
+    direct = [create_basic_prefix_info(prefix="192.0.2.0/24"), create_basic_prefix_info(prefix="192.0.2.0/23")]
+    overlaps = [create_basic_prefix_info(prefix="192.0.2.128/25")]
+
+    with (
+        patch("irrexplorer_cli.irrexplorer.IrrExplorer.fetch_prefix_info", side_effect=[direct, overlaps]),
+        patch("builtins.print") as mock_print,
+    ):
+        await async_prefix_query("192.0.2.0/24", "ndjson")
+        records = [json.loads(call.args[0]) for call in mock_print.call_args_list]
+        assert [(record["type"], record["prefix"]) for record in records] == [
+            ("DIRECT", "192.0.2.0/24"),
+            ("DIRECT", "192.0.2.0/23"),
+            ("OVERLAP", "192.0.2.128/25"),
+        ]
+        assert all(record["query"] == "192.0.2.0/24" for record in records)
+
+
+@pytest.mark.asyncio
+async def test_asn_query_ndjson_output() -> None:
+    """Test ASN query NDJSON output streams prefix and set records."""
+
+    async def mock_stream(_: str) -> AsyncIterator[Tuple[str, PrefixInfo]]:
+        yield "directOrigin", create_basic_prefix_info(prefix="192.0.2.0/24")
+
+    with (
+        patch("irrexplorer_cli.irrexplorer.IrrExplorer.stream_asn_info", side_effect=mock_stream),
+        patch("irrexplorer_cli.irrexplorer.IrrExplorer.fetch_asn_sets", return_value=COMMON_SETS_DATA),
+        patch("builtins.print") as mock_print,
+    ):
+        await async_asn_query("AS12345", "ndjson")
+        records = [json.loads(call.args[0]) for call in mock_print.call_args_list]
+        assert records[0]["type"] == "DIRECT"
+        assert records[0]["asn"] == "AS12345"
+        assert [record["type"] for record in records[1:]] == ["SET"] * 6
+
+
+@pytest.mark.asyncio
+async def test_batch_queries_ndjson_output() -> None:
+    """Test batch prefix and ASN queries emit NDJSON records."""
+    with (
+        patch(
+            "irrexplorer_cli.irrexplorer.IrrExplorer.fetch_prefix_info",
+            return_value=[create_basic_prefix_info(prefix="192.0.2.0/24")],
+        ),
+        patch("irrexplorer_cli.irrexplorer.IrrExplorer.fetch_asn_info", return_value=COMMON_ASN_DATA),
+        patch("irrexplorer_cli.irrexplorer.IrrExplorer.fetch_asn_sets", return_value={"setsPerIrr": {}}),
+        patch("builtins.print") as mock_print,
+    ):
+        await async_batch_prefix_query(["192.0.2.0/24"], "ndjson")
+        await async_batch_asn_query(["AS12345"], "ndjson")
+        records = [json.loads(call.args[0]) for call in mock_print.call_args_list]
+        assert [(record["type"], record.get("query"), record.get("asn")) for record in records] == [
+            ("DIRECT", "192.0.2.0/24", None),
+            ("OVERLAP", "192.0.2.0/24", None),
+            ("DIRECT", None, "AS12345"),
+        ]
+
+
+@pytest.mark.asyncio
+async def test_prefix_query_compact_view() -> None:
+    """Test the compact view adds one row per direct and overlapping prefix, fetching overlaps before rendering."""
+    direct = [create_basic_prefix_info(prefix="192.0.2.0/24"), create_basic_prefix_info(prefix="192.0.0.0/16")]
+    overlaps = [create_basic_prefix_info(prefix="192.0.0.0/16"), create_basic_prefix_info(prefix="192.0.1.0/24")]
+    events: List[str] = []
+
+    async def fetch(pfx: str) -> List[PrefixInfo]:
+        events.append(f"fetch {pfx}")
+        return direct if pfx == "192.0.2.0/24" else overlaps
+
+    with (
+        patch("irrexplorer_cli.irrexplorer.IrrExplorer.fetch_prefix_info", side_effect=fetch),
+        patch(
+            "irrexplorer_cli.compact.CompactTable.add",
+            autospec=True,
+            side_effect=lambda _, row_type, info: events.append(f"{row_type} {info.prefix}"),
+        ),
+        patch("irrexplorer_cli.compact.CompactTable.close", autospec=True) as mock_close,
+    ):
+        await async_prefix_query("192.0.2.0/24", "compact")
+        assert events == [
+            "fetch 192.0.2.0/24",
+            "fetch 192.0.0.0/16",
+            "DIRECT 192.0.2.0/24",
+            "DIRECT 192.0.0.0/16",
+            "OVERLAP 192.0.0.0/16",
+            "OVERLAP 192.0.1.0/24",
+        ]
+        mock_close.assert_called_once()
+
+        events.clear()
+        direct = direct[:1]
+        await async_prefix_query("192.0.2.0/24", "compact")
+        assert events == ["fetch 192.0.2.0/24", "DIRECT 192.0.2.0/24", "OVERLAP 192.0.2.0/24"]
+
+
+@pytest.mark.asyncio
+async def test_asn_query_compact_view() -> None:
+    """Test the compact view streams ASN prefixes as rows, followed by the AS sets."""
+
+    async def mock_stream(_: str) -> AsyncIterator[Tuple[str, PrefixInfo]]:
+        yield "directOrigin", create_basic_prefix_info(prefix="192.0.2.0/24")
+        yield "overlaps", create_basic_prefix_info(prefix="198.51.100.0/24")
+
+    with (
+        patch("irrexplorer_cli.irrexplorer.IrrExplorer.stream_asn_info", side_effect=mock_stream),
+        patch("irrexplorer_cli.irrexplorer.IrrExplorer.fetch_asn_sets", return_value=COMMON_SETS_DATA),
+        patch("irrexplorer_cli.compact.CompactTable.add", autospec=True) as mock_add,
+        patch("irrexplorer_cli.irrexplorer.IrrDisplay.display_as_sets") as mock_sets,
+    ):
+        await async_asn_query("AS12345", "compact")
+        assert [call.args[1] for call in mock_add.call_args_list] == ["DIRECT", "OVERLAP"]
+        mock_sets.assert_called_once_with(COMMON_SETS_DATA, "AS12345")
+
+
+@pytest.mark.asyncio
+async def test_prefix_query_csv_reuses_least_specific_query() -> None:
+    """Test no second request is made when the queried prefix is its own least specific match."""
+    direct = [create_basic_prefix_info(prefix="192.0.2.0/24"), create_basic_prefix_info(prefix="192.0.2.0/25")]
+
+    with (
+        patch("irrexplorer_cli.irrexplorer.IrrExplorer.fetch_prefix_info", return_value=direct) as mock_fetch,
+        patch("builtins.print") as mock_print,
+    ):
+        await async_prefix_query("192.0.2.0/24", "csv")
+        mock_fetch.assert_awaited_once_with("192.0.2.0/24")
+        rows = [call.args[0].split(",")[:2] for call in mock_print.call_args_list[1:]]
+        assert rows == [
+            ["DIRECT", "192.0.2.0/24"],
+            ["DIRECT", "192.0.2.0/25"],
+            ["OVERLAP", "192.0.2.0/24"],
+            ["OVERLAP", "192.0.2.0/25"],
+        ]
+
+
+@pytest.mark.asyncio
+async def test_prefix_query_csv_fetches_overlaps_while_printing() -> None:
+    """Test the least specific fetch starts before the direct overlap rows are printed."""
+    direct = [create_basic_prefix_info(prefix="192.0.2.0/23")]
+    overlaps = [create_basic_prefix_info(prefix="192.0.0.0/22")]
+    events: List[str] = []
+
+    async def fetch(_: IrrExplorer, prefix: str) -> List[PrefixInfo]:
+        events.append(f"fetch {prefix}")
+        return direct if prefix == "192.0.2.0/24" else overlaps
+
+    with (
+        patch("irrexplorer_cli.irrexplorer.IrrExplorer.fetch_prefix_info", autospec=True, side_effect=fetch),
+        patch("builtins.print", side_effect=lambda *args, **_: events.append(str(args[0])[:7])),
+    ):
+        await async_prefix_query("192.0.2.0/24", "csv")
+    assert events == ["fetch 192.0.2.0/24", "Type,Pr", "fetch 192.0.2.0/23", "DIRECT,", "OVERLAP"]
@@ -0,0 +1,97 @@
+"""Test suite for the retry budget and hedged requests."""
+
+import asyncio
+import time
+from typing import Any, Set
+
+import httpx
+import pytest
+import respx
+
+from irrexplorer_cli.config import ClientConfig
+from irrexplorer_cli.irrexplorer import IrrExplorer
+from irrexplorer_cli.retry import LatencyWindow, RetryBudget, configure_retry_budget, first_success, retry_budget
+
+URL = "https://example.com/api/sets/member-of/AS64496"
+
+
+def test_retry_budget_grows_with_requests() -> None:
+    """Test retries are capped to the minimum plus a share of requests."""
+    budget = RetryBudget(ratio=0.5, min_retries=1)
+    assert budget.try_spend()
+    assert not budget.try_spend()
+    for _ in range(4):
+        budget.record_request()
+    assert budget.try_spend()
+    assert budget.try_spend()
+    assert not budget.can_retry()
+
+
+def test_latency_percentile() -> None:
+    """Test percentiles need enough samples and use the most recent ones."""
+    window = LatencyWindow(size=100)
+    for value in range(10):
+        window.add(value)
+    assert window.percentile(95) is None
+    for value in range(1, 201):
+        window.add(value / 100)
+    assert window.percentile(95) == 1.95
+    assert window.percentile(50) == 1.5
+
+
+@pytest.mark.asyncio
+async def test_first_success_skips_failed_attempts() -> None:
+    """Test the first successful attempt wins over an earlier failure."""
+
+    async def fail() -> str:
+        raise ValueError("failed")
+
+    async def succeed() -> str:
+        await asyncio.sleep(0.01)
+        return "ok"
+
+    attempts: Set["asyncio.Future[str]"] = {asyncio.ensure_future(fail()), asyncio.ensure_future(succeed())}
+    assert await first_success(attempts) == "ok"
+    with pytest.raises(ValueError):
+        await first_success({asyncio.ensure_future(fail())})
+
+
+@pytest.mark.asyncio
+async def test_slow_request_is_hedged() -> None:
+    """Test a request slower than the latency percentile is duplicated and the faster answer is used."""
+    explorer = IrrExplorer(base_url="https://example.com", config=ClientConfig(hedge=True))
+    for _ in range(20):
+        explorer.session.latencies.add(0.01)
+    calls = 0
+
+    async def respond(_: Any) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            await asyncio.sleep(5)
+        return httpx.Response(200, json={"setsPerIrr": {}})
+
+    started = time.monotonic()
+    with respx.mock:
+        respx.get(URL).mock(side_effect=respond)
+        assert await explorer.fetch_asn_sets("AS64496") == {"setsPerIrr": {}}
+    await explorer.close()
+
+    assert calls == 2
+    assert time.monotonic() - started < 1
+    assert retry_budget().retries == 1
+
+
+@pytest.mark.asyncio
+async def test_retries_stop_when_budget_is_spent() -> None:
+    """Test failed requests are not retried once the retry budget is spent."""
+    explorer = IrrExplorer(base_url="https://example.com", config=ClientConfig())
+    budget = configure_retry_budget(0)
+    while budget.try_spend():
+        pass
+    with respx.mock:
+        route = respx.get(URL).mock(return_value=httpx.Response(500))
+        with pytest.raises(httpx.HTTPStatusError):
+            await explorer.fetch_asn_sets("AS64496")
+    await explorer.close()
+    assert route.call_count == 1
@@ -0,0 +1,111 @@
+"""Test suite for HTTP session management."""
+
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from irrexplorer_cli.config import ClientConfig
+from irrexplorer_cli.irrexplorer import IrrExplorer
+from irrexplorer_cli.session import SessionManager, SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_client_pooled_per_base_url() -> None:
+    """Test one client is shared per base URL."""
+    session = SessionManager()
+    first = session.client("https://example.com")
+    assert session.client("https://example.com/") is first
+    assert session.client("https://other.example.com") is not first
+    await session.close()
+    assert first.is_closed
+
+
+@pytest.mark.asyncio
+async def test_pool_limits_from_config() -> None:
+    """Test pool limits are taken from the client config."""
+    session = SessionManager(ClientConfig(max_connections=5, max_keepalive_connections=2, keepalive_expiry=1.5))
+    assert session.limits.max_connections == 5
+    assert session.limits.max_keepalive_connections == 2
+    assert session.limits.keepalive_expiry == 1.5
+    await session.close()
+
+
+@pytest.mark.asyncio
+async def test_http2_fallback_without_h2() -> None:
+    """Test HTTP/2 falls back to HTTP/1.1 when h2 is unavailable."""
+    with patch("irrexplorer_cli.session.http2_available", return_value=False):
+        session = SessionManager(ClientConfig(http2=True))
+    assert session.http2 is False
+    await session.close()
+
+
+@pytest.mark.asyncio
+async def test_explorers_share_session() -> None:
+    """Test explorers sharing a session reuse its client and leave it open."""
+    session = SessionManager()
+    first = IrrExplorer(base_url="https://example.com", session=session)
+    second = IrrExplorer(base_url="https://example.com", session=session)
+    assert first.client is second.client
+    await first.close()
+    assert not second.client.is_closed
+    await session.close()
+
+
+@pytest.mark.asyncio
+async def test_single_flight_coalesces_concurrent_calls() -> None:
+    """Test concurrent calls for one key share a single call."""
+    single_flight: SingleFlight[int] = SingleFlight()
+    calls = 0
+    release = asyncio.Event()
+
+    async def func() -> int:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return calls
+
+    waiters = [asyncio.ensure_future(single_flight.do("key", func)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+    assert await asyncio.gather(*waiters) == [1] * 5
+    assert not single_flight.inflight
+
+    assert await single_flight.do("key", func) == 2
+
+
+@pytest.mark.asyncio
+async def test_single_flight_shares_errors_and_survives_cancellation() -> None:
+    """Test errors reach every waiter and one cancelled waiter does not cancel the call."""
+    single_flight: SingleFlight[int] = SingleFlight()
+    release = asyncio.Event()
+
+    async def func() -> int:
+        await release.wait()
+        raise ValueError("Test error")
+
+    cancelled = asyncio.ensure_future(single_flight.do("key", func))
+    waiter = asyncio.ensure_future(single_flight.do("key", func))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    release.set()
+    with pytest.raises(ValueError):
+        await waiter
+
+
+@pytest.mark.asyncio
+async def test_explorer_coalesces_identical_requests() -> None:
+    """Test concurrent fetches of the same URL send one HTTP request."""
+    explorer = IrrExplorer(base_url="https://example.com")
+    url = "https://example.com/api/prefixes/prefix/192.0.2.0/23"
+
+    async def slow_get(request_url: str) -> httpx.Response:
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json=[], request=httpx.Request("GET", request_url))
+
+    with patch.object(explorer.client, "get", side_effect=slow_get) as mock_get:
+        results = await asyncio.gather(*(explorer.fetch_prefix_info("192.0.2.0/23") for _ in range(10)))
+        assert results == [[]] * 10
+        mock_get.assert_called_once_with(url)
+    await explorer.close()
@@ -0,0 +1,157 @@
+"""Test suite for offline snapshot files."""
+
+import json
+from pathlib import Path
+from typing import List
+from unittest.mock import patch
+
+import pytest
+import respx
+from typer.testing import CliRunner
+
+from irrexplorer_cli.config import ClientConfig
+from irrexplorer_cli.main import app
+from irrexplorer_cli.queries import async_snapshot_build
+from irrexplorer_cli.snapshot import Snapshot, SnapshotExplorer, write_snapshot
+from tests.fixtures import create_basic_prefix_info
+
+runner = CliRunner()
+
+PREFIXES = ["192.0.0.0/16", "192.0.2.0/24", "192.0.2.0/25", "192.0.2.128/25", "198.51.100.0/24", "2001:db8::/32"]
+ASN_INFO = {"directOrigin": [create_basic_prefix_info(prefix="192.0.2.0/24").model_dump()], "overlaps": []}
+ASN_SETS = {"setsPerIrr": {"RIPE": ["AS-EXAMPLE"]}}
+
+
+@pytest.fixture(name="snapshot_path")
+def snapshot_path_fixture(tmp_path: Path) -> Path:
+    """Write a snapshot covering 192.0.0.0/16 and AS64496."""
+    path = tmp_path / "snapshot.bin"
+    count = write_snapshot(
+        path,
+        [create_basic_prefix_info(prefix=prefix) for prefix in PREFIXES],
+        ["192.0.0.0/16", "203.0.113.0/24"],
+        {"AS64496": (json.dumps(ASN_INFO).encode(), json.dumps(ASN_SETS).encode())},
+    )
+    assert count == len(PREFIXES) + 1
+    return path
+
+
+def prefixes_of(bodies: List[bytes]) -> List[str]:
+    """Return the prefixes of stored PrefixInfo JSON."""
+    return [json.loads(body)["prefix"] for body in bodies]
+
+
+def test_overlaps(snapshot_path: Path) -> None:
+    """Test covering prefixes come first, then the prefixes inside the network in address order."""
+    snapshot = Snapshot(snapshot_path)
+    bodies, complete = snapshot.overlaps("192.0.2.0/24")
+    assert prefixes_of(bodies) == ["192.0.0.0/16", "192.0.2.0/24", "192.0.2.0/25", "192.0.2.128/25"]
+    assert complete
+
+    bodies, complete = snapshot.overlaps("198.51.100.1")
+    assert prefixes_of(bodies) == ["198.51.100.0/24"]
+    assert not complete
+
+    assert snapshot.overlaps("203.0.113.0/25") == ([], True)
+    assert prefixes_of(snapshot.overlaps("2001:db8:1::/48")[0]) == ["2001:db8::/32"]
+    snapshot.close()
+
+
+def test_asn(snapshot_path: Path) -> None:
+    """Test raw ASN responses are returned as stored."""
+    snapshot = Snapshot(snapshot_path)
+    stored = snapshot.asn("as64496")
+    assert stored is not None
+    assert json.loads(stored[0]) == ASN_INFO
+    assert json.loads(stored[1]) == ASN_SETS
+    assert snapshot.asn("AS64497") is None
+    snapshot.close()
+
+
+def test_rejects_other_files(tmp_path: Path) -> None:
+    """Test opening a file that is not a snapshot fails."""
+    for content in (b"", b"not a snapshot at all, just some text that is long enough" * 4):
+        path = tmp_path / "other.bin"
+        path.write_bytes(content)
+        with pytest.raises(ValueError, match="Not an irrexplorer snapshot"):
+            Snapshot(path)
+
+
+@pytest.mark.asyncio
+async def test_explorer_answers_without_network(snapshot_path: Path) -> None:
+    """Test every API request is answered from the snapshot."""
+    explorer = SnapshotExplorer(snapshot_path, config=ClientConfig(cache=True))
+    assert explorer.cache is None
+    with respx.mock:
+        infos = await explorer.fetch_prefix_info("192.0.2.128/25")
+        asn_info = await explorer.fetch_asn_info("AS64496")
+        sets = await explorer.fetch_asn_sets("AS64496")
+        streamed = [(key, info.prefix) async for key, info in explorer.stream_asn_info("AS64496")]
+        missing = await explorer.fetch_asn_info("AS64497")
+    await explorer.close()
+
+    assert [info.prefix for info in infos] == ["192.0.0.0/16", "192.0.2.0/24", "192.0.2.128/25"]
+    assert asn_info == ASN_INFO
+    assert sets == ASN_SETS
+    assert streamed == [("directOrigin", "192.0.2.0/24")]
+    assert missing == {"directOrigin": [], "overlaps": []}
+
+
+def test_snapshot_option(snapshot_path: Path, tmp_path: Path) -> None:
+    """Test --snapshot is passed to queries and rejects files that are not snapshots."""
+    with patch("irrexplorer_cli.queries.async_prefix_query", return_value=None) as mock_query:
+        result = runner.invoke(app, ["--snapshot", str(snapshot_path), "prefix", "192.0.2.0/24"])
+    assert not result.exit_code
+    mock_query.assert_called_once_with("192.0.2.0/24", None, None, ClientConfig(cache=True, snapshot=snapshot_path))
+
+    other = tmp_path / "other.bin"
+    other.write_bytes(b"{}")
+    result = runner.invoke(app, ["--snapshot", str(other), "prefix", "192.0.2.0/24"])
+    assert result.exit_code == 1
+    assert "Error: Not an irrexplorer snapshot" in result.stdout
+
+
+def test_snapshot_build_command(tmp_path: Path) -> None:
+    """Test snapshot build normalizes AS numbers and reads queries from a file."""
+    batch_file = tmp_path / "queries.txt"
+    batch_file.write_text("192.0.2.0/24\n64496\n")
+    output = tmp_path / "snapshot.bin"
+    with patch("irrexplorer_cli.queries.async_snapshot_build", return_value=None) as mock_build:
+        result = runner.invoke(app, ["snapshot", "build", str(output), "as64497", "-i", str(batch_file), "-c", "4"])
+    assert not result.exit_code
+    mock_build.assert_called_once_with(
+        output, ["AS64497", "192.0.2.0/24", "AS64496"], None, 4, ClientConfig(cache=True)
+    )
+
+    result = runner.invoke(app, ["snapshot", "build", str(output), "invalid"])
+    assert result.exit_code == 1
+    assert "Error: Invalid prefix or ASN format: invalid" in result.stdout
+
+
+@pytest.mark.asyncio
+async def test_async_snapshot_build(tmp_path: Path) -> None:
+    """Test building fetches each prefix and its least specific match, and marks both as complete."""
+    output = tmp_path / "snapshot.bin"
+    responses = {
+        "192.0.2.0/24": [create_basic_prefix_info(prefix="192.0.0.0/16")],
+        "192.0.0.0/16": [create_basic_prefix_info(prefix=prefix) for prefix in PREFIXES[:4]],
+    }
+
+    async def fetch_prefix_info(prefix: str) -> object:
+        return responses[prefix]
+
+    with (
+        patch("irrexplorer_cli.irrexplorer.IrrExplorer.fetch_prefix_info", side_effect=fetch_prefix_info),
+        patch("irrexplorer_cli.irrexplorer.IrrExplorer.fetch_asn_info", return_value=ASN_INFO),
+        patch("irrexplorer_cli.irrexplorer.IrrExplorer.fetch_asn_sets", return_value=ASN_SETS),
+        patch("builtins.print") as mock_print,
+    ):
+        await async_snapshot_build(output, ["192.0.2.0/24", "AS64496"], config=ClientConfig())
+    mock_print.assert_called_once_with(f"Wrote 4 prefixes and 1 AS numbers to {output}")
+
+    snapshot = Snapshot(output)
+    bodies, complete = snapshot.overlaps("192.0.3.0/24")
+    assert prefixes_of(bodies) == ["192.0.0.0/16"]
+    assert complete
+    assert snapshot.asn("AS64496") is not None
+    snapshot.close()
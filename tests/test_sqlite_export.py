@@ -0,0 +1,102 @@
+"""Test suite for the SQLite export."""
+
+import sqlite3
+from pathlib import Path
+from unittest.mock import patch
+
+import httpx
+import pytest
+import respx
+from typer.testing import CliRunner
+
+from irrexplorer_cli.config import ClientConfig
+from irrexplorer_cli.main import app
+from irrexplorer_cli.queries import async_sqlite_export
+from irrexplorer_cli.sqlite_export import SqliteExport
+from tests.fixtures import COMMON_RPKI_ROUTE, COMMON_SETS_DATA, create_basic_prefix_info
+
+# BGP origin without an IRR route object, next to one that has one
+UNREGISTERED = create_basic_prefix_info(prefix="198.51.100.0/24", bgpOrigins=[64496])
+REGISTERED = create_basic_prefix_info(
+    irrRoutes={"RIPE": [COMMON_RPKI_ROUTE]}, messages=[{"text": "Expected route object in RIPE", "category": "info"}]
+)
+
+UNREGISTERED_ORIGINS = """
+    SELECT p.prefix, o.asn FROM prefixes p JOIN bgp_origins o ON o.prefix_id = p.id
+    WHERE NOT EXISTS (SELECT 1 FROM irr_routes r WHERE r.prefix_id = p.id AND r.asn = o.asn)
+"""
+
+
+def test_sqlite_export(tmp_path: Path) -> None:
+    """Test prefixes are written into normalized, indexed tables, appending to an existing database."""
+    path = tmp_path / "export.sqlite3"
+    for _ in range(2):
+        export = SqliteExport(path, batch_size=1)
+        export.add_prefix("DIRECT", "AS12345", REGISTERED)
+        export.add_prefix("OVERLAP", "AS12345", UNREGISTERED)
+        export.close()
+
+    db = sqlite3.connect(path)
+    assert db.execute("SELECT id, type, prefix FROM prefixes ORDER BY id").fetchall() == [
+        (1, "DIRECT", "192.0.2.0/24"),
+        (2, "OVERLAP", "198.51.100.0/24"),
+        (3, "DIRECT", "192.0.2.0/24"),
+        (4, "OVERLAP", "198.51.100.0/24"),
+    ]
+    assert db.execute(UNREGISTERED_ORIGINS).fetchall() == [("198.51.100.0/24", 64496)] * 2
+    assert db.execute("SELECT irr, rpsl_pk FROM irr_routes WHERE prefix_id = 1").fetchall() == [
+        ("RIPE", COMMON_RPKI_ROUTE["rpslPk"])
+    ]
+    assert db.execute("SELECT COUNT(*) FROM rpki_routes WHERE rpki_status = 'VALID'").fetchone() == (4,)
+    assert db.execute("SELECT category FROM messages").fetchall() == [("info",)] * 2
+    indexes = {name for (name,) in db.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {"prefixes_prefix", "bgp_origins_asn", "irr_routes_asn", "rpki_routes_rpki_status"} <= indexes
+    db.close()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_export_query(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    """Test the ASN export writes the prefixes and AS set memberships of every AS number."""
+    path = tmp_path / "export.sqlite3"
+    with respx.mock:
+        respx.get("https://example.com/api/prefixes/asn/AS12345").mock(
+            return_value=httpx.Response(200, json={"directOrigin": [REGISTERED.model_dump()], "overlaps": []})
+        )
+        respx.get("https://example.com/api/sets/member-of/AS12345").mock(
+            return_value=httpx.Response(200, json=COMMON_SETS_DATA)
+        )
+        await async_sqlite_export(["AS12345"], path, "https://example.com", config=ClientConfig())
+    assert capsys.readouterr().out == f"Wrote 1 prefixes to {path}\n"
+
+    db = sqlite3.connect(path)
+    assert db.execute("SELECT query, prefix FROM prefixes").fetchall() == [("AS12345", "192.0.2.0/24")]
+    assert db.execute("SELECT as_set FROM as_set_members WHERE asn = 12345 AND irr = 'RIPE'").fetchall() == [
+        ("AS-TEST1",),
+        ("AS-TEST2",),
+    ]
+    db.close()
+
+
+def test_output_option(tmp_path: Path) -> None:
+    """Test --output sqlite:PATH runs the export; other sinks, missing directories and --summary are rejected."""
+    runner = CliRunner()
+    path = tmp_path / "export.sqlite3"
+    with patch("irrexplorer_cli.queries.async_sqlite_export", return_value=None) as mock_query:
+        result = runner.invoke(app, ["asn", "AS12345", "--output", f"sqlite:{path}"])
+    assert not result.exit_code
+    mock_query.assert_called_once_with(["AS12345"], path, None, 10, ClientConfig(cache=True))
+
+    result = runner.invoke(app, ["prefix", "192.0.2.0/24", "--output", "csv:out.csv"])
+    assert result.exit_code == 1
+    assert "Unsupported output: csv:out.csv" in result.stdout
+
+    missing = tmp_path / "missing" / "export.sqlite3"
+    result = runner.invoke(app, ["prefix", "192.0.2.0/24", "--output", f"sqlite:{missing}"])
+    assert result.exit_code == 1
+    assert "does not exist" in result.stdout
+
+    for option in ("--summary", "--aggregate"):
+        result = runner.invoke(app, ["asn", "AS12345", option, "--output", f"sqlite:{path}"])
+        assert result.exit_code == 1
+        assert f"Error: {option} and --output cannot be combined" in result.stdout
+    assert not path.exists()
@@ -0,0 +1,53 @@
+"""Test suite for CLI startup cost."""
+
+import subprocess
+import sys
+from typing import Dict, List, Set, Tuple
+
+import pytest
+
+QUERY_MODULES = {"httpx", "pydantic", "backoff", "irrexplorer_cli.models", "irrexplorer_cli.queries"}
+# modules the CLI module must not import when loaded; they account for most of the startup time
+HEAVY_MODULES = QUERY_MODULES | {"rich.table", "rich.console", "sqlite3", "irrexplorer_cli.irrexplorer"}
+
+
+def import_times(*args: str) -> Dict[str, int]:
+    """Run the CLI with arguments under -X importtime and return the cumulative import time of each module."""
+    code = "import sys\nfrom irrexplorer_cli.main import app\napp(sys.argv[1:])"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code, *args], capture_output=True, text=True, check=False
+    )
+    times: Dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.removeprefix("import time:").split("|")
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative)
+    return times
+
+
+def loaded(times: Dict[str, int], modules: Set[str]) -> List[str]:
+    """Return the imported modules that are, or belong to, one of modules."""
+    return [name for name in times if name in modules or name.split(".")[0] in modules]
+
+
+@pytest.mark.parametrize("args", [("--version",), ("--help",), ("prefix", "--help")])
+def test_startup_skips_query_stack(args: Tuple[str, ...]) -> None:
+    """Test --version and --help load neither the HTTP client nor the models."""
+    times = import_times(*args)
+    assert "irrexplorer_cli.main" in times
+    assert not loaded(times, QUERY_MODULES)
+
+
+def test_version_skips_rich() -> None:
+    """Test --version does not load Rich, which typer only needs to format help."""
+    assert not loaded(import_times("--version"), {"rich"})
+
+
+def test_import_skips_heavy_modules() -> None:
+    """Test importing the CLI module loads neither the query stack nor Rich and SQLite."""
+    code = "import sys\nimport irrexplorer_cli.main\nprint('\\n'.join(sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    modules = set(result.stdout.splitlines())
+    assert "irrexplorer_cli.main" in modules
+    assert not modules & HEAVY_MODULES
@@ -0,0 +1,78 @@
+"""Test suite for incremental JSON decoding."""
+
+import json
+from typing import Any, AsyncIterator, Dict, List, Tuple
+
+import pytest
+
+from irrexplorer_cli.streaming import JsonArrayStreamParser, aiter_chunks, iter_json_items
+from tests.fixtures import COMMON_PREFIX_INFO
+
+ASN_DOCUMENT: Dict[str, Any] = {
+    "directOrigin": [COMMON_PREFIX_INFO, {**COMMON_PREFIX_INFO, "prefix": "198.51.100.0/24"}],
+    "meta": {"nested": [1, 2, {"x": "]}"}], "count": 12345},
+    "overlaps": [{**COMMON_PREFIX_INFO, "prefix": "203.0.113.0/24", "rir": "ÄRIN ✓"}],
+}
+
+
+def parse_in_chunks(text: str, size: int, keys: Tuple[str, ...]) -> List[Tuple[str, Any]]:
+    """Feed text to a parser in fixed-size chunks."""
+    parser = JsonArrayStreamParser(keys)
+    items = []
+    for start in range(0, len(text), size):
+        items.extend(parser.feed(text[start : start + size]))
+    items.extend(parser.close())
+    return items
+
+
+@pytest.mark.parametrize("size", [1, 7, 64, 100000])
+def test_parser_streams_selected_arrays(size: int) -> None:
+    """Test elements of selected arrays are emitted in document order regardless of chunking."""
+    items = parse_in_chunks(json.dumps(ASN_DOCUMENT, indent=1), size, ("directOrigin", "overlaps"))
+    assert [(key, item["prefix"]) for key, item in items] == [
+        ("directOrigin", "192.0.2.0/24"),
+        ("directOrigin", "198.51.100.0/24"),
+        ("overlaps", "203.0.113.0/24"),
+    ]
+    assert items[2][1] == ASN_DOCUMENT["overlaps"][0]
+
+
+def test_parser_top_level_array_and_empty_documents() -> None:
+    """Test top-level arrays, null and empty documents."""
+    assert parse_in_chunks('[1, 23, {"a": [4]}]', 1, ()) == [("", 1), ("", 23), ("", {"a": [4]})]
+    assert not parse_in_chunks("null", 1, ("directOrigin",))
+    assert not parse_in_chunks("{}", 1, ("directOrigin",))
+    assert not parse_in_chunks("", 1, ("directOrigin",))
+
+
+def test_parser_emits_elements_before_document_ends() -> None:
+    """Test complete elements are available before the rest of the document arrives."""
+    parser = JsonArrayStreamParser(("directOrigin",))
+    assert not parser.feed('{"directOrigin": [{"prefix": "192.0.2.0/24"}')
+    assert parser.feed(", ") == [("directOrigin", {"prefix": "192.0.2.0/24"})]
+
+
+@pytest.mark.parametrize("text", ['{"directOrigin": [{"prefix": 1}', '{"directOrigin" [1]}', "[1, }"])
+def test_parser_rejects_invalid_documents(text: str) -> None:
+    """Test truncated and malformed documents raise ValueError."""
+    with pytest.raises(ValueError):
+        parse_in_chunks(text, 3, ("directOrigin",))
+
+
+@pytest.mark.asyncio
+async def test_iter_json_items_splits_multibyte_characters() -> None:
+    """Test UTF-8 sequences split across chunks decode correctly."""
+    body = json.dumps(ASN_DOCUMENT, ensure_ascii=False).encode()
+
+    async def chunks() -> AsyncIterator[bytes]:
+        for start in range(0, len(body), 3):
+            yield body[start : start + 3]
+
+    items = [item async for item in iter_json_items(chunks(), ("overlaps",))]
+    assert items == [("overlaps", ASN_DOCUMENT["overlaps"][0])]
+
+
+@pytest.mark.asyncio
+async def test_aiter_chunks() -> None:
+    """Test in-memory bodies are chunked."""
+    assert [chunk async for chunk in aiter_chunks(b"abcdefg", 3)] == [b"abc", b"def", b"g"]
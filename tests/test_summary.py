@@ -0,0 +1,93 @@
+"""Test suite for the summary of query results."""
+
+import json
+from unittest.mock import patch
+
+import httpx
+import pytest
+import respx
+from typer.testing import CliRunner
+
+from irrexplorer_cli.config import ClientConfig
+from irrexplorer_cli.main import app
+from irrexplorer_cli.queries import async_summary_query
+from irrexplorer_cli.summary import PrefixColumns, summarize, summarize_numpy, summarize_python
+from tests.fixtures import COMMON_RPKI_ROUTE, create_basic_prefix_info
+
+IRR_ROUTE = {**COMMON_RPKI_ROUTE, "rpkiStatus": "VALID"}
+
+INFOS = [
+    create_basic_prefix_info(prefix="192.0.2.0/24", irrRoutes={"RIPE": [IRR_ROUTE]}),
+    create_basic_prefix_info(
+        prefix="198.51.100.0/22",
+        categoryOverall="danger",
+        rpkiRoutes=[{**COMMON_RPKI_ROUTE, "rpkiStatus": "INVALID"}],
+    ),
+    create_basic_prefix_info(prefix="2001:db8::/32", rir="ARIN", rpkiRoutes=[], bgpOrigins=[]),
+    create_basic_prefix_info(prefix="203.0.113.0/24", rir="ARIN", categoryOverall="warning"),
+]
+
+
+def test_summarize() -> None:
+    """Test the summary counts categories, RPKI status per RIR, origin mismatches and prefix lengths."""
+    summary = summarize_python(PrefixColumns(INFOS))
+    assert summary.prefixes == 4
+    assert summary.categories == {"danger": 1, "success": 2, "warning": 1}
+    assert summary.rpki_by_rir == {
+        "ARIN": {"INVALID": 0, "NOT_FOUND": 1, "VALID": 1},
+        "RIPE": {"INVALID": 1, "NOT_FOUND": 0, "VALID": 1},
+    }
+    assert (summary.bgp_originated, summary.irr_mismatches) == (3, 2)
+    assert summary.irr_mismatch_rate == pytest.approx(2 / 3)
+    assert summary.prefix_lengths == {"IPv4": {22: 1, 24: 2}, "IPv6": {32: 1}}
+    assert not summarize([]).prefixes
+
+
+def test_summarize_numpy_matches_python() -> None:
+    """Test the NumPy summary equals the summary computed with counters."""
+    for infos in (INFOS[:1], INFOS, INFOS * 50):
+        columns = PrefixColumns(infos)
+        assert summarize_numpy(columns) == summarize_python(columns)
+
+
+def test_summarize_uses_numpy_when_available() -> None:
+    """Test the summary is computed with NumPy when it is installed and with counters otherwise."""
+    with (
+        patch("irrexplorer_cli.summary.numpy_available", return_value=True),
+        patch("irrexplorer_cli.summary.summarize_numpy") as numpy_summary,
+    ):
+        assert summarize(INFOS) is numpy_summary.return_value
+    with patch("irrexplorer_cli.summary.numpy_available", return_value=False):
+        assert summarize(INFOS) == summarize_python(PrefixColumns(INFOS))
+
+
+@pytest.mark.asyncio
+async def test_summary_query_json(capsys: pytest.CaptureFixture[str]) -> None:
+    """Test the summary query counts a prefix returned for several AS numbers once."""
+    direct = [info.model_dump() for info in INFOS[:2]]
+    with respx.mock:
+        for as_number in ("AS64496", "AS64497"):
+            respx.get(f"https://example.com/api/prefixes/asn/{as_number}").mock(
+                return_value=httpx.Response(200, json={"directOrigin": direct, "overlaps": []})
+            )
+        await async_summary_query(["AS64496", "AS64497"], "json", "https://example.com", config=ClientConfig())
+    output = json.loads(capsys.readouterr().out)
+    assert output["prefixes"] == 2
+    assert output["categories"] == {"danger": 1, "success": 1}
+
+
+def test_summary_option() -> None:
+    """Test --summary runs the summary query and rejects --watch and row formats."""
+    runner = CliRunner()
+    with patch("irrexplorer_cli.queries.async_summary_query", return_value=None) as mock_query:
+        result = runner.invoke(app, ["prefix", "192.0.2.0/24", "--summary"])
+    assert not result.exit_code
+    mock_query.assert_called_once_with(["192.0.2.0/24"], None, None, 10, ClientConfig(cache=True))
+
+    result = runner.invoke(app, ["asn", "AS64496", "--summary", "--watch", "60"])
+    assert result.exit_code == 1
+    assert "--summary cannot be combined with --watch" in result.stdout
+
+    result = runner.invoke(app, ["asn", "AS64496", "--summary", "--format", "csv"])
+    assert result.exit_code == 1
+    assert "does not support csv output" in result.stdout
@@ -0,0 +1,113 @@
+"""Test suite for watch mode change detection."""
+
+import asyncio
+import json
+from typing import Any, Dict, List
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+from typer.testing import CliRunner
+
+from irrexplorer_cli.config import ClientConfig
+from irrexplorer_cli.main import app
+from irrexplorer_cli.models import PrefixInfo
+from irrexplorer_cli.queries import async_watch_query
+from irrexplorer_cli.watch import WatchState
+from tests.fixtures import COMMON_PREFIX_INFO, COMMON_RPKI_ROUTE, create_basic_prefix_info
+
+runner = CliRunner()
+
+IRR_ROUTE = {**COMMON_RPKI_ROUTE, "rpslPk": "192.0.2.0/24AS12345"}
+
+
+def poll_infos() -> List[PrefixInfo]:
+    """Return a poll with one prefix holding an IRR route and a ROA."""
+    return [create_basic_prefix_info(irrRoutes={"RIPE": [IRR_ROUTE]})]
+
+
+def test_first_poll_has_no_changes() -> None:
+    """Test the first poll only records the state."""
+    state = WatchState()
+    assert not state.update(poll_infos())
+    assert state.size == 3
+    assert not state.update(poll_infos())
+
+
+def test_detects_added_removed_and_changed_records() -> None:
+    """Test changes are keyed by prefix, IRR database and rpslPk."""
+    state = WatchState()
+    state.update(poll_infos())
+    changed = create_basic_prefix_info(
+        categoryOverall="danger",
+        irrRoutes={"RADB": [IRR_ROUTE]},
+        rpkiRoutes=[{**COMMON_RPKI_ROUTE, "rpkiStatus": "INVALID"}],
+    )
+    changes = state.update([changed, create_basic_prefix_info(prefix="198.51.100.0/24", rpkiRoutes=[])])
+
+    summary = [(change.change, change.prefix, change.source, change.old, change.new) for change in changes]
+    assert summary == [
+        ("changed", "192.0.2.0/24", "", {"categoryOverall": "success"}, {"categoryOverall": "danger"}),
+        ("added", "192.0.2.0/24", "RADB", {}, {"asn": 12345, "rpkiStatus": "VALID", "rpkiMaxLength": 24}),
+        ("changed", "192.0.2.0/24", "RPKI", {"rpkiStatus": "VALID"}, {"rpkiStatus": "INVALID"}),
+        (
+            "added",
+            "198.51.100.0/24",
+            "",
+            {},
+            {"categoryOverall": "success", "rir": "RIPE", "bgpOrigins": (12345,)},
+        ),
+        ("removed", "192.0.2.0/24", "RIPE", {"asn": 12345, "rpkiStatus": "VALID", "rpkiMaxLength": 24}, {}),
+    ]
+    assert changes[2].text().plain == "~ 192.0.2.0/24 RPKI 192.0.2.0/24AS12345/ML24: rpkiStatus VALID -> INVALID"
+    assert json.loads(changes[4].ndjson())["change"] == "removed"
+
+
+def response(body: Any) -> httpx.Response:
+    """Build an API response with a JSON body."""
+    return httpx.Response(200, json=body, request=httpx.Request("GET", "https://example.com"))
+
+
+@pytest.mark.asyncio
+async def test_watch_prints_only_changes() -> None:
+    """Test polls are printed as NDJSON changes, and failed polls keep the previous state."""
+    invalid = {**COMMON_PREFIX_INFO, "categoryOverall": "danger"}
+    bodies: List[Any] = [
+        response({"directOrigin": [COMMON_PREFIX_INFO], "overlaps": []}),
+        response({"directOrigin": [COMMON_PREFIX_INFO], "overlaps": []}),
+        httpx.ReadTimeout("timed out"),
+        response({"directOrigin": [invalid], "overlaps": []}),
+    ]
+    printed: List[Dict[str, Any]] = []
+    with (
+        patch("irrexplorer_cli.irrexplorer.IrrExplorer.get", AsyncMock(side_effect=bodies)) as mock_get,
+        # the watch runs until interrupted; stop it instead of sleeping after the fourth poll
+        patch(
+            "irrexplorer_cli.queries.asyncio.sleep", AsyncMock(side_effect=[None, None, None, asyncio.CancelledError])
+        ),
+        patch("builtins.print", side_effect=lambda line, **_: printed.append(json.loads(line))),
+        pytest.raises(asyncio.CancelledError),
+    ):
+        await async_watch_query("AS12345", 60, "ndjson", config=ClientConfig(cache=True))
+
+    mock_get.assert_awaited_with("/api/prefixes/asn/AS12345")
+    assert [(record["change"], record["new"]) for record in printed] == [("changed", {"categoryOverall": "danger"})]
+
+
+def test_watch_option() -> None:
+    """Test --watch runs a single query and rejects batch mode and formats other than ndjson."""
+    with patch("irrexplorer_cli.queries.async_watch_query", return_value=None) as mock_watch:
+        result = runner.invoke(app, ["prefix", "192.0.2.0/24", "--watch", "30", "-f", "ndjson"])
+    assert not result.exit_code
+    mock_watch.assert_called_once_with("192.0.2.0/24", 30.0, "ndjson", None, ClientConfig(cache=True))
+
+    result = runner.invoke(app, ["asn", "--from-file", "-", "--watch", "30"], input="AS12345\nAS64496\n")
+    assert result.exit_code == 1
+    assert "Error: --watch takes a single query" in result.stdout
+
+    for options in (["-f", "json"], ["-f", "csv"], ["--view", "compact"]):
+        with patch("irrexplorer_cli.queries.async_watch_query", return_value=None) as mock_watch:
+            result = runner.invoke(app, ["prefix", "192.0.2.0/24", "--watch", "30", *options])
+        assert result.exit_code == 1
+        assert "output, use ndjson or the default text" in result.stdout
+        mock_watch.assert_not_called()